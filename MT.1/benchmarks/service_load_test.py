@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Δοκιμή φόρτου της υπηρεσίας serve_results.py (καθυστέρηση p50/p99 υπό ταυτόχρονους πελάτες)
+
+Εκκινεί την υπηρεσία σε νέα διεργασία (ή χρησιμοποιεί μια ήδη ενεργή με --port), και
+`--clients` ταυτόχρονοι πελάτες asyncio στέλνουν από `--requests` αιτήματα ο καθένας σε
+συνδέσεις keep-alive, εναλλάσσοντας ένα μείγμα URL (σειρές JSON, στατιστικά, κατάλογος,
+διαγράμματα PNG). Για κάθε URL και συνολικά τυπώνονται p50, p99 και ρυθμός αιτημάτων.
+
+Χρήση:
+    python service_load_test.py [--clients 32] [--requests 200] [--port 8050] [--external]
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from urllib.parse import quote
+
+MT1 = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+URLS = [
+    "/series?measure={m}&concept=cycle&geo=EL&filter=HP",
+    "/series?measure={m}&concept=real&geo=EA&start=2000-Q1&end=2010-Q4",
+    "/series?concept=growth_real&frequency=A",
+    "/statistics?name=relative_std",
+    "/catalog",
+    "/plot/cycle.png?measure={m}",
+]
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(q / 100 * (len(values) - 1))))]
+
+
+async def fetch(reader, writer, target, gzip_ok=True):
+    """Ένα αίτημα GET σε ανοιχτή σύνδεση· επιστρέφει (status, μέγεθος σώματος)."""
+    request = f"GET {target} HTTP/1.1\r\nHost: localhost\r\n"
+    if gzip_ok:
+        request += "Accept-Encoding: gzip\r\n"
+    writer.write((request + "\r\n").encode("latin-1"))
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.strip().lower() == "content-length":
+            length = int(value)
+    await reader.readexactly(length)
+    return status, length
+
+
+async def client(port, targets, n_requests, latencies, offset):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    try:
+        for i in range(n_requests):
+            target = targets[(offset + i) % len(targets)]
+            start = time.perf_counter()
+            status, _ = await fetch(reader, writer, target)
+            latencies.setdefault(target, []).append(time.perf_counter() - start)
+            if status != 200:
+                raise RuntimeError(f"{target}: HTTP {status}")
+    finally:
+        writer.close()
+
+
+async def run_load(port, clients, n_requests, measure):
+    targets = [url.format(m=quote(measure)) for url in URLS]
+    latencies = {}
+    # Προθέρμανση: τα PNG σχεδιάζονται μία φορά και μετά σερβίρονται από την cache
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    cold = {}
+    for target in targets:
+        start = time.perf_counter()
+        await fetch(reader, writer, target)
+        cold[target] = time.perf_counter() - start
+    writer.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client(port, targets, n_requests, latencies, offset) for offset in range(clients)))
+    elapsed = time.perf_counter() - start
+    return cold, latencies, elapsed
+
+
+def wait_for_port(port, timeout=60.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        with socket.socket() as s:
+            if s.connect_ex(("127.0.0.1", port)) == 0:
+                return
+        time.sleep(0.1)
+    raise TimeoutError(f"Η υπηρεσία δεν ξεκίνησε στη θύρα {port}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Δοκιμή φόρτου της υπηρεσίας αποτελεσμάτων")
+    parser.add_argument("--clients", type=int, default=32, help="ταυτόχρονοι πελάτες")
+    parser.add_argument("--requests", type=int, default=200, help="αιτήματα ανά πελάτη")
+    parser.add_argument("--port", type=int, default=8050)
+    parser.add_argument("--measure", default="ΑΕΠ", help="μεταβλητή για τα URL σειρών/διαγραμμάτων")
+    parser.add_argument("--db", default=None, help="βάση SQLite για την υπηρεσία που εκκινείται")
+    parser.add_argument("--external", action="store_true", help="χρήση ήδη ενεργής υπηρεσίας")
+    args = parser.parse_args()
+
+    server = None
+    if not args.external:
+        cmd = [sys.executable, os.path.join(MT1, "serve_results.py"), "--port", str(args.port)]
+        if args.db:
+            cmd += ["--db", args.db]
+        server = subprocess.Popen(cmd, stdout=subprocess.DEVNULL)
+        wait_for_port(args.port)
+    try:
+        cold, latencies, elapsed = asyncio.run(run_load(args.port, args.clients, args.requests, args.measure))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    total = [t for values in latencies.values() for t in values]
+    print(f"{args.clients} πελάτες x {args.requests} αιτήματα: {len(total) / elapsed:,.0f} αιτήματα/s\n")
+    print(f"{'URL':<62}{'πρώτο (ms)':>11}{'p50 (ms)':>10}{'p99 (ms)':>10}")
+    for target, values in latencies.items():
+        print(f"{target[:60]:<62}{cold[target] * 1e3:>11.1f}{statistics.median(values) * 1e3:>10.2f}"
+              f"{percentile(values, 99) * 1e3:>10.2f}")
+    print(f"{'Σύνολο':<62}{'':>11}{statistics.median(total) * 1e3:>10.2f}{percentile(total, 99) * 1e3:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Μέτρηση χρόνου εκκίνησης των scripts (πριν/μετά το πακέτο macrocore)
+
+Για κάθε script μετράμε, σε νέες διεργασίες Python (διάμεσος από N επαναλήψεις):
+  - "πριν":  την εισαγωγή των βιβλιοθηκών που φόρτωνε το script στην αρχή του πριν από
+             το macrocore (matplotlib, seaborn, statsmodels, …).
+  - "μετά":  τη φόρτωση του ίδιου του script (χωρίς εκτέλεση της main()), με lazy imports.
+Επιπλέον ελέγχουμε ότι μετά τη φόρτωση το matplotlib δεν έχει εισαχθεί.
+
+Χρήση:
+    python startup_benchmark.py [--repeat N]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+MT1 = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+# Οι εισαγωγές που έκανε κάθε script στην αρχή του πριν από το macrocore.
+EAGER_IMPORTS = {
+    "exercise.4/4.py": "import pandas, numpy, matplotlib.pyplot",
+    "exercise.5/5.py": "import pandas, numpy, matplotlib.pyplot",
+    "exercise.6/6.py": "import pandas, numpy, matplotlib.pyplot, seaborn; "
+                       "from statsmodels.tsa.filters.hp_filter import hpfilter; seaborn.set_style('whitegrid')",
+    "exercise.6/exercise.6.py": "import pandas, numpy, matplotlib.pyplot, seaborn; "
+                                "from statsmodels.tsa.filters.hp_filter import hpfilter; seaborn.set_style('whitegrid')",
+}
+
+# Φόρτωση του script ως module (χωρίς main) και έλεγχος ότι δεν φορτώθηκε το matplotlib.
+LOAD_SCRIPT = (
+    "import importlib.util, sys; "
+    "spec = importlib.util.spec_from_file_location('script', {path!r}); "
+    "module = importlib.util.module_from_spec(spec); spec.loader.exec_module(module); "
+    "sys.exit(3 if 'matplotlib' in sys.modules else 0)"
+)
+
+
+def time_command(code, cwd, repeat):
+    """Διάμεσος χρόνος (s) εκτέλεσης του `python -c code` σε νέες διεργασίες."""
+    timings = []
+    status = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        status = subprocess.run([sys.executable, "-c", code], cwd=cwd,
+                                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL).returncode
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), status
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Μέτρηση χρόνου εκκίνησης των scripts")
+    parser.add_argument("--repeat", type=int, default=5, help="επαναλήψεις ανά μέτρηση (διάμεσος)")
+    args = parser.parse_args()
+
+    baseline, _ = time_command("pass", MT1, args.repeat)
+    print(f"Κενός διερμηνέας Python: {baseline:.3f} s\n")
+    print(f"{'Script':<28}{'Πριν (s)':>10}{'Μετά (s)':>10}{'Επιτάχυνση':>12}  matplotlib")
+    for script, eager in EAGER_IMPORTS.items():
+        path = os.path.join(MT1, script)
+        cwd = os.path.dirname(path)
+        before, _ = time_command(eager, cwd, args.repeat)
+        after, status = time_command(LOAD_SCRIPT.format(path=path), cwd, args.repeat)
+        loaded = "φορτώθηκε" if status == 3 else ("σφάλμα" if status else "όχι")
+        print(f"{script:<28}{before:>10.3f}{after:>10.3f}{before / after:>11.1f}x  {loaded}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""
+Συντάκτης: thodoreskourtales
+
+Σκοπός:
+  Όλα τα διαγράμματα του βιβλίου (Ασκήσεις 1-3, 4, 5, 6) σε μία διεργασία, συνήθως σε
+  διανυσματική μορφή (PDF/PGF, βλ. macrocore/plotting.py).
+
+  Κάθε script εκτελείται με το runpy στον φάκελό του, σαν να καλούνταν από τη γραμμή
+  εντολών, αλλά το matplotlib, το πρότυπο διαγραμμάτων και οι γραμματοσειρές (Noto Serif)
+  φορτώνονται μία φορά για όλα. Κάθε script τρέχει μέσα σε δικό του rc_context, ώστε οι
+  αλλαγές στυλ ενός script (π.χ. plt.style.use) να μην περνούν στα επόμενα.
+
+Χρήση:
+  python build_figures.py                     # PDF για όλα
+  python build_figures.py --figure-format pgf
+  python build_figures.py exercise_6 -- --no-store
+"""
+
+import argparse
+import os
+import runpy
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, ROOT)
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+
+# Τα scripts με διαγράμματα (όνομα κόμβου του run_pipeline.py -> script)
+SCRIPTS = {
+    "exercises_1_3": os.path.join("exercise.1-3", "exercises.1-3.py"),
+    "exercise_4": os.path.join("exercise.4", "4.py"),
+    "exercise_5": os.path.join("exercise.5", "5.py"),
+    "exercise_6": os.path.join("exercise.6", "6.py"),
+}
+
+
+def run_script(path, argv):
+    """Εκτελεί ένα script στον φάκελό του με τα ορίσματα argv· επιστρέφει τη διάρκεια."""
+    cwd, saved_argv = os.getcwd(), sys.argv
+    start = time.perf_counter()
+    try:
+        os.chdir(os.path.join(ROOT, os.path.dirname(path)))
+        sys.argv = [os.path.basename(path)] + argv
+        with matplotlib.rc_context():
+            runpy.run_path(os.path.join(ROOT, path), run_name="__main__")
+    finally:
+        os.chdir(cwd)
+        sys.argv = saved_argv
+        plt.close("all")
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Όλα τα διαγράμματα σε μία διεργασία")
+    parser.add_argument("scripts", nargs="*", help=f"scripts (προεπιλογή: όλα): {', '.join(SCRIPTS)}")
+    parser.add_argument("--figure-format", choices=("png", "pdf", "pgf", "svg"), default="pdf",
+                        help="μορφή των διαγραμμάτων (προεπιλογή: pdf)")
+    # Ό,τι ακολουθεί το "--" περνά στα scripts
+    argv = sys.argv[1:]
+    split = argv.index("--") if "--" in argv else len(argv)
+    args, extra = parser.parse_args(argv[:split]), argv[split + 1:]
+    unknown = set(args.scripts) - set(SCRIPTS)
+    if unknown:
+        parser.error(f"άγνωστα scripts: {', '.join(sorted(unknown))}")
+
+    for name in args.scripts or list(SCRIPTS):
+        argv = ["--figure-format", args.figure_format]
+        # Μόνο τα 4.py/5.py/6.py δέχονται τα κοινά ορίσματα (βλ. macrocore.cli)
+        if name != "exercises_1_3":
+            argv += extra
+        elapsed = run_script(SCRIPTS[name], argv)
+        print(f"{name:<16} {elapsed:.1f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+"""
+Συντάκτης: thodoreskourtales
+
+Σκοπός:
+  Σταδιακή μεταγλώττιση του latex/big_book (βλ. macrocore/report.py).
+
+  Κάθε κεφάλαιο (chapters/*.tex) μεταγλωττίζεται και αυτόνομα στο build/ και ξαναχτίζεται
+  μόνο όταν αλλάξει κάποια είσοδός του (κείμενο, preamble, εικόνες, πίνακες)· τα
+  ανεξάρτητα κεφάλαια μεταγλωττίζονται παράλληλα και τα .aux ξαναχρησιμοποιούνται, ώστε
+  συνήθως αρκεί ένα πέρασμα. Στο τέλος ξαναχτίζεται το main.pdf αν άλλαξε κάποιο κεφάλαιο.
+
+Χρήση:
+  python build_report.py                       # ό,τι άλλαξε + main.pdf
+  python build_report.py 07_exercise_6         # μόνο ένα κεφάλαιο (και main.pdf)
+  python build_report.py --no-book -j 4        # μόνο τα αυτόνομα κεφάλαια
+  python build_report.py --dry-run             # τι θα μεταγλωττιστεί
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from macrocore.report import build_report, chapters
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+BOOK_DIR = os.path.join(ROOT, "latex", "big_book")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Σταδιακή μεταγλώττιση του latex/big_book")
+    parser.add_argument("chapters", nargs="*", help="κεφάλαια-στόχοι (προεπιλογή: όλα)")
+    parser.add_argument("--book-dir", default=BOOK_DIR, help="φάκελος του βιβλίου (main.tex, preamble.tex)")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="μέγιστος αριθμός παράλληλων μεταγλωττίσεων")
+    parser.add_argument("--engine", default="xelatex", help="μηχανή TeX (προεπιλογή: xelatex)")
+    parser.add_argument("--force", action="store_true", help="μεταγλώττιση ακόμη και των ενημερωμένων κεφαλαίων")
+    parser.add_argument("--no-book", action="store_true", help="χωρίς το πλήρες main.pdf")
+    parser.add_argument("--dry-run", action="store_true", help="μόνο εμφάνιση του τι θα μεταγλωττιστεί")
+    parser.add_argument("--list", action="store_true", help="λίστα των κεφαλαίων")
+    args = parser.parse_args()
+
+    if args.list:
+        for chapter in chapters(args.book_dir):
+            print(chapter)
+        return
+
+    try:
+        status = build_report(args.book_dir, targets=args.chapters or None, jobs=args.jobs, force=args.force,
+                              dry_run=args.dry_run, engine=args.engine, book=not args.no_book)
+    except FileNotFoundError as e:
+        print(f"Σφάλμα: {e}")
+        sys.exit(1)
+    for unit, state in status.items():
+        print(f"{unit:<28} {state}")
+    if "απέτυχε" in status.values():
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""
+Συντάκτης: thodoreskourtales
+
+Σκοπός:
+  Έλεγχος του φορτωτή Eurostat (macrocore/eurostat.py) απέναντι στον φορτωτή του XLSX.
+  Τα αρχεία του fixtures/eurostat (TSV.gz, SDMX-CSV, SDMX-ML) περιέχουν τις σειρές των
+  φύλλων 40 (ΑΕΠ, τρέχουσες τιμές) και 79 (αποπληθωριστής ΑΕΠ) του Quarterly_Data.xlsx για
+  2021-Q1–2023-Q3, με τις σημαίες τους, μαζί με σειρές που πρέπει να απορριφθούν από τα
+  φίλτρα (άλλο geo, άλλη μονάδα, μη προσαρμοσμένα δεδομένα με κενά). Για κάθε μορφή, το
+  sheet_loader("eurostat", …) πρέπει να δίνει το ίδιο DataFrame (τιμές, δείκτης, ετικέτα
+  εποχικής προσαρμογής, σημαίες) με το load_and_clean_sheet στο XLSX.
+
+Χρήση:
+  python check_eurostat.py [--xlsx exercise.5/Quarterly_Data.xlsx]
+"""
+
+import argparse
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, ROOT)
+
+import pandas as pd
+
+from macrocore.eurostat import detect_format, sheet_loader
+from macrocore.loading import load_and_clean_sheet
+
+FIXTURES = os.path.join(ROOT, "fixtures", "eurostat")
+FIXTURE_FILES = ("namq_10_gdp.tsv.gz", "namq_10_gdp.csv", "namq_10_gdp.xml")
+SHEETS = ("Sheet 40", "Sheet 79")
+# Οι κλήσεις φόρτωσης των scripts (6.py: σημαίες, 5.py: drop_unchanged και αγγλικά ονόματα)
+CALLS = ({"with_flags": True}, {"columns": ("Euro", "Greece"), "drop_unchanged": True})
+START = (2021, 1)
+
+
+def compare(expected, actual):
+    """Λίστα διαφορών ανάμεσα σε δύο αποτελέσματα φόρτωσης (DataFrame ή (DataFrame, σημαίες))."""
+    if isinstance(expected, tuple):
+        (expected, expected_flags), (actual, actual_flags) = expected, actual
+    else:
+        expected_flags = actual_flags = {}
+    problems = []
+    try:
+        pd.testing.assert_frame_equal(actual, expected, check_index_type=False, check_freq=False)
+    except AssertionError as e:
+        problems.append(f"τιμές: {e}")
+    if actual.attrs.get("seasonal_adjustment") != expected.attrs.get("seasonal_adjustment"):
+        problems.append(f"εποχική προσαρμογή: {actual.attrs.get('seasonal_adjustment')!r} "
+                        f"αντί {expected.attrs.get('seasonal_adjustment')!r}")
+    if set(actual_flags) != set(expected_flags):
+        problems.append(f"σημαίες: {sorted(actual_flags)} αντί {sorted(expected_flags)}")
+    for name in set(actual_flags) & set(expected_flags):
+        try:
+            pd.testing.assert_frame_equal(actual_flags[name], expected_flags[name], check_index_type=False)
+        except AssertionError as e:
+            problems.append(f"σημαία {name}: {e}")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Έλεγχος του φορτωτή Eurostat απέναντι στο XLSX")
+    parser.add_argument("--xlsx", default=os.path.join(ROOT, "exercise.5", "Quarterly_Data.xlsx"),
+                        help="το τριμηνιαίο αρχείο Excel αναφοράς")
+    args = parser.parse_args()
+
+    failures = 0
+    for sheet in SHEETS:
+        for kwargs in CALLS:
+            expected = load_and_clean_sheet(args.xlsx, sheet, start=START, **kwargs)
+            for name in FIXTURE_FILES:
+                path = os.path.join(FIXTURES, name)
+                actual = sheet_loader("eurostat", path)(args.xlsx, sheet, start=START, **kwargs)
+                problems = compare(expected, actual)
+                failures += bool(problems)
+                options = ", ".join(f"{k}={v}" for k, v in kwargs.items())
+                print(f"{'OK ' if not problems else 'ΣΦΑΛΜΑ'} {sheet} ({options}) από {name} [{detect_format(path)}]")
+                for problem in problems:
+                    print(f"    {problem}")
+    if failures:
+        sys.exit(f"{failures} έλεγχοι απέτυχαν.")
+    print("Όλες οι μορφές Eurostat συμφωνούν με το XLSX.")
+
+
+if __name__ == "__main__":
+    main()
@@ -25,16 +25,28 @@ Created on Wed Mar  5 15:25:00 2025
 Ημερομηνία: 05/03/2025
 """
 
+import argparse
 import scipy.io
 import numpy as np
 import matplotlib.pyplot as plt
 import os
+import sys
+
+# Κοινό πακέτο macrocore (φάκελος MT.1)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from macrocore.rebasing import base_period_crossing
+from macrocore.report import render_template
+from macrocore.cli import add_figure_arguments
+from macrocore.plotting import save_figure, use_style, configure as configure_plots
 
 # Global variable για αποθήκευση του μέγιστου σφάλματος επαλήθευσης
 max_identity_diff = None
 
 def main():
     global max_identity_diff
+    parser = argparse.ArgumentParser(description="Ασκήσεις 1-3: ρυθμοί ανάπτυξης, έτος βάσης και αναφορά LaTeX")
+    args = add_figure_arguments(parser).parse_args()
+    configure_plots(check=args.check_plots, format=args.figure_format)
     # Ορίστε τη διαδρομή προς το αρχείο .mat (βεβαιωθείτε ότι το αρχείο βρίσκεται στη σωστή τοποθεσία)
     file_path = 'GDP_data.mat'
     
@@ -53,10 +65,9 @@ def main():
     print("Διαστάσεις Δείκτη ΑΕΠ:", gdp_index.shape)
     
     # Εύρεση της βάσης (base year)
-    base_year_ea = find_base_year(nominal_gdp[:, 0], real_gdp[:, 0])
-    base_year_gr = find_base_year(nominal_gdp[:, 1], real_gdp[:, 1])
-    print("Για την Ευρωζώνη, η βάση βρίσκεται στο index:", base_year_ea)
-    print("Για την Ελλάδα, η βάση βρίσκεται στο index:", base_year_gr)
+    (base_year_ea, base_year_gr), crossing = find_base_year(nominal_gdp, real_gdp)
+    print("Για την Ευρωζώνη, η βάση βρίσκεται στο index:", base_year_ea, f"(τομή στο {crossing[0]:.2f})")
+    print("Για την Ελλάδα, η βάση βρίσκεται στο index:", base_year_gr, f"(τομή στο {crossing[1]:.2f})")
     
     # Υπολογισμός του GDP Deflator
     gdp_deflator = (nominal_gdp / real_gdp) * 100
@@ -83,18 +94,19 @@ def main():
                          country='Greece', filename_prefix='subplots_greece')
     
     # Ενιαίο γράφημα που συγκρίνει τα δεδομένα για τις δύο χώρες (side by side)
-    plot_side_by_side(growth_nominal_gdp, growth_real_gdp, growth_deflator, filename='side_by_side_growth.png')
+    image_file = plot_side_by_side(growth_nominal_gdp, growth_real_gdp, growth_deflator, filename='side_by_side_growth.png')
     
     # Δημιουργία αναφοράς σε LaTeX
-    generate_latex_report(max_identity_diff, base_year_ea, base_year_gr, image_file='side_by_side_growth.png')
+    generate_latex_report(max_identity_diff, base_year_ea, base_year_gr, image_file=image_file)
 
 def find_base_year(nominal, real):
     """
-    Βρίσκει το index της περιόδου όπου ο ονομαστικός ΑΕΠ είναι ίσος (ή όσο πιο κοντά)
-    στον πραγματικό ΑΕΠ.
+    Βρίσκει για όλες τις χώρες (στήλες) μαζί το index της περιόδου όπου ο ονομαστικός ΑΕΠ
+    είναι ίσος (ή όσο πιο κοντά) στον πραγματικό ΑΕΠ, καθώς και την κλασματική θέση της
+    τομής με γραμμική παρεμβολή (NaN αν οι σειρές δεν τέμνονται).
     """
-    index = np.argmin(np.abs(nominal - real))
-    return index
+    index, position = base_period_crossing(nominal, real)
+    return index, position
 
 def plot_growth_subplots(nom_growth, real_growth, defl_growth, country, filename_prefix='plot'):
     """
@@ -106,10 +118,7 @@ def plot_growth_subplots(nom_growth, real_growth, defl_growth, country, filename
     Η χρονική κλίμακα (x-axis) εμφανίζει τα έτη, ξεκινώντας από 1996 (δεδομένου ότι οι ρυθμοί ανάπτυξης
     προκύπτουν ως διαφορές).
     """
-    try:
-        plt.style.use('seaborn-whitegrid')
-    except OSError:
-        plt.style.use('default')
+    use_style('seaborn-whitegrid', 'default')
     
     fig, axs = plt.subplots(3, 1, figsize=(8, 10), dpi=150)
     line_width = 2
@@ -137,8 +146,7 @@ def plot_growth_subplots(nom_growth, real_growth, defl_growth, country, filename
     axs[2].tick_params(labelsize=9)
     
     fig.tight_layout()
-    image_filename = f'{filename_prefix}.png'
-    plt.savefig(image_filename)
+    image_filename = save_figure(fig, f'{filename_prefix}.png')
     print(f"Το γράφημα υπο-διαγραμμάτων για την {country} αποθηκεύτηκε ως: {image_filename}")
     plt.close()
 
@@ -149,11 +157,9 @@ def plot_side_by_side(nom_growth, real_growth, defl_growth, filename='side_by_si
       - Δεξιά στήλη: δεδομένα για την Ελλάδα.
     
     Η x-κλίμακα για κάθε γράφημα εμφανίζει τα έτη, ξεκινώντας από 1996.
+    Επιστρέφει το όνομα του αρχείου (η κατάληξη ακολουθεί το --figure-format).
     """
-    try:
-        plt.style.use('seaborn-whitegrid')
-    except OSError:
-        plt.style.use('default')
+    use_style('seaborn-whitegrid', 'default')
     
     fig, axs = plt.subplots(3, 2, figsize=(14, 12), dpi=150)
     line_width = 2
@@ -201,92 +207,27 @@ def plot_side_by_side(nom_growth, real_growth, defl_growth, filename='side_by_si
     axs[2, 1].tick_params(labelsize=9)
     
     fig.tight_layout()
-    plt.savefig(filename)
+    filename = save_figure(fig, filename)
     print(f"Το ενιαίο γράφημα (side by side) αποθηκεύτηκε ως: {filename}")
     plt.close()
+    return filename
 
 def generate_latex_report(max_diff, base_year_ea, base_year_gr, image_file):
     """
     Δημιουργεί ένα αρχείο αναφοράς σε LaTeX που περιγράφει αναλυτικά τη μεθοδολογία και τα αποτελέσματα,
     συμπεριλαμβανομένης της εύρεσης της βάσης (base year) για τον ονομαστικό και τον πραγματικό ΑΕΠ,
     καθώς και την παρουσίαση των γραφημάτων.
+    Το κείμενο βρίσκεται στο πρότυπο report_template.tex (θέσεις @@όνομα, βλ. macrocore.report)·
+    το report.tex ξαναγράφεται μόνο αν άλλαξε κάποιο μέγεθος.
     """
-    latex_content = r"""
-\documentclass{article}
-
-\usepackage{fontspec}
-\usepackage{polyglossia}
-\setdefaultlanguage{greek}
-\setotherlanguage{english}
-% Ορισμός βασικού font ως Noto Serif (βεβαιωθείτε ότι είναι εγκατεστημένο)
-\setmainfont{Noto Serif}
-% Ορισμός monospace font για την ορθή απόδοση ελληνικών χαρακτήρων στα \texttt{}
-\newfontfamily\greekfonttt{Noto Sans Mono}
-
-\usepackage{amsmath}
-\usepackage{graphicx}
-\usepackage{hyperref}
-\title{Αναλυτική Αναφορά Ανάλυσης Δεδομένων ΑΕΠ}
-\author{Θεόδωρος Κούρταλης}
-\date{\today}
-\begin{document}
-\maketitle
-
-\section{Εισαγωγή}
-Η παρούσα αναφορά παρουσιάζει τη διαδικασία ανάλυσης των δεδομένων ΑΕΠ από το αρχείο \texttt{GDP\_data.mat}. Οι κύριες μεταβλητές είναι ο Ονομαστικός ΑΕΠ, ο Πραγματικός ΑΕΠ και ο Δείκτης ΑΕΠ. Από τον ονομαστικό και τον πραγματικό ΑΕΠ υπολογίστηκε ο GDP Deflator μέσω του τύπου:
-\[
-\text{GDP Deflator} = \frac{\text{Nominal GDP}}{\text{Real GDP}} \times 100.
-\]
-Εφαρμόστηκε ο φυσικός λογαρίθμος για τον υπολογισμό των ρυθμών ανάπτυξης (ως πρώτες διαφορές των λογαρίθμων) και επαληθεύτηκε η σχέση:
-\[
-\Delta \log(\text{Nominal GDP}) = \Delta \log(\text{Real GDP}) + \Delta \log(\text{GDP Deflator}),
-\]
-με μέγιστη απόλυτη διαφορά: \textbf{""" + f"{max_diff:.5f}" + r"""}. 
-
-\section{Μεθοδολογία}
-\begin{enumerate}
-    \item \textbf{Φόρτωση Δεδομένων:} Τα δεδομένα εξήχθησαν από το αρχείο \texttt{GDP\_data.mat} χρησιμοποιώντας το \texttt{scipy.io.loadmat}. Οι βασικές σειρές είναι:
-    \begin{itemize}
-       \item \texttt{nominal\_gdp} --- Ονομαστικός ΑΕΠ.
-       \item \texttt{real\_gdp} --- Πραγματικός ΑΕΠ.
-       \item \texttt{gdp\_index} --- Δείκτης ΑΕΠ.
-    \end{itemize}
-    \item \textbf{Υπολογισμός GDP Deflator:} Ο GDP Deflator υπολογίστηκε ως:
-    \[
-    \text{GDP Deflator} = \frac{\text{Nominal GDP}}{\text{Real GDP}} \times 100.
-    \]
-    \item \textbf{Λογαριθμικός Μετασχηματισμός και Υπολογισμός Ρυθμών Ανάπτυξης:} Εφαρμόστηκαν οι φυσικοί λογαρίθμοι στις σειρές και στη συνέχεια υπολογίστηκαν οι ρυθμοί ανάπτυξης ως οι πρώτες διαφορές των λογαρίθμων.
-    \item \textbf{Εύρεση Βάσης (Base Year):} Η βάση ορίζεται ως η χρονική περίοδος κατά την οποία ο ονομαστικός ΑΕΠ είναι ίσος (ή όσο το δυνατόν πιο κοντά) στον πραγματικό ΑΕΠ. Για την Ευρωζώνη η βάση βρίσκεται στο index \textbf{""" + str(base_year_ea) + r"""}, και για την Ελλάδα στο index \textbf{""" + str(base_year_gr) + r"""}.
-    
-    \textit{Παρατήρηση:} Και οι σειρές του ονομαστικού και του πραγματικού ΑΕΠ παρουσιάζουν τάση (κλίση), οπότε η εύρεση της βάσης προσφέρει ένα σημείο αναφοράς για τη σύγκριση των μεταβολών.
-    
-    \item \textbf{Σχεδίαση Γραφημάτων:} Για κάθε χώρα δημιουργήθηκαν:
-    \begin{itemize}
-        \item Γράφημα υπο-διαγραμμάτων (3 υπογράμματα) που απεικονίζουν τους ρυθμούς ανάπτυξης.
-        \item Ένα ενιαίο γράφημα (side by side) που συγκρίνει τους ρυθμούς ανάπτυξης μεταξύ της Ευρωζώνης και της Ελλάδας.
-    \end{itemize}
-\end{enumerate}
-
-\section{Αποτελέσματα}
-Το ενιαίο γράφημα που συγκρίνει τους ρυθμούς ανάπτυξης για τις δύο χώρες παρουσιάζεται στην εικόνα:
-\begin{figure}[h!]
-    \centering
-    \includegraphics[width=0.9\textwidth]{""" + image_file + r"""}
-    \caption{Σύνοψη ρυθμών ανάπτυξης για την Ευρωζώνη και για την Ελλάδα. Τα δεδομένα αναπαριστούν τα έτη από 1996 έως 2022.}
-\end{figure}
-
-Τα γραφήματα υπο-διαγραμμάτων για κάθε χώρα αποθηκεύτηκαν στα αρχεία:
-\begin{itemize}
-    \item \texttt{subplots\_euro\_area.png} για την Ευρωζώνη.
-    \item \texttt{subplots\_greece.png} για την Ελλάδα.
-\end{itemize}
-
-
-\end{document}
-    """
+    context = {
+        "max_diff": f"{max_diff:.5f}",
+        "base_year_ea": str(base_year_ea),
+        "base_year_gr": str(base_year_gr),
+        "image_file": image_file,
+    }
     report_filename = "report.tex"
-    with open(report_filename, "w", encoding="utf-8") as f:
-        f.write(latex_content)
+    render_template("report_template.tex", context, report_filename)
     print(f"Η αναφορά σε LaTeX δημιουργήθηκε και αποθηκεύτηκε στο αρχείο: {report_filename}")
 
 if __name__ == '__main__':
@@ -8,8 +8,26 @@ Created on Thu Mar 13 16:47:30 2025
 
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
 import os
+import sys
+
+# Shared macrocore package (MT.1 folder)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from macrocore.lazy import lazy_import
+from macrocore.cli import script_arguments
+from macrocore.loading import load_annual_sheet, load_and_clean_sheet
+from macrocore.eurostat import sheet_loader
+from macrocore.periods import align_frames
+from macrocore.store import open_run, close_run, write_frame
+from macrocore.validation import validate_workbook
+from macrocore.disaggregation import chow_lin
+from macrocore.rebasing import rebase
+from macrocore.chainlinking import chain_linked_aggregates
+from macrocore.growth import growth_rates
+from macrocore.plotting import save_figure, configure as configure_plots
+
+# matplotlib is only loaded when a plot is actually drawn (not with --no-plots)
+plt = lazy_import("matplotlib.pyplot")
 
 # New mapping: for each measure, specify the Excel sheet for Nominal and for Chain linked (real).
 sheet_info = {
@@ -42,20 +60,35 @@ sheet_info = {
         "Chain linked": "Sheet 97"       # Chain linked volumes, index 2015=100 (Imports of goods and services)
     }
 }
+# Custom aggregates chain-linked from their components (weights on the sheet_info measures).
+custom_aggregates = {
+    "Domestic demand (FCE + GFCF)": {
+        "Final consumption expenditure": 1,
+        "Gross fixed capital formation": 1
+    },
+    "Final expenditure (FCE + GFCF + Exports)": {
+        "Final consumption expenditure": 1,
+        "Gross fixed capital formation": 1,
+        "Exports of goods and services": 1
+    }
+}
+# Quarterly indicators for the temporal disaggregation: the same measures in the quarterly
+# workbook of Exercises 5/6 (real = Nominal / Deflator * 100, million euro).
+quarterly_file = os.path.join("..", "exercise.5", "Quarterly_Data.xlsx")
+quarterly_sheets = {
+    "Nominal GDP": {"Nominal": "Sheet 40", "Deflator": "Sheet 79"},
+    "Final consumption expenditure": {"Nominal": "Sheet 42", "Deflator": "Sheet 81"},
+    "Final consumption expenditure of general government": {"Nominal": "Sheet 43", "Deflator": "Sheet 82"},
+    "Final consumption expenditure of households": {"Nominal": "Sheet 47", "Deflator": "Sheet 86"},
+    "Gross fixed capital formation": {"Nominal": "Sheet 51", "Deflator": "Sheet 90"},
+    "Exports of goods and services": {"Nominal": "Sheet 55", "Deflator": "Sheet 94"},
+    "Imports of goods and services": {"Nominal": "Sheet 58", "Deflator": "Sheet 97"}
+}
+# Reference year of the Eurostat chain-linked volumes.
+reference_year = 2015
 # Dictionary to store summary info for each measure.
 report_data = {}
 
-def convert_to_float(x):
-    """Convert a cell value to float; treat ':' as NaN."""
-    try:
-        if isinstance(x, str):
-            x = x.strip()
-            if x == ":":
-                return np.nan
-        return float(x)
-    except:
-        return np.nan
-
 def plot_growth_side_by_side(years, growth_values, var_name, filename, scale_threshold=2):
     """
     Create a side-by-side growth plot for two regions (assumed first column = Euro Zone,
@@ -78,7 +111,7 @@ def plot_growth_side_by_side(years, growth_values, var_name, filename, scale_thr
     axs[1].legend()
     fig.suptitle(f'{var_name} Growth Rates (1995–2022)', fontsize=14)
     fig.tight_layout(rect=[0, 0.03, 1, 0.95])
-    plt.savefig(filename)
+    filename = save_figure(fig, filename)
     plt.close()
     print(f"Growth plot for '{var_name}' saved as: {filename}")
 
@@ -87,11 +120,10 @@ def plot_measure_combined(measure_name, years, nominal, chain, deflator, base_ye
     Create a combined plot for levels of a measure (Nominal, Chain linked, Deflator)
     rebased to base_year_target.
     """
-    idx = np.where(years == base_year_target)[0]
-    idx = idx[0] if len(idx) > 0 else 0
-    nominal_norm = nominal / nominal[idx, :] * 100
-    chain_norm = chain / chain[idx, :] * 100
-    deflator_norm = deflator / deflator[idx, :] * 100
+    # Rebase the whole (year x region x series) block in one pass (first year if the target is missing).
+    base = base_year_target if base_year_target in years else years[0]
+    levels = rebase(np.stack([nominal, chain, deflator], axis=2), base, years)
+    nominal_norm, chain_norm, deflator_norm = levels[:, :, 0], levels[:, :, 1], levels[:, :, 2]
 
     fig, axs = plt.subplots(1, 2, figsize=(14, 6), dpi=150, sharey=True)
     axs[0].plot(years, nominal_norm[:, 0], marker='o', linestyle='-', label="Nominal")
@@ -109,7 +141,7 @@ def plot_measure_combined(measure_name, years, nominal, chain, deflator, base_ye
     axs[1].legend()
     fig.suptitle(f"{measure_name} Levels (Rebased to {base_year_target} = 100)", fontsize=16)
     fig.tight_layout(rect=[0, 0.03, 1, 0.95])
-    plt.savefig(filename)
+    filename = save_figure(fig, filename)
     plt.close()
     print(f"Combined levels plot for '{measure_name}' saved as: {filename}")
 
@@ -128,7 +160,7 @@ def plot_measure_growth_by_country(measure_name, years, growth_nominal, growth_c
     plt.ylabel("Growth Rate (Δ log(series))")
     plt.legend()
     plt.tight_layout()
-    plt.savefig(filename_euro)
+    filename_euro = save_figure(plt.gcf(), filename_euro)
     plt.close()
     print(f"Combined growth plot for '{measure_name}' (Euro Zone) saved as: {filename_euro}")
     
@@ -142,39 +174,141 @@ def plot_measure_growth_by_country(measure_name, years, growth_nominal, growth_c
     plt.ylabel("Growth Rate (Δ log(series))")
     plt.legend()
     plt.tight_layout()
-    plt.savefig(filename_greece)
+    filename_greece = save_figure(plt.gcf(), filename_greece)
     plt.close()
     print(f"Combined growth plot for '{measure_name}' (Greece) saved as: {filename_greece}")
 
+def load_quarterly_indicator(measure_name, load_sheet=load_and_clean_sheet):
+    """
+    Quarterly real volumes (Euro, Greece) of a measure from the quarterly workbook, or None.
+    load_sheet: the sheet loader (see macrocore.eurostat.sheet_loader for the Eurostat source).
+    """
+    sheets = quarterly_sheets.get(measure_name)
+    if sheets is None or (load_sheet is load_and_clean_sheet and not os.path.exists(quarterly_file)):
+        return None
+    df_nom = load_sheet(quarterly_file, sheets["Nominal"], columns=("Euro", "Greece"))
+    df_def = load_sheet(quarterly_file, sheets["Deflator"], columns=("Euro", "Greece"))
+    df_nom, df_def = align_frames(df_nom, df_def)
+    return df_nom / (df_def / 100)
+
+
+def disaggregate_annual(annual_real, conn=None, run_id=None, filename="quarterly_disaggregated.csv",
+                        load_sheet=load_and_clean_sheet):
+    """
+    Chow-Lin disaggregation of every annual chain-linked series (all measures and regions)
+    to quarters, with the quarterly real volume of the same measure as indicator and an
+    estimated AR(1) rho. The quarters of each year sum exactly to the annual total. Only
+    complete years covered by both the annual series and the indicator are used; measures
+    without a quarterly indicator are skipped. The indicators are read with load_sheet
+    (--source). The result is saved as CSV and in the results store (frequency Q, filter
+    Chow-Lin).
+    """
+    frames = {}
+    for measure_name, df_annual in annual_real.items():
+        try:
+            indicator = load_quarterly_indicator(measure_name, load_sheet)
+        except Exception as e:
+            print(f"Warning: no quarterly indicator for '{measure_name}': {e}")
+            continue
+        if indicator is None:
+            print(f"Warning: no quarterly indicator for '{measure_name}', skipping its disaggregation.")
+            continue
+        # Complete years of the indicator that are also in the annual series
+        counts = pd.Series(indicator.index // 4).value_counts()
+        years = np.intersect1d(df_annual.dropna().index.to_numpy(), counts.index[counts == 4].to_numpy())
+        if len(years) < 3 or not np.array_equal(years, np.arange(years[0], years[-1] + 1)):
+            print(f"Warning: no contiguous common years for '{measure_name}', skipping its disaggregation.")
+            continue
+        quarters = pd.RangeIndex(years[0] * 4, (years[-1] + 1) * 4, name="period")
+        annual = df_annual.loc[years]
+        X = indicator.loc[quarters, annual.columns].to_numpy()
+        values = np.empty((len(quarters), annual.shape[1]))
+        for j in range(annual.shape[1]):
+            quarterly_j, _, rho = chow_lin(annual.iloc[:, j].to_numpy(), X[:, j])
+            values[:, j] = quarterly_j.ravel()
+            print(f"Chow-Lin '{measure_name}' ({annual.columns[j]}): rho = {rho[0]:.2f}")
+        frames[measure_name] = pd.DataFrame(values, index=quarters, columns=annual.columns)
+    if not frames:
+        return None
+
+    quarterly = pd.concat(frames, axis=1)
+    quarterly.to_csv(filename)
+    if conn:
+        for measure_name, frame in frames.items():
+            write_frame(conn, run_id, frame, measure_name, "real", "Q", filter="Chow-Lin")
+    print(f"Quarterly disaggregation (Chow-Lin) of {quarterly.shape[1]} series saved to {filename}")
+    return quarterly
+
+
+def build_custom_aggregates(annual_nominal, annual_real, conn=None, run_id=None, filename="custom_aggregates.csv"):
+    """
+    Chain-link every aggregate in custom_aggregates at once: the (year x region x component)
+    blocks of current prices and chain-linked volumes are combined with a weight matrix
+    (components x aggregates). Saves nominal and chain-linked levels as CSV and in the results store.
+    """
+    components = [m for m in annual_nominal if any(m in weights for weights in custom_aggregates.values())]
+    missing = {m for weights in custom_aggregates.values() for m in weights} - set(components)
+    if not components or missing:
+        print(f"Warning: missing components {sorted(missing)}, skipping the custom aggregates.")
+        return None
+    nominal = pd.concat([annual_nominal[m] for m in components], axis=1, keys=components, join="inner")
+    real = pd.concat([annual_real[m] for m in components], axis=1, keys=components, join="inner")
+    years = nominal.index.to_numpy()
+    regions = list(annual_nominal[components[0]].columns)
+    # (year x region x component) blocks
+    shape = (len(years), len(components), len(regions))
+    block_nominal = nominal.to_numpy().reshape(shape).transpose(0, 2, 1)
+    block_real = real.to_numpy().reshape(shape).transpose(0, 2, 1)
+    weights = np.array([[custom_aggregates[a].get(m, 0) for a in custom_aggregates] for m in components], dtype=float)
+    nominal_agg, real_agg = chain_linked_aggregates(block_nominal, block_real, weights,
+                                                    reference=reference_year, years=years)
+
+    frames = {}
+    for k, aggregate_name in enumerate(custom_aggregates):
+        frames[(aggregate_name, "Nominal")] = pd.DataFrame(nominal_agg[:, :, k], index=nominal.index, columns=regions)
+        frames[(aggregate_name, "Chain linked")] = pd.DataFrame(real_agg[:, :, k], index=nominal.index, columns=regions)
+        if conn:
+            write_frame(conn, run_id, frames[(aggregate_name, "Nominal")], aggregate_name, "nominal", "A")
+            write_frame(conn, run_id, frames[(aggregate_name, "Chain linked")], aggregate_name, "real", "A")
+    table = pd.concat(frames, axis=1)
+    table.to_csv(filename)
+    print(f"Chain-linked custom aggregates ({len(custom_aggregates)}) saved to {filename}")
+    return table
+
+
 def main():
+    args = script_arguments("Exercise 4: annual Nominal, Chain linked and Deflator series", compact=False)
+    configure_plots(check=args.check_plots, format=args.figure_format)
+    # Fail fast on a corrupted workbook (accounting identities, deflators, gaps).
+    if not args.no_validate:
+        validate_workbook("Annual_Data.xlsx", "A")
+    # Source of the quarterly indicators: the quarterly workbook or a Eurostat file (--source)
+    load_sheet = sheet_loader(args.source, args.eurostat_file)
+    quarterly_source = quarterly_file if args.source == "xlsx" else args.eurostat_file
+    conn, run_id = open_run(args.results_db, "4.py", inputs=["Annual_Data.xlsx", quarterly_source])
+    annual_nominal, annual_real = {}, {}
     # Process each measure in the new sheet_info.
     for measure_name, sheets in sheet_info.items():
         try:
-            # Read both the Nominal and Chain linked sheets.
-            df_nom = pd.read_excel("Annual_Data.xlsx", sheet_name=sheets["Nominal"], header=None, skiprows=8, nrows=4)
-            df_chain = pd.read_excel("Annual_Data.xlsx", sheet_name=sheets["Chain linked"], header=None, skiprows=8, nrows=4)
+            # Read both the Nominal and Chain linked sheets (1995–2022, indexed by integer year).
+            df_nom = load_annual_sheet("Annual_Data.xlsx", sheets["Nominal"])
+            df_chain = load_annual_sheet("Annual_Data.xlsx", sheets["Chain linked"])
         except Exception as e:
             print(f"Error reading sheets for {measure_name}: {e}")
             continue
 
         print(f"Processing measure '{measure_name}' with Nominal sheet '{sheets['Nominal']}' and Chain linked sheet '{sheets['Chain linked']}'")
         
-        # Get the time row (assumed identical in both sheets).
-        time_row = pd.to_numeric(df_nom.iloc[0].values, errors="coerce")
-        selected_cols = np.where((time_row >= 1995) & (time_row <= 2022))[0]
-        if len(selected_cols) == 0:
+        # Align both sheets on their common years.
+        df_nom, df_chain = align_frames(df_nom, df_chain)
+        if df_nom.empty:
             print(f"Warning: No columns for 1995–2022 in measure '{measure_name}'.")
             continue
+        selected_years = df_nom.index.to_numpy()
         
-        # Extract the data for Euro Zone and Greece.
-        df_nom_data = df_nom.iloc[2:4, selected_cols]
-        df_chain_data = df_chain.iloc[2:4, selected_cols]
-        df_nom_data = df_nom_data.applymap(convert_to_float).ffill(axis=1)
-        df_chain_data = df_chain_data.applymap(convert_to_float).ffill(axis=1)
-        
-        # Convert to NumPy arrays.
-        values_nom = df_nom_data.transpose().values
-        values_chain = df_chain_data.transpose().values
+        # Convert to NumPy arrays (Euro Zone, Greece).
+        values_nom = df_nom.values
+        values_chain = df_chain.values
         if np.all(np.isnan(values_nom)) or np.all(np.isnan(values_chain)):
             print(f"Warning: Data conversion issue for {measure_name}.")
             continue
@@ -182,18 +316,47 @@ def main():
         # Calculate the deflator for the measure.
         deflator = (values_nom / values_chain) * 100
         
-        # Compute logarithms and growth rates.
-        log_nom = np.log(values_nom)
-        log_chain = np.log(values_chain)
-        log_def = np.log(deflator)
-        growth_nom = np.diff(log_nom, axis=0)
-        growth_chain = np.diff(log_chain, axis=0)
-        growth_def = np.diff(log_def, axis=0)
+        # Compute log growth rates of all three series in one pass (year-on-year and 5-year CAGR).
+        rates = growth_rates(np.hstack([values_nom, values_chain, deflator]), periods_per_year=1,
+                             horizons=("yy", "cagr_5"))
+        growth_nom, growth_chain, growth_def = np.hsplit(rates["yy"][1:], 3)
         
         # Extract the time points.
-        selected_years = time_row[selected_cols]
         growth_years = selected_years[1:]
         
+        annual_nominal[measure_name] = df_nom
+        annual_real[measure_name] = df_chain
+
+        # Save the growth rates (numeric output, also in --no-plots mode).
+        filename_growth_csv = measure_name.replace(" ", "_").replace("/", "_") + "_growth.csv"
+        growth_table = pd.DataFrame(
+            np.hstack([growth_nom, growth_chain, growth_def]),
+            index=pd.Index(growth_years, name="year"),
+            columns=pd.MultiIndex.from_product([["Nominal", "Chain linked", "Deflator"], ["Euro", "Greece"]]))
+        growth_table.to_csv(filename_growth_csv)
+        
+        # Persist levels and growth rates in the results store.
+        if conn:
+            df_def = pd.DataFrame(deflator, index=df_nom.index, columns=df_nom.columns)
+            for concept, frame in (("nominal", df_nom), ("real", df_chain), ("deflator", df_def)):
+                write_frame(conn, run_id, frame, measure_name, concept, "A")
+            for concept, kind in (("growth_nominal", "Nominal"), ("growth_real", "Chain linked"), ("growth_deflator", "Deflator")):
+                write_frame(conn, run_id, growth_table[kind], measure_name, concept, "A")
+            cagr = pd.DataFrame(rates["cagr_5"], index=df_nom.index,
+                                columns=pd.MultiIndex.from_product([["nominal", "real", "deflator"], df_nom.columns]))
+            for concept in ("nominal", "real", "deflator"):
+                write_frame(conn, run_id, cagr[concept], measure_name, "growth_cagr_5_" + concept, "A")
+        
+        if args.no_plots:
+            report_data[measure_name] = {
+                "num_points": values_nom.shape[0],
+                "nominal_mean_growth": np.nanmean(growth_nom[:, 0]),
+                "chain_mean_growth": np.nanmean(growth_chain[:, 0]),
+                "deflator_mean_growth": np.nanmean(growth_def[:, 0]),
+                "growth_file": filename_growth_csv
+            }
+            continue
+        
         # Plot growth for each series.
         filename_nom_growth = measure_name.replace(" ", "_").replace("/", "_") + "_nominal_growth.png"
         plot_growth_side_by_side(growth_years, growth_nom, measure_name + " Nominal", filename_nom_growth)
@@ -221,6 +384,7 @@ def main():
             "nominal_mean_growth": np.nanmean(growth_nom[:, 0]),
             "chain_mean_growth": np.nanmean(growth_chain[:, 0]),
             "deflator_mean_growth": np.nanmean(growth_def[:, 0]),
+            "growth_file": filename_growth_csv,
             "plot_files": {
                 "nominal_growth": filename_nom_growth,
                 "chain_growth": filename_chain_growth,
@@ -231,6 +395,13 @@ def main():
             }
         }
     
+    # Quarterly bridge: Chow-Lin disaggregation of the annual chain-linked series for the HP pipeline.
+    if annual_real:
+        disaggregate_annual(annual_real, conn, run_id, load_sheet=load_sheet)
+    # Custom aggregates: chain-linked from the components' current and previous-year prices.
+    build_custom_aggregates(annual_nominal, annual_real, conn, run_id)
+    close_run(conn)
+    
     # Print summary information.
     print("\nProcessing completed. Summary of measures:")
     for measure, info in report_data.items():
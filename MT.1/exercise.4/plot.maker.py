@@ -1,43 +1,183 @@
+"""
+Παράρτημα της Άσκησης 4: ένα tcolorbox ανά διάγραμμα (.png) στο all_plots_boxes.tex.
+
+Σταδιακή δημιουργία με manifest (plots_manifest.json):
+  - για κάθε PNG κρατιούνται το hash του (βλ. pipeline.file_digest), ο μεταφρασμένος
+    τίτλος και η βελτιστοποιημένη εικόνα· μεταφράζονται και βελτιστοποιούνται μόνο τα
+    νέα ή αλλαγμένα διαγράμματα.
+  - οι καταχωρήσεις (tcolorbox) των διαγραμμάτων που δεν άλλαξαν μένουν ως έχουν στο
+    .tex (μαζί με τις λεζάντες του caption.adder.py ή χειρόγραφες αλλαγές)· νέες
+    γράφονται μόνο για νέα/αλλαγμένα διαγράμματα, και όσων χάθηκε το PNG αφαιρούνται.
+  - οι εικόνες μικραίνουν στο πλάτος εκτύπωσης, ξανασυμπιέζονται χωρίς απώλειες και
+    προαιρετικά γίνονται PDF, παράλληλα (βλ. macrocore.images), στον φάκελο optimized/.
+  Το .tex γράφεται μόνο αν άλλαξε το περιεχόμενό του.
+
+Χρήση:
+  python plot.maker.py                 # ό,τι άλλαξε
+  python plot.maker.py --pdf -j 4      # εικόνες PDF, 4 διεργασίες
+  python plot.maker.py --force         # όλα από την αρχή
+"""
+
+import argparse
+import json
 import os
-from googletrans import Translator, LANGUAGES
-from googletrans.constants import DEFAULT_USER_AGENT
-import httpx  # Χρησιμοποιούμε httpx για να εντοπίσουμε το Timeout
+import re
+import sys
+
+# Shared macrocore package (MT.1 folder)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from macrocore.pipeline import file_digest
+from macrocore.report import LatexTemplate, write_if_changed
+from macrocore.images import optimize_images, target_width_px
+
+# Ρυθμίσεις του παραρτήματος
+appendix = {
+    "folder": os.path.dirname(os.path.abspath(__file__)),  # ο φάκελος που περιέχει τα .png αρχεία
+    "output_tex": "all_plots_boxes.tex",                   # όνομα αρχείου LaTeX που θα δημιουργηθεί
+    "manifest": "plots_manifest.json",
+    "optimized_dir": "optimized",
+    "width": 0.8,                                          # πλάτος εικόνας ως κλάσμα του \textwidth
+    "dpi": 300,
+}
+
+HEADER = ("% Αυτόματα παραγόμενο αρχείο με όλα τα plots\n"
+          "\\chapter{Παράρτημα: Παραγόμενα Διαγράμματα}\n\n"
+          "\\graphicspath{{@@graphicspath/}}\n\n")
+
+# Κάθε καταχώρηση ξεκινά με σχόλιο-δείκτη με το όνομα του PNG
+MARKER = "% plot: "
+_ENTRY = re.compile(r"^" + re.escape(MARKER) + r"(.+?)\n(.*?)(?=^" + re.escape(MARKER) + r"|\Z)",
+                    re.MULTILINE | re.DOTALL)
+
+
+def translate_title(base_name, translator):
+    """Μετάφραση του ονόματος αρχείου σε ελληνικό τίτλο (fallback: το αρχικό όνομα)."""
+    base_name_for_translation = base_name.replace("_", " ")
+    if translator is None:
+        return base_name_for_translation
+    # Προσπάθεια μετάφρασης με try/except για να αποφύγουμε το timeout
+    try:
+        return translator.translate(base_name_for_translation, src='en', dest='el').text
+    except Exception as e:
+        print(f"Μετάφραση απέτυχε για '{base_name_for_translation}': {e}")
+        return base_name_for_translation
+
+
+def make_translator():
+    """Μεταφραστής googletrans, αν είναι εγκατεστημένος (αλλιώς None)."""
+    try:
+        from googletrans import Translator
+    except ImportError:
+        print("Το googletrans δεν είναι εγκατεστημένο· οι τίτλοι μένουν ως έχουν.")
+        return None
+    return Translator()
+
+
+def box_entry(png, title, image_name, width):
+    """Το tcolorbox ενός διαγράμματος με τον (μεταφρασμένο) τίτλο."""
+    return (f"{MARKER}{png}\n"
+            "\\begin{tcolorbox}[colback=white,colframe=black,title={" + title + "}]\n"
+            "  \\centering\n"
+            f"  \\includegraphics[width={width}\\textwidth]{{{image_name}}}\n"
+            "  \\vspace{0.5em}\n"
+            "\\end{tcolorbox}\n\n"
+            "\\FloatBarrier\n\n")
+
 
-# Ο φάκελος που περιέχει τα .png αρχεία
-folder = "/Users/thodoreskourtales/TK.MT.1/exercise.4"
+def existing_entries(tex_path):
+    """{png: καταχώρηση} από το υπάρχον .tex (όπως το άφησαν π.χ. το caption.adder.py)."""
+    if not os.path.exists(tex_path):
+        return {}
+    with open(tex_path, encoding="utf-8") as f:
+        text = f.read()
+    return {m.group(1): m.group(0) for m in _ENTRY.finditer(text)}
 
-# Βρες όλα τα αρχεία που τελειώνουν σε .png, ταξινομημένα για προβλέψιμη σειρά
-png_files = sorted([f for f in os.listdir(folder) if f.lower().endswith('.png')])
 
-# Δημιουργία αντικειμένου μεταφραστή
-translator = Translator()
+def load_manifest(path):
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    return {"settings": None, "images": {}, "files": {}}
 
-# Όνομα αρχείου LaTeX που θα δημιουργηθεί
-output_tex = "all_plots_boxes.tex"
 
-with open(output_tex, "w", encoding="utf-8") as texfile:
-    texfile.write("% Αυτόματα παραγόμενο αρχείο με όλα τα plots\n")
-    texfile.write("\\chapter{Παράρτημα: Παραγόμενα Διαγράμματα}\n\n")
-    texfile.write("\\graphicspath{{" + folder + "/}}\n\n")
-    
+def save_manifest(path, manifest):
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=1, ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Παράρτημα διαγραμμάτων της Άσκησης 4 (all_plots_boxes.tex)")
+    parser.add_argument("--pdf", action="store_true", help="εικόνες PDF αντί για PNG")
+    parser.add_argument("--dpi", type=int, default=appendix["dpi"], help="ανάλυση εκτύπωσης")
+    parser.add_argument("--no-optimize", action="store_true", help="τα αρχικά PNG, χωρίς βελτιστοποίηση")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="διεργασίες βελτιστοποίησης")
+    parser.add_argument("--force", action="store_true", help="όλα από την αρχή")
+    args = parser.parse_args()
+
+    folder = appendix["folder"]
+    manifest_path = os.path.join(folder, appendix["manifest"])
+    tex_path = os.path.join(folder, appendix["output_tex"])
+    optimized_dir = os.path.join(folder, appendix["optimized_dir"])
+    max_width = target_width_px(appendix["width"], args.dpi)
+
+    # Βρες όλα τα αρχεία που τελειώνουν σε .png, ταξινομημένα για προβλέψιμη σειρά
+    png_files = sorted([f for f in os.listdir(folder) if f.lower().endswith('.png')])
+
+    manifest = load_manifest(manifest_path)
+    settings = {"optimize": not args.no_optimize, "pdf": args.pdf, "max_width": max_width, "dpi": args.dpi}
+    if args.force or manifest["settings"] != settings:
+        manifest["images"] = {}
+    manifest["settings"] = settings
+    images = manifest["images"]
+
+    def image_name(png):
+        if args.no_optimize:
+            return png
+        return os.path.splitext(png)[0] + ".pdf" if args.pdf else png
+
+    changed = []
     for png in png_files:
-        base_name = os.path.splitext(png)[0]
-        base_name_for_translation = base_name.replace("_", " ")
-        
-        # Προσπάθεια μετάφρασης με try/except για να αποφύγουμε το timeout
-        try:
-            translated_title = translator.translate(base_name_for_translation, src='en', dest='el').text
-        except Exception as e:
-            print(f"Μετάφραση απέτυχε για '{base_name_for_translation}': {e}")
-            # Χρησιμοποιούμε ως fallback το αρχικό όνομα
-            translated_title = base_name_for_translation
-        
-        # Δημιουργούμε το tcolorbox με τον μεταφρασμένο τίτλο
-        texfile.write("\\begin{tcolorbox}[colback=white,colframe=black,title={" + translated_title + "}]\n")
-        texfile.write("  \\centering\n")
-        texfile.write("  \\includegraphics[width=0.8\\textwidth]{" + png + "}\n")
-        texfile.write("  \\vspace{0.5em}\n")
-        texfile.write("\\end{tcolorbox}\n\n")
-        texfile.write("\\FloatBarrier\n\n")
-
-print(f"Το αρχείο '{output_tex}' δημιουργήθηκε επιτυχώς!")
\ No newline at end of file
+        digest = file_digest(os.path.join(folder, png), manifest["files"])
+        entry = images.get(png)
+        optimized = os.path.join(optimized_dir, image_name(png))
+        if entry is None or entry["digest"] != digest or (not args.no_optimize and not os.path.exists(optimized)):
+            changed.append(png)
+            images[png] = {"digest": digest, "title": entry["title"] if entry else None}
+    for png in set(images) - set(png_files):
+        del images[png]
+    manifest["files"] = {p: v for p, v in manifest["files"].items() if os.path.basename(p) in images}
+
+    # Παράλληλη βελτιστοποίηση μόνο των νέων/αλλαγμένων εικόνων
+    if changed and not args.no_optimize:
+        pairs = [(os.path.join(folder, png), os.path.join(optimized_dir, image_name(png))) for png in changed]
+        before = after = 0
+        for _, size_before, size_after, _ in optimize_images(pairs, max_width, args.dpi, args.jobs):
+            before, after = before + size_before, after + size_after
+        print(f"Βελτιστοποιήθηκαν {len(pairs)} εικόνες: {before / 1e6:.1f} MB -> {after / 1e6:.1f} MB")
+
+    # Μετάφραση μόνο των τίτλων που λείπουν από το manifest
+    missing = [png for png in changed if not images[png]["title"]]
+    translator = make_translator() if missing else None
+    for png in missing:
+        images[png]["title"] = translate_title(os.path.splitext(png)[0], translator)
+
+    kept = existing_entries(tex_path)
+    body = [kept[png] if png in kept and png not in changed else
+            box_entry(png, images[png]["title"], image_name(png), appendix["width"])
+            for png in png_files]
+    graphicspath = folder if args.no_optimize else optimized_dir
+    content = LatexTemplate(HEADER).substitute(graphicspath=graphicspath.replace(os.sep, "/")) + "".join(body)
+    written = write_if_changed(tex_path, content)
+    save_manifest(manifest_path, manifest)
+
+    print(f"{len(changed)} νέα/αλλαγμένα από {len(png_files)} διαγράμματα.")
+    if written:
+        print(f"Το αρχείο '{appendix['output_tex']}' δημιουργήθηκε επιτυχώς!")
+    else:
+        print(f"Το αρχείο '{appendix['output_tex']}' είναι ήδη ενημερωμένο.")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,8 +8,24 @@ Created on Fri Mar  7 20:57:26 2025
 
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import re
+import os
+import sys
+
+# Shared macrocore package (MT.1 folder)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from macrocore.lazy import lazy_import
+from macrocore.cli import script_arguments
+from macrocore.eurostat import sheet_loader
+from macrocore.seasonal import needs_seasonal_adjustment, seasonal_adjust_frames
+from macrocore.periods import quarter_labels, align_frames
+from macrocore.store import open_run, close_run, write_frame
+from macrocore.validation import validate_workbook
+from macrocore.growth import growth_frames, growth_flags
+from macrocore import compact
+from macrocore.plotting import plot_series, save_figure, configure as configure_plots
+
+# matplotlib is only loaded when a plot is actually drawn (not with --no-plots)
+plt = lazy_import("matplotlib.pyplot")
 
 # Nested mapping of variable names to sheet names in Quarterly_Data.xlsx.
 # Εδώ ορίζουμε μόνο "Nominal" και "Deflator".
@@ -31,84 +47,25 @@ sheet_info = {
 
 excel_file = "Quarterly_Data.xlsx"
 
-def clean_cell(cell):
+def compute_growth_flags(flags, index, horizons=("qq", "yy", "annualized")):
     """
-    Cleans a cell value:
-      - If the cell equals ":", returns np.nan.
-      - If the cell is a string containing a number with possible trailing flags (e.g., "123p", "45.6 b"),
-        extracts and returns only the numeric portion as a float.
-      - Otherwise, attempts to convert the cell to float.
-    """
-    if isinstance(cell, str):
-        cell = cell.strip()
-        if cell == ":":
-            return np.nan
-        m = re.search(r"([-+]?[0-9]*\.?[0-9]+)", cell)
-        if m:
-            try:
-                return float(m.group(1))
-            except Exception:
-                return np.nan
-        else:
-            try:
-                return float(cell)
-            except Exception:
-                return np.nan
-    try:
-        return float(cell)
-    except Exception:
-        return np.nan
-
-def load_and_clean_sheet(sheet):
+    Quality flags of the growth rates (see macrocore.compact): a rate is flagged when either
+    of its two levels is. flags: {flag: DataFrame bool} of the levels. Returns
+    {horizon: {flag: DataFrame bool}} without the first quarter, like compute_growth.
     """
-    Loads a sheet from Quarterly_Data.xlsx and cleans the data.
-    
-    Assumptions:
-      - Row 10 (index 9) contains quarter labels (e.g. "1995-Q1", "1995-Q2", …).
-      - Row 12 (index 11) contains Euro area data.
-      - Row 13 (index 12) contains Greece data.
-      
-    Returns:
-      - A cleaned DataFrame with two columns ("Euro" and "Greece"), indexed by the quarter labels.
-    """
-    df = pd.read_excel(excel_file, sheet_name=sheet, header=None)
-    # Quarter labels are assumed to be in row 10 (index 9)
-    time_labels = df.iloc[9].values
-    try:
-        start_idx = np.where(time_labels == "1995-Q1")[0][0]
-    except IndexError:
-        print(f"Warning: '1995-Q1' not found in sheet {sheet}. Using all columns.")
-        start_idx = 0
-    quarter_labels = df.iloc[9, start_idx:].values
-    
-    # Euro area data in row 12 (index 11)
-    euro_data = df.iloc[11, start_idx:].apply(clean_cell).values
-    # Greece data in row 13 (index 12)
-    greece_data = df.iloc[12, start_idx:].apply(clean_cell).values
-    
-    cleaned_df = pd.DataFrame({
-        "Euro": euro_data,
-        "Greece": greece_data
-    }, index=quarter_labels)
-    
-    # Forward/backward fill
-    cleaned_df = cleaned_df.ffill().bfill()
-    
-    # Αφαιρούμε τυχόν σειρές που είναι εντελώς NaN ή ίδιες
-    cleaned_df = cleaned_df.loc[cleaned_df.diff().abs().sum(axis=1) != 0]
-    cleaned_df = cleaned_df.dropna()
-    return cleaned_df
+    out = {horizon: {} for horizon in horizons}
+    for name, mask in flags.items():
+        for horizon, flagged in growth_flags(mask.to_numpy(), 4, horizons, index).items():
+            out[horizon][name] = pd.DataFrame(flagged, index=index, columns=mask.columns).iloc[1:]
+    return out
 
-def compute_growth(df):
+def compute_growth(df, horizons=("qq", "yy", "annualized")):
     """
-    Computes growth rates as the first difference of the natural logarithm.
-    Expects a DataFrame with numeric data (and no zeros).
-    Returns a DataFrame of growth rates.
+    Computes log growth rates for every horizon (q/q, y/y, annualized q/q) in one pass
+    (macrocore.growth); zeros and missing values stay NaN instead of being filled.
+    Returns {horizon: DataFrame of growth rates} without the first quarter.
     """
-    df = df.replace(0, np.nan).ffill().bfill()
-    log_vals = np.log(df)
-    growth = log_vals.diff().iloc[1:]
-    return growth
+    return {horizon: growth.iloc[1:] for horizon, growth in growth_frames(df, 4, horizons).items()}
 
 def plot_combined_growth(x, x_labels, growth_nom, growth_real, growth_def, var_name, filename):
     """
@@ -120,6 +77,7 @@ def plot_combined_growth(x, x_labels, growth_nom, growth_real, growth_def, var_n
       - Deflator growth
     
     Enhanced with larger figure size, font sizes, gridlines, and improved spacing.
+    Lines go through macrocore.plotting (LTTB decimation and marker thinning for long series).
     """
     fig, axs = plt.subplots(2, 1, figsize=(30, 14), dpi=150, sharex=True)
     
@@ -129,18 +87,18 @@ def plot_combined_growth(x, x_labels, growth_nom, growth_real, growth_def, var_n
     tick_font = {"fontsize": 12}
     
     # Euro Zone subplot.
-    axs[0].plot(x, growth_nom.values[:, 0], marker='o', linestyle='-', linewidth=2, color='tab:blue', label="Nominal")
-    axs[0].plot(x, growth_real.values[:, 0], marker='s', linestyle='-', linewidth=2, color='tab:green', label="Real")
-    axs[0].plot(x, growth_def.values[:, 0], marker='^', linestyle='-', linewidth=2, color='tab:red', label="Deflator")
+    plot_series(axs[0], x, growth_nom.values[:, 0], marker='o', linestyle='-', linewidth=2, color='tab:blue', label="Nominal")
+    plot_series(axs[0], x, growth_real.values[:, 0], marker='s', linestyle='-', linewidth=2, color='tab:green', label="Real")
+    plot_series(axs[0], x, growth_def.values[:, 0], marker='^', linestyle='-', linewidth=2, color='tab:red', label="Deflator")
     axs[0].set_title(f"{var_name} - Euro Zone", **title_font)
     axs[0].set_ylabel("Growth Rate (Δ log(series))", **label_font)
     axs[0].legend(prop={'size': 12})
     axs[0].grid(True, which="both", linestyle="--", linewidth=0.5, alpha=0.7)
     
     # Greece subplot.
-    axs[1].plot(x, growth_nom.values[:, 1], marker='o', linestyle='-', linewidth=2, color='tab:blue', label="Nominal")
-    axs[1].plot(x, growth_real.values[:, 1], marker='s', linestyle='-', linewidth=2, color='tab:green', label="Real")
-    axs[1].plot(x, growth_def.values[:, 1], marker='^', linestyle='-', linewidth=2, color='tab:red', label="Deflator")
+    plot_series(axs[1], x, growth_nom.values[:, 1], marker='o', linestyle='-', linewidth=2, color='tab:blue', label="Nominal")
+    plot_series(axs[1], x, growth_real.values[:, 1], marker='s', linestyle='-', linewidth=2, color='tab:green', label="Real")
+    plot_series(axs[1], x, growth_def.values[:, 1], marker='^', linestyle='-', linewidth=2, color='tab:red', label="Deflator")
     axs[1].set_title(f"{var_name} - Greece", **title_font)
     axs[1].set_ylabel("Growth Rate (Δ log(series))", **label_font)
     axs[1].set_xlabel("Quarter", **label_font)
@@ -160,45 +118,101 @@ def plot_combined_growth(x, x_labels, growth_nom, growth_real, growth_def, var_n
     
     fig.suptitle(f"{var_name} Growth Rates (Quarterly)", fontsize=20, fontweight="bold")
     fig.subplots_adjust(top=0.9, bottom=0.1, left=0.08, right=0.95, hspace=0.35)
-    plt.savefig(filename)
+    filename = save_figure(fig, filename)
     plt.close()
     print(f"Combined growth plot for '{var_name}' saved as: {filename}")
 
 def main():
+    args = script_arguments("Exercise 5: quarterly growth rates (Nominal, Real, Deflator)")
+    configure_plots(check=args.check_plots, format=args.figure_format)
+    # Fail fast on a corrupted workbook (accounting identities, deflators, gaps).
+    if not args.no_validate and args.source == "xlsx":
+        validate_workbook(excel_file, "Q")
+    # Πηγή των σειρών: τα φύλλα του XLSX ή οι ίδιες σειρές από αρχείο Eurostat (--source)
+    load_sheet = sheet_loader(args.source, args.eurostat_file)
+    source_file = excel_file if args.source == "xlsx" else args.eurostat_file
+    conn, run_id = open_run(args.results_db, "5.py", inputs=[source_file])
     data_dict = {}
     growth_dict = {}
+    # Quality flags (missing/estimated/provisional) of every series and growth rate (--compact)
+    flags_dict = {}
+    quality = {}
+    # Measures loaded from sheets that are not seasonally adjusted
+    unadjusted = []
     
     for measure, sheets in sheet_info.items():
         print(f"Processing measure '{measure}':")
         try:
             # 1. Φόρτωση Nominal
-            df_nom = load_and_clean_sheet(sheets["Nominal"])
+            df_nom = load_sheet(excel_file, sheets["Nominal"], columns=("Euro", "Greece"), drop_unchanged=True,
+                                with_flags=args.compact)
             # 2. Φόρτωση Deflator
-            df_def = load_and_clean_sheet(sheets["Deflator"])
+            df_def = load_sheet(excel_file, sheets["Deflator"], columns=("Euro", "Greece"), drop_unchanged=True,
+                                with_flags=args.compact)
+            if args.compact:
+                (df_nom, flags_nom), (df_def, flags_def) = df_nom, df_def
             
-            # Ελέγχουμε αν έχουν κοινό χρονικό εύρος
-            common_index = df_nom.index.intersection(df_def.index)
-            if common_index.empty:
-                print(f"No common quarter labels for '{measure}'. Skipping measure.")
+            # Ελέγχουμε αν έχουν κοινό χρονικό εύρος (merge-join στους αριθμούς περιόδου)
+            df_nom, df_def = align_frames(df_nom, df_def)
+            if df_nom.empty:
+                print(f"No common quarters for '{measure}'. Skipping measure.")
                 continue
-            
-            df_nom = df_nom.loc[common_index]
-            df_def = df_def.loc[common_index]
-            
-            # 3. Υπολογισμός Real = Nominal / (Deflator/100)
-            df_real = df_nom / (df_def / 100)
+            if args.compact:
+                flags_dict[measure] = {
+                    "Nominal": {name: mask.loc[df_nom.index] for name, mask in flags_nom.items()},
+                    "Deflator": {name: mask.loc[df_def.index] for name, mask in flags_def.items()}
+                }
+            if needs_seasonal_adjustment(df_nom, df_def):
+                unadjusted.append(measure)
             
             # Αποθηκεύουμε τα DataFrame
             data_dict[measure] = {
                 "Nominal": df_nom,
-                "Deflator": df_def,
-                "Real": df_real
+                "Deflator": df_def
             }
+        except Exception as e:
+            print(f"Error processing '{measure}': {e}")
+    
+    # Seasonal adjustment (STL) of all non-adjusted Nominal/Deflator series in one batch,
+    # ahead of the growth computation.
+    if unadjusted:
+        print(f"Seasonally adjusting: {', '.join(unadjusted)}")
+        frames = {(measure, kind): data_dict[measure][kind] for measure in unadjusted for kind in ("Nominal", "Deflator")}
+        for (measure, kind), df_sa in seasonal_adjust_frames(frames).items():
+            data_dict[measure][kind] = df_sa
+    
+    for measure, series in data_dict.items():
+        try:
+            df_nom = series["Nominal"]
+            df_def = series["Deflator"]
             
-            # 4. Υπολογίζουμε growth rates για Nominal, Real, Deflator
-            growth_nom = compute_growth(df_nom)
-            growth_def = compute_growth(df_def)
-            growth_real = compute_growth(df_real)
+            # Συμπαγής λειτουργία: panels float32 με πακεταρισμένες μάσκες σημαιών (οι ρυθμοί
+            # υπολογίζονται επίσης σε float32)
+            if args.compact:
+                flags = flags_dict[measure]
+                flags["Real"] = compact.combine_flags(flags["Nominal"], flags["Deflator"])
+                panels = {kind: compact.compact_panel(series[kind], flags[kind]) for kind in ("Nominal", "Deflator")}
+                df_nom, df_def = (compact.to_frame(panels[kind]) for kind in ("Nominal", "Deflator"))
+                series["Nominal"], series["Deflator"] = df_nom, df_def
+            
+            # 3. Υπολογισμός Real = Nominal / (Deflator/100)
+            df_real = df_nom / (df_def / 100)
+            series["Real"] = df_real
+            
+            # 4. Υπολογίζουμε growth rates για Nominal, Real, Deflator (όλοι οι ορίζοντες μαζί)
+            rates = compute_growth(pd.concat({"Nominal": df_nom, "Deflator": df_def, "Real": df_real}, axis=1))
+            if args.compact:
+                panels["Real"] = compact.compact_panel(df_real, flags["Real"])
+                for kind, panel in panels.items():
+                    levels = {name: compact.to_frame(panel, compact.panel_mask(panel, name)) for name in compact.FLAGS}
+                    quality.update({(measure, kind.lower(), name): mask for name, mask in levels.items()})
+                    for horizon, masks in compute_growth_flags(levels, df_real.index).items():
+                        concept = "growth_" + kind.lower() if horizon == "qq" else f"growth_{horizon}_" + kind.lower()
+                        quality.update({(measure, concept, name): mask for name, mask in masks.items()})
+                print(f"Compact panels for '{measure}': {sum(compact.nbytes(p) for p in panels.values())} bytes")
+            growth_nom = rates["qq"]["Nominal"]
+            growth_def = rates["qq"]["Deflator"]
+            growth_real = rates["qq"]["Real"]
             
             growth_dict[measure] = {
                 "Nominal": growth_nom,
@@ -206,8 +220,29 @@ def main():
                 "Real": growth_real
             }
             
-            # 5. Plot
-            x_labels = df_nom.index[1:]
+            # 5. Save the growth rates (numeric output, also in --no-plots mode)
+            x_labels = quarter_labels(growth_nom.index)
+            growth_table = pd.concat(growth_dict[measure], axis=1)
+            growth_table.index = x_labels
+            csv_filename = measure.replace(" ", "_").replace("/", "_") + "_growth.csv"
+            growth_table.to_csv(csv_filename)
+            print(f"Growth rates for '{measure}' saved as: {csv_filename}")
+            
+            # Persist levels and growth rates in the results store
+            # (filter "STL" marks series that were seasonally adjusted here).
+            if conn:
+                adjustment = "STL" if measure in unadjusted else ""
+                for kind in ("Nominal", "Deflator", "Real"):
+                    write_frame(conn, run_id, series[kind], measure, kind.lower(), "Q", filter=adjustment)
+                    write_frame(conn, run_id, growth_dict[measure][kind], measure, "growth_" + kind.lower(), "Q",
+                                filter=adjustment)
+                    for horizon in ("yy", "annualized"):
+                        write_frame(conn, run_id, rates[horizon][kind], measure, f"growth_{horizon}_" + kind.lower(),
+                                    "Q", filter=adjustment)
+            
+            # 6. Plot
+            if args.no_plots:
+                continue
             x = np.arange(len(x_labels))
             
             plot_filename = measure.replace(" ", "_").replace("/", "_") + "_combined_growth.png"
@@ -216,7 +251,15 @@ def main():
         except Exception as e:
             print(f"Error processing '{measure}': {e}")
     
-    print("All combined growth plots have been generated.")
+    close_run(conn)
+    if quality:
+        pd.concat(quality, axis=1).to_csv("quality_flags.csv")
+        print("Quality flags of the levels and growth rates saved to quality_flags.csv")
+    
+    if args.no_plots:
+        print("All growth rates have been computed (--no-plots).")
+    else:
+        print("All combined growth plots have been generated.")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -27,15 +27,30 @@
 Δημιουργήθηκε: Fri Mar  7 22:23:36 2025
 """
 
+import os
+import sys
+
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import re
-from statsmodels.tsa.filters.hp_filter import hpfilter
-import seaborn as sns
 
-# Ορισμός επαγγελματικού στυλ διαγραμμάτων
-sns.set_style('whitegrid')
+# Κοινό πακέτο macrocore (φάκελος MT.1)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from macrocore.lazy import lazy_import
+from macrocore.cli import script_arguments
+from macrocore.eurostat import sheet_loader
+from macrocore.comovement import comovement_tables_dual, plot_comovement_heatmap
+from macrocore.spectral import spectral_analysis, spectral_summary_table, plot_spectra_dual
+from macrocore.seasonal import needs_seasonal_adjustment, seasonal_adjust_frames
+from macrocore.periods import quarter_labels, year_ticks, align_frames
+from macrocore.store import open_run, close_run, write_frame, write_statistic
+from macrocore import compact
+from macrocore.report import latex_table
+from macrocore.plotting import plot_series, save_figure, configure as configure_plots
+
+# Οι βαριές βιβλιοθήκες φορτώνονται μόνο όταν χρειαστούν (π.χ. όχι με --no-plots)
+plt = lazy_import("matplotlib.pyplot")
+sns = lazy_import("seaborn")
+hp_filter = lazy_import("statsmodels.tsa.filters.hp_filter")
 
 # ----------------------------------------------------------------------------
 # 1. Χαρτογράφηση των φύλλων που περιέχουν τις Nominal και Deflator τιμές
@@ -63,70 +78,6 @@ sheet_names_ex6 = {
 
 excel_file = "Quarterly_Data.xlsx"
 
-# ----------------------------------------------------------------------------
-# Συναρτήσεις Φόρτωσης & Καθαρισμού Δεδομένων
-# ----------------------------------------------------------------------------
-
-def clean_cell(cell):
-    """
-    Καθαρίζει μια τιμή κελιού:
-      - Επιστρέφει np.nan εάν το κελί είναι ":".
-      - Ελέγχει για αριθμητική τιμή (float), αγνοώντας τυχόν σύμβολα ή γράμματα.
-    """
-    if isinstance(cell, str):
-        cell = cell.strip().replace(",", ".")
-        if cell == ":":
-            return np.nan
-        m = re.search(r"([-+]?[0-9]*\.?[0-9]+)", cell)
-        if m:
-            try:
-                return float(m.group(1))
-            except Exception:
-                return np.nan
-        else:
-            try:
-                return float(cell)
-            except Exception:
-                return np.nan
-    try:
-        return float(cell)
-    except Exception:
-        return np.nan
-
-def load_and_clean_sheet(sheet):
-    """
-    Διαβάζει ένα φύλλο από το αρχείο Quarterly_Data.xlsx και καθαρίζει τα δεδομένα.
-
-    Προϋποθέσεις:
-      - Η σειρά 10 (index 9) περιέχει τις ετικέτες των περιόδων (π.χ., "1995-Q1", "1995-Q2", …).
-      - Η σειρά 12 (index 11) περιέχει δεδομένα για Euro area.
-      - Η σειρά 13 (index 12) περιέχει δεδομένα για Ελλάδα.
-
-    Επιστρέφει ένα DataFrame με στήλες ["Euro", "Ελλάδα"], με δείκτη τις ετικέτες των περιόδων (quarter_labels).
-    """
-    df = pd.read_excel(excel_file, sheet_name=sheet, header=None)
-
-    # Λήψη των ετικετών περιόδων από τη σειρά 10 (index 9)
-    all_labels = df.iloc[9].values
-    # Βρίσκουμε τη θέση του "1995-Q1" (αν υπάρχει)
-    try:
-        start_idx = list(all_labels).index("1995-Q1")
-    except ValueError:
-        print(f"Προειδοποίηση: Δεν βρέθηκε το '1995-Q1' στο φύλλο {sheet}. Θα χρησιμοποιηθούν όλες οι διαθέσιμες στήλες.")
-        start_idx = 0
-
-    valid_cols = [i for i in range(start_idx, len(all_labels)) if pd.notna(all_labels[i])]
-    quarter_labels = [str(all_labels[i]) for i in valid_cols]
-
-    # Διαβάζουμε τα δεδομένα: row 12 (index 11) για Euro, row 13 (index 12) για Ελλάδα
-    euro_data = df.iloc[11, valid_cols].apply(clean_cell).values
-    gr_data = df.iloc[12, valid_cols].apply(clean_cell).values
-
-    cleaned_df = pd.DataFrame({"Euro": euro_data, "Ελλάδα": gr_data}, index=quarter_labels)
-    cleaned_df = cleaned_df.ffill().bfill()
-    cleaned_df = cleaned_df.dropna()
-    return cleaned_df
-
 # ----------------------------------------------------------------------------
 # Συναρτήσεις για το φίλτρο HP & Διαγράμματα
 # ----------------------------------------------------------------------------
@@ -138,7 +89,7 @@ def compute_hp_decomposition(series, lamb=1600):
       - cycle: την κυκλική συνιστώσα
       - trend: την τάση
     """
-    cycle, trend = hpfilter(series, lamb=lamb)
+    cycle, trend = hp_filter.hpfilter(series, lamb=lamb)
     return cycle, trend
 
 def plot_actual_vs_trend_dual(df, var_name, filename):
@@ -152,25 +103,25 @@ def plot_actual_vs_trend_dual(df, var_name, filename):
     fig, axs = plt.subplots(2, 1, figsize=(14, 8), sharex=True)
 
     # Euro
-    axs[0].plot(df.index, df["Euro"], label="Πραγματική (Euro)", marker='o', linewidth=2)
-    axs[0].plot(trend_euro.index, trend_euro, label="Τάση (Euro)", linestyle='--', linewidth=2, color='red')
+    plot_series(axs[0], df.index, df["Euro"], label="Πραγματική (Euro)", marker='o', linewidth=2)
+    plot_series(axs[0], trend_euro.index, trend_euro, label="Τάση (Euro)", linestyle='--', linewidth=2, color='red')
     axs[0].set_title(f"{var_name} - Ευρωζώνη", fontsize=14)
     axs[0].legend(fontsize=12)
 
     # Ελλάδα
-    axs[1].plot(df.index, df["Ελλάδα"], label="Πραγματική (Ελλάδα)", marker='o', linewidth=2)
-    axs[1].plot(trend_gr.index, trend_gr, label="Τάση (Ελλάδα)", linestyle='--', linewidth=2, color='red')
+    plot_series(axs[1], df.index, df["Ελλάδα"], label="Πραγματική (Ελλάδα)", marker='o', linewidth=2)
+    plot_series(axs[1], trend_gr.index, trend_gr, label="Τάση (Ελλάδα)", linestyle='--', linewidth=2, color='red')
     axs[1].set_title(f"{var_name} - Ελλάδα", fontsize=14)
     axs[1].legend(fontsize=12)
 
-    # Ρυθμίζουμε τα ticks ανά 20 περιόδους
-    xticks = df.index[::20]
+    # Ρυθμίζουμε τα ticks ανά 20 περιόδους (Q1 κάθε 5 ετών)
+    xticks, xlabels = year_ticks(df.index)
     axs[1].set_xticks(xticks)
-    axs[1].set_xticklabels(xticks, rotation=45)
+    axs[1].set_xticklabels(xlabels, rotation=45)
 
     fig.suptitle(f"{var_name}: Πραγματική Τιμή και Τάση (HP Filter)", fontsize=16)
     plt.tight_layout(rect=[0, 0.03, 1, 0.95])
-    plt.savefig(filename, dpi=300)
+    filename = save_figure(fig, filename, dpi=300)
     plt.close()
     print(f"Αποθηκεύτηκε το διάγραμμα (Πραγματική & Τάση) για {var_name} ως: {filename}")
 
@@ -183,21 +134,21 @@ def plot_cyclical_dual(df, var_name, filename):
 
     fig, axs = plt.subplots(2, 1, figsize=(14, 8), sharex=True)
 
-    axs[0].plot(cycle_euro.index, cycle_euro, label="Κυκλική (Euro)", marker='o', linewidth=2)
+    plot_series(axs[0], cycle_euro.index, cycle_euro, label="Κυκλική (Euro)", marker='o', linewidth=2)
     axs[0].set_title(f"{var_name} - Κυκλική (Ευρωζώνη)", fontsize=14)
     axs[0].legend(fontsize=12)
 
-    axs[1].plot(cycle_gr.index, cycle_gr, label="Κυκλική (Ελλάδα)", marker='o', linewidth=2)
+    plot_series(axs[1], cycle_gr.index, cycle_gr, label="Κυκλική (Ελλάδα)", marker='o', linewidth=2)
     axs[1].set_title(f"{var_name} - Κυκλική (Ελλάδα)", fontsize=14)
     axs[1].legend(fontsize=12)
 
-    xticks = df.index[::20]
+    xticks, xlabels = year_ticks(df.index)
     axs[1].set_xticks(xticks)
-    axs[1].set_xticklabels(xticks, rotation=45)
+    axs[1].set_xticklabels(xlabels, rotation=45)
 
     fig.suptitle(f"{var_name}: Κυκλική Συνιστώσα (HP Filter)", fontsize=16)
     plt.tight_layout(rect=[0, 0.03, 1, 0.95])
-    plt.savefig(filename, dpi=300)
+    filename = save_figure(fig, filename, dpi=300)
     plt.close()
     print(f"Αποθηκεύτηκε το διάγραμμα (Κυκλική) για {var_name} ως: {filename}")
 
@@ -206,9 +157,10 @@ def plot_all_cyclical_components_dual(cycles_dict, region, filename):
     Σχεδιάζει όλες τις κυκλικές συνιστώσες (HP filter) για μια περιοχή (Euro ή Ελλάδα) 
     σε ένα ενιαίο διάγραμμα.
     """
-    plt.figure(figsize=(14, 7))
+    fig = plt.figure(figsize=(14, 7))
+    ax = plt.gca()
     for var, cycles in cycles_dict.items():
-        plt.plot(cycles[region].index, cycles[region], marker='o', linewidth=2, label=var)
+        plot_series(ax, cycles[region].index, cycles[region], marker='o', linewidth=2, label=var)
     plt.title(f"Όλες οι Κυκλικές Συνιστώσες ({region})", fontsize=16)
     plt.xlabel("Περίοδος", fontsize=12)
     plt.ylabel("Κυκλική Συνιστώσα", fontsize=12)
@@ -216,11 +168,11 @@ def plot_all_cyclical_components_dual(cycles_dict, region, filename):
 
     # Προτείνουμε να παίρνουμε τα xlabels από την πρώτη κυκλική σειρά
     sample_idx = list(cycles_dict.values())[0][region].index
-    xticks = sample_idx[::20]
-    plt.xticks(xticks, rotation=45)
+    xticks, xlabels = year_ticks(sample_idx)
+    plt.xticks(xticks, xlabels, rotation=45)
     
     plt.tight_layout()
-    plt.savefig(filename, dpi=300)
+    filename = save_figure(fig, filename, dpi=300)
     plt.close()
     print(f"Αποθηκεύτηκε το ενιαίο διάγραμμα των κυκλικών συνιστωσών για {region} ως: {filename}")
 
@@ -232,8 +184,9 @@ def compute_volatilities_dual(cycles_dict):
     vols_euro = {}
     vols_gr = {}
     for var, cycles in cycles_dict.items():
-        vols_euro[var] = np.std(cycles["Euro"])
-        vols_gr[var] = np.std(cycles["Ελλάδα"])
+        # Άθροιση σε float64 και για κυκλικές συνιστώσες float32 (--compact)
+        vols_euro[var] = compact.volatility(np.asarray(cycles["Euro"]))
+        vols_gr[var] = compact.volatility(np.asarray(cycles["Ελλάδα"]))
     return vols_euro, vols_gr
 
 def relative_volatility_table_dual(vols, region_name):
@@ -259,57 +212,119 @@ def relative_volatility_table_dual(vols, region_name):
 # ----------------------------------------------------------------------------
 
 def main():
+    args = script_arguments("Άσκηση 6: Τάση, κυκλική συνιστώσα (HP) και μεταβλητότητες")
+    if not args.no_plots:
+        # Ορισμός επαγγελματικού στυλ διαγραμμάτων
+        sns.set_style('whitegrid')
+    # Μετά το στυλ, ώστε να ισχύει το πρότυπο των διανυσματικών διαγραμμάτων (γραμματοσειρές)
+    configure_plots(check=args.check_plots, format=args.figure_format)
+    # Πηγή των σειρών: τα φύλλα του XLSX ή οι ίδιες σειρές από αρχείο Eurostat (--source)
+    load_sheet = sheet_loader(args.source, args.eurostat_file)
+    source_file = excel_file if args.source == "xlsx" else args.eurostat_file
+    conn, run_id = open_run(args.results_db, "6.py", inputs=[source_file])
+
     # Θα αποθηκεύουμε εδώ τα πραγματικά (Real) DataFrame για κάθε μεταβλητή.
     data_dict = {}
+    # Σημαίες ποιότητας (ελλείπουσες/εκτιμήσεις/προσωρινές) του Real ανά μεταβλητή (--compact)
+    flags_dict = {}
+    # Μεταβλητές που προέρχονται από μη εποχικά προσαρμοσμένα φύλλα
+    unadjusted = []
 
     # 1. Φόρτωση & Υπολογισμός Real για κάθε μεταβλητή (ΑΕΠ, Ιδιωτική Κατανάλωση, Επενδύσεις)
     for var, sheets in sheet_names_ex6.items():
         try:
             print(f"Φόρτωση Nominal για '{var}' από το '{sheets['Nominal']}'...")
-            df_nom = load_and_clean_sheet(sheets["Nominal"])
+            df_nom, flags_nom = load_sheet(excel_file, sheets["Nominal"], with_flags=True)
             
             print(f"Φόρτωση Deflator για '{var}' από το '{sheets['Deflator']}'...")
-            df_def = load_and_clean_sheet(sheets["Deflator"])
+            df_def, flags_def = load_sheet(excel_file, sheets["Deflator"], with_flags=True)
 
-            # Βρίσκουμε το κοινό index (ώστε να υπάρχει αντιστοιχία στις περιόδους)
-            common_index = df_nom.index.intersection(df_def.index)
-            if common_index.empty:
+            # Ευθυγραμμίζουμε στις κοινές περιόδους (ώστε να υπάρχει αντιστοιχία στις περιόδους)
+            df_nom, df_def = align_frames(df_nom, df_def)
+            if df_nom.empty:
                 print(f"Προειδοποίηση: Δεν υπάρχει κοινό εύρος για '{var}'. Παραλείπεται.")
                 continue
             
-            df_nom = df_nom.loc[common_index]
-            df_def = df_def.loc[common_index]
-            
             # Υπολογίζουμε Real = Nominal / (Deflator/100)
             df_real = df_nom / (df_def / 100.0)
+            if needs_seasonal_adjustment(df_nom, df_def):
+                unadjusted.append(var)
             
             # Αποθήκευση των πραγματικών τιμών στο data_dict
             data_dict[var] = df_real
+            flags_dict[var] = compact.combine_flags(
+                {name: mask.loc[df_real.index] for name, mask in flags_nom.items()},
+                {name: mask.loc[df_real.index] for name, mask in flags_def.items()})
             
             print(f"Υπολογίστηκαν {len(df_real)} πραγματικές τιμές για '{var}'.\n")
         except Exception as e:
             print(f"Σφάλμα κατά την επεξεργασία της μεταβλητής '{var}': {e}")
 
+    # 1β. Εποχική προσαρμογή (STL) όσων σειρών δεν είναι ήδη προσαρμοσμένες, πριν από το φίλτρο HP
+    if unadjusted:
+        print(f"Εποχική προσαρμογή για: {', '.join(unadjusted)}")
+        data_dict.update(seasonal_adjust_frames({var: data_dict[var] for var in unadjusted}))
+
+    # 1γ. Συμπαγή panels: τιμές float32 και πακεταρισμένες μάσκες σημαιών
+    panels = {}
+    if args.compact:
+        panels = {var: compact.compact_panel(df_real, flags_dict[var]) for var, df_real in data_dict.items()}
+        data_dict = {var: compact.to_frame(panel) for var, panel in panels.items()}
+        quality = pd.concat({(var, name): compact.to_frame(panel, compact.panel_mask(panel, name))
+                             for var, panel in panels.items() for name in compact.FLAGS}, axis=1)
+        quality.index = quarter_labels(quality.index)
+        quality.to_csv("quality_flags.csv")
+        print(f"Συμπαγή panels: {sum(compact.nbytes(p) for p in panels.values())} bytes· "
+              f"σημαίες ποιότητας στο quality_flags.csv")
+
     # 2. Εφαρμογή φίλτρου HP & σχεδιασμός διαγραμμάτων
     #    cycles_all[var] = {"Euro": cycle_series, "Ελλάδα": cycle_series}
     cycles_all = {}
+    # Πραγματική τιμή, τάση και κυκλική συνιστώσα για αποθήκευση σε CSV
+    hp_columns = {}
 
     for var, df_real in data_dict.items():
-        # 2α. Διάγραμμα (πραγματική τιμή & τάση)
-        filename_trend = f"{var.replace(' ', '_')}_Real_Trend.png"
-        plot_actual_vs_trend_dual(df_real, var, filename_trend)
+        if not args.no_plots:
+            # 2α. Διάγραμμα (πραγματική τιμή & τάση)
+            filename_trend = f"{var.replace(' ', '_')}_Real_Trend.png"
+            plot_actual_vs_trend_dual(df_real, var, filename_trend)
 
-        # 2β. Διάγραμμα (κυκλική συνιστώσα)
-        filename_cycle = f"{var.replace(' ', '_')}_Real_Cycle.png"
-        plot_cyclical_dual(df_real, var, filename_cycle)
+            # 2β. Διάγραμμα (κυκλική συνιστώσα)
+            filename_cycle = f"{var.replace(' ', '_')}_Real_Cycle.png"
+            plot_cyclical_dual(df_real, var, filename_cycle)
 
         # Αποθήκευση της κυκλικής συνιστώσας σε λεξικό
-        cycle_euro, _ = compute_hp_decomposition(df_real["Euro"], lamb=1600)
-        cycle_gr, _ = compute_hp_decomposition(df_real["Ελλάδα"], lamb=1600)
-        cycles_all[var] = {"Euro": cycle_euro, "Ελλάδα": cycle_gr}
+        cycles_all[var] = {}
+        if var in panels:
+            # Όλες οι περιοχές μαζί· η λύση του HP γίνεται σε float64 και επιστρέφει float32
+            cycle_block, trend_block = compact.hp_filter(panels[var]["values"], lamb=1600)
+        for k, region in enumerate(("Euro", "Ελλάδα")):
+            if var in panels:
+                cycle = pd.Series(cycle_block[:, k], index=df_real.index, name=region)
+                trend = pd.Series(trend_block[:, k], index=df_real.index, name=region)
+            else:
+                cycle, trend = compute_hp_decomposition(df_real[region], lamb=1600)
+            cycles_all[var][region] = cycle
+            hp_columns[(var, region, "Real")] = df_real[region]
+            hp_columns[(var, region, "Τάση")] = trend
+            hp_columns[(var, region, "Κυκλική")] = cycle
+
+        # Αποθήκευση πραγματικής τιμής, τάσης και κυκλικής συνιστώσας στη βάση αποτελεσμάτων
+        if conn:
+            write_frame(conn, run_id, df_real, var, "real", "Q")
+            for concept, label in (("trend", "Τάση"), ("cycle", "Κυκλική")):
+                frame = pd.DataFrame({region: hp_columns[(var, region, label)] for region in ("Euro", "Ελλάδα")})
+                write_frame(conn, run_id, frame, var, concept, "Q", filter="HP", lam=1600)
+
+    # 2γ. Αποθήκευση πραγματικών τιμών, τάσεων και κυκλικών συνιστωσών σε CSV
+    if hp_columns:
+        hp_table = pd.concat(hp_columns, axis=1)
+        hp_table.index = quarter_labels(hp_table.index)
+        hp_table.to_csv("hp_decomposition.csv")
+        print("Αποθηκεύτηκε σε: hp_decomposition.csv")
 
     # 3. Συγκεντρωτικά διαγράμματα όλων των κυκλικών συνιστωσών (Euro & Ελλάδα)
-    if cycles_all:
+    if cycles_all and not args.no_plots:
         plot_all_cyclical_components_dual(cycles_all, "Euro", "all_cyclical_components_Euro.png")
         plot_all_cyclical_components_dual(cycles_all, "Ελλάδα", "all_cyclical_components_Ελλάδα.png")
 
@@ -331,14 +346,51 @@ def main():
         print("\nΣχετική Μεταβλητότητα (Euro):")
         print(rel_vol_euro)
         rel_vol_euro.to_csv("relative_volatility_Euro.csv", index=False)
-        print("Αποθηκεύτηκε σε: relative_volatility_Euro.csv")
+        # Ο ίδιος πίνακας σε LaTeX για το κεφάλαιο της Άσκησης 6 (latex/big_book)
+        latex_table(rel_vol_euro, "relative_volatility_Euro.tex")
+        print("Αποθηκεύτηκε σε: relative_volatility_Euro.csv / .tex")
 
     rel_vol_gr = relative_volatility_table_dual(vols_gr, "Ελλάδα")
     if rel_vol_gr is not None:
         print("\nΣχετική Μεταβλητότητα (Ελλάδα):")
         print(rel_vol_gr)
         rel_vol_gr.to_csv("relative_volatility_Ελλάδα.csv", index=False)
-        print("Αποθηκεύτηκε σε: relative_volatility_Ελλάδα.csv")
+        # Ο ίδιος πίνακας σε LaTeX για το κεφάλαιο της Άσκησης 6 (latex/big_book)
+        latex_table(rel_vol_gr, "relative_volatility_Ελλάδα.tex")
+        print("Αποθηκεύτηκε σε: relative_volatility_Ελλάδα.csv / .tex")
+
+    # 6β. Αποθήκευση μεταβλητοτήτων στη βάση αποτελεσμάτων
+    if conn:
+        for region, vols, table in (("Euro", vols_euro, rel_vol_euro), ("Ελλάδα", vols_gr, rel_vol_gr)):
+            relative = dict(zip(table["Μεταβλητή"], table["Σχετική Μεταβλητότητα"])) if table is not None else {}
+            for var, vol in vols.items():
+                write_statistic(conn, run_id, var, "cycle", region, "Q", "std", vol, filter="HP", lam=1600)
+                if var in relative:
+                    write_statistic(conn, run_id, var, "cycle", region, "Q", "relative_std", relative[var],
+                                    filter="HP", lam=1600)
+        close_run(conn)
+
+    # 7. Συμμεταβλητότητα με το ΑΕΠ (προπορεία/υστέρηση ±8 τρίμηνα) και εμμονή ρ(1)
+    if "ΑΕΠ" in cycles_all:
+        comovement = comovement_tables_dual(cycles_all, reference="ΑΕΠ", max_lag=8)
+        for region, table in comovement.items():
+            print(f"\nΔιασυσχέτιση με το ΑΕΠ ({region}):")
+            print(table.round(2))
+            table.to_csv(f"comovement_{region}.csv")
+            print(f"Αποθηκεύτηκε σε: comovement_{region}.csv")
+            if not args.no_plots:
+                plot_comovement_heatmap(table, region, f"comovement_heatmap_{region}.png")
+
+        # 8. Φασματική ανάλυση των κυκλικών συνιστωσών (έλεγχος του φίλτρου HP)
+        columns, spectra = spectral_analysis(cycles_all, reference="ΑΕΠ")
+        spectral_table = spectral_summary_table(columns, spectra)
+        print("\nΦασματική ανάλυση κυκλικών συνιστωσών:")
+        print(spectral_table.round(3))
+        spectral_table.to_csv("spectral_summary.csv")
+        print("Αποθηκεύτηκε σε: spectral_summary.csv")
+        if not args.no_plots:
+            for region in ("Euro", "Ελλάδα"):
+                plot_spectra_dual(columns, spectra, region, f"spectra_{region}.png")
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
@@ -27,15 +27,23 @@
 Δημιουργήθηκε: Fri Mar  7 22:23:36 2025
 """
 
+import os
+import sys
+
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import re
-from statsmodels.tsa.filters.hp_filter import hpfilter
-import seaborn as sns
 
-# Ορισμός επαγγελματικού στυλ διαγραμμάτων
-sns.set_style('whitegrid')
+# Κοινό πακέτο macrocore (φάκελος MT.1)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from macrocore.lazy import lazy_import
+from macrocore.cli import script_arguments
+from macrocore.loading import load_and_clean_sheet
+from macrocore.periods import year_ticks
+
+# Οι βαριές βιβλιοθήκες φορτώνονται μόνο όταν χρειαστούν (π.χ. όχι με --no-plots)
+plt = lazy_import("matplotlib.pyplot")
+sns = lazy_import("seaborn")
+hp_filter = lazy_import("statsmodels.tsa.filters.hp_filter")
 
 # Χαρτογράφηση μεταβλητών για την Άσκηση 6
 sheet_names_ex6 = {
@@ -46,70 +54,6 @@ sheet_names_ex6 = {
 
 excel_file = "Quarterly_Data.xlsx"
 
-# ----------------------------
-# Συναρτήσεις Φόρτωσης & Καθαρισμού Δεδομένων
-# ----------------------------
-
-def clean_cell(cell):
-    """
-    Καθαρίζει μια τιμή κελιού:
-      - Επιστρέφει np.nan εάν το κελί είναι ":".
-      - Αντικαθιστά το κόμμα με τελεία και εξάγει το αριθμητικό μέρος.
-      - Προσπαθεί να μετατρέψει την τιμή σε float.
-    """
-    if isinstance(cell, str):
-        cell = cell.strip().replace(",", ".")
-        if cell == ":":
-            return np.nan
-        m = re.search(r"([-+]?[0-9]*\.?[0-9]+)", cell)
-        if m:
-            try:
-                return float(m.group(1))
-            except Exception:
-                return np.nan
-        else:
-            try:
-                return float(cell)
-            except Exception:
-                return np.nan
-    try:
-        return float(cell)
-    except Exception:
-        return np.nan
-
-def load_and_clean_sheet(sheet):
-    """
-    Διαβάζει ένα φύλλο από το αρχείο Quarterly_Data.xlsx και καθαρίζει τα δεδομένα.
-    
-    Δεδομένα:
-      - Η σειρά 10 (index 9) περιέχει τις ετικέτες των περιόδων (π.χ., "1995-Q1", "1995-Q2", …).
-        Τα δεδομένα ξεκινούν από το "1995-Q1" και αγνοούνται οι στήλες πριν από αυτήν.
-      - Η σειρά 12 (index 11) περιέχει τα δεδομένα για την Ευρωζώνη.
-      - Η σειρά 13 (index 12) περιέχει τα δεδομένα για την Ελλάδα.
-    
-    Επιστρέφει ένα DataFrame με στήλες "Euro" και "Ελλάδα", με δείκτη τις ετικέτες των περιόδων.
-    """
-    df = pd.read_excel(excel_file, sheet_name=sheet, header=None)
-    # Λήψη των ετικετών περιόδων από τη σειρά 10 (index 9)
-    all_labels = df.iloc[9].values
-    # Βρίσκουμε τη θέση του "1995-Q1"
-    try:
-        start_idx = list(all_labels).index("1995-Q1")
-    except ValueError:
-        print("Δεν βρέθηκε το '1995-Q1', χρησιμοποιούνται όλες οι στήλες.")
-        start_idx = 0
-    # Επιλογή στηλών από το '1995-Q1' και μετά
-    valid_cols = [i for i in range(start_idx, len(all_labels)) if pd.notna(all_labels[i])]
-    # Δημιουργία λίστας ετικετών από τις έγκυρες στήλες
-    quarter_labels = [str(all_labels[i]) for i in valid_cols]
-    # Εξαγωγή δεδομένων: row 12 (index 11) για Euro, row 13 (index 12) για Ελλάδα
-    euro_data = df.iloc[11, valid_cols].apply(clean_cell).values
-    greece_data = df.iloc[12, valid_cols].apply(clean_cell).values
-    cleaned_df = pd.DataFrame({"Euro": euro_data, "Ελλάδα": greece_data}, index=quarter_labels)
-    cleaned_df = cleaned_df.ffill(axis=1).bfill(axis=1)
-    cleaned_df = cleaned_df.dropna()
-    return cleaned_df
-
 # ----------------------------
 # Συναρτήσεις για το φίλτρο HP & Διαγράμματα
 # ----------------------------
@@ -121,7 +65,7 @@ def compute_hp_decomposition(series, lamb=1600):
       - cycle: την κυκλική συνιστώσα
       - trend: την τάση
     """
-    cycle, trend = hpfilter(series, lamb=lamb)
+    cycle, trend = hp_filter.hpfilter(series, lamb=lamb)
     return cycle, trend
 
 def plot_actual_vs_trend_dual(df, var_name, filename):
@@ -143,9 +87,9 @@ def plot_actual_vs_trend_dual(df, var_name, filename):
     axs[1].set_title(f"{var_name} - Ελλάδα", fontsize=14)
     axs[1].legend(fontsize=12)
     
-    xticks = df.index[::20]
+    xticks, xlabels = year_ticks(df.index)
     axs[1].set_xticks(xticks)
-    axs[1].set_xticklabels(xticks, rotation=45)
+    axs[1].set_xticklabels(xlabels, rotation=45)
     
     fig.suptitle(f"{var_name}: Πραγματική Τιμή και Τάση", fontsize=16)
     plt.tight_layout(rect=[0, 0.03, 1, 0.95])
@@ -170,9 +114,9 @@ def plot_cyclical_dual(df, var_name, filename):
     axs[1].set_title(f"{var_name} - Κυκλική (Ελλάδα)", fontsize=14)
     axs[1].legend(fontsize=12)
     
-    xticks = df.index[::20]
+    xticks, xlabels = year_ticks(df.index)
     axs[1].set_xticks(xticks)
-    axs[1].set_xticklabels(xticks, rotation=45)
+    axs[1].set_xticklabels(xlabels, rotation=45)
     
     fig.suptitle(f"{var_name}: Κυκλική Συνιστώσα", fontsize=16)
     plt.tight_layout(rect=[0, 0.03, 1, 0.95])
@@ -192,8 +136,8 @@ def plot_all_cyclical_components_dual(cycles_dict, region, filename):
     plt.xlabel("Περίοδος", fontsize=12)
     plt.ylabel("Κύκλος", fontsize=12)
     plt.legend(fontsize=12)
-    xticks = list(cycles_dict.values())[0][region].index[::20]
-    plt.xticks(xticks, rotation=45)
+    xticks, xlabels = year_ticks(list(cycles_dict.values())[0][region].index)
+    plt.xticks(xticks, xlabels, rotation=45)
     plt.tight_layout()
     plt.savefig(filename, dpi=300)
     plt.close()
@@ -234,13 +178,22 @@ def relative_volatility_table_dual(vols, region_name):
 # ----------------------------
 
 def main():
+    args = script_arguments("Άσκηση 6 (εκδοχή ενός φύλλου ανά μεταβλητή): τάση, κυκλική συνιστώσα και μεταβλητότητες",
+                            compact=False, source=False)
+    if not args.no_plots:
+        # Ορισμός επαγγελματικού στυλ διαγραμμάτων
+        sns.set_style('whitegrid')
+
     # Λεξικό για την αποθήκευση των δεδομένων (DataFrame με στήλες "Euro" και "Ελλάδα") για κάθε μεταβλητή
     data_dict = {}
     
     for var, sheet in sheet_names_ex6.items():
         print(f"Φόρτωση {var} από το {sheet} στο {excel_file}...")
         try:
-            df = load_and_clean_sheet(sheet)
+            df = load_and_clean_sheet(excel_file, sheet)
+            if df.empty:
+                print(f"Προειδοποίηση: Το {sheet} δεν έχει πλήρη δεδομένα και για τις δύο περιοχές. Παραλείπεται το {var}.\n")
+                continue
             data_dict[var] = df
             print(f"Το {var} φορτώθηκε με {len(df)} παρατηρήσεις.\n")
         except Exception as e:
@@ -251,8 +204,9 @@ def main():
     
     # Βήμα 1: Σχεδίαση πραγματικής τιμής και τάσης για κάθε μεταβλητή (2 υποπλοτ: Euro και Ελλάδα)
     for var, df in data_dict.items():
-        filename = var.replace(" ", "_") + "_Πραγματική_και_Τάση.png"
-        plot_actual_vs_trend_dual(df, var, filename)
+        if not args.no_plots:
+            filename = var.replace(" ", "_") + "_Πραγματική_και_Τάση.png"
+            plot_actual_vs_trend_dual(df, var, filename)
         
         # Υπολογισμός και αποθήκευση κυκλικών συνιστωσών
         cycle_euro, _ = compute_hp_decomposition(df["Euro"], lamb=1600)
@@ -260,12 +214,14 @@ def main():
         cycles_all[var] = {"Euro": cycle_euro, "Ελλάδα": cycle_gr}
         
         # Σχεδίαση κυκλικής συνιστώσας για κάθε μεταβλητή (2 υποπλοτ)
-        filename_cycle = var.replace(" ", "_") + "_Κυκλική.png"
-        plot_cyclical_dual(df, var, filename_cycle)
+        if not args.no_plots:
+            filename_cycle = var.replace(" ", "_") + "_Κυκλική.png"
+            plot_cyclical_dual(df, var, filename_cycle)
     
     # Βήμα 2: Σχεδίαση συγκριτικών διαγραμμάτων όλων των κυκλικών συνιστωσών για κάθε περιοχή
-    plot_all_cyclical_components_dual(cycles_all, "Euro", "all_cyclical_components_Euro.png")
-    plot_all_cyclical_components_dual(cycles_all, "Ελλάδα", "all_cyclical_components_Ελλάδα.png")
+    if not args.no_plots:
+        plot_all_cyclical_components_dual(cycles_all, "Euro", "all_cyclical_components_Euro.png")
+        plot_all_cyclical_components_dual(cycles_all, "Ελλάδα", "all_cyclical_components_Ελλάδα.png")
     
     # Βήμα 3: Υπολογισμός μεταβλητότητας για κάθε μεταβλητή, για κάθε περιοχή
     vols_euro, vols_gr = compute_volatilities_dual(cycles_all)
@@ -1,46 +1,198 @@
+"""
+Adds empty figure captions to tcolorbox environments of TeX files.
+
+For each tcolorbox environment:
+  - If it already contains a caption (\\captionof{figure}), leave it unchanged.
+  - Otherwise, if the environment contains Python code (detected via \\begin{lstlisting}),
+    do not add any caption.
+  - Otherwise, add an empty caption (\\captionof{figure}{}) just before \\end{tcolorbox}.
+
+The file is streamed line by line through a small tokenizer for \\begin{...}/\\end{...}
+with an environment stack, so nested boxes are handled (a caption or a listing counts
+for the innermost box that contains it), comments and verbatim environments are skipped,
+and the cost is one linear pass. Files are only written when their content changes.
+
+Usage:
+  python caption.adder.py                          # asks for the input/output filenames
+  python caption.adder.py all_plots_boxes.tex      # in place
+  python caption.adder.py in.tex -o out.tex
+  python caption.adder.py ../ -j 4                 # every .tex under a directory tree
+  python caption.adder.py ../ --dry-run            # only report what would change
+"""
+
+import argparse
+import filecmp
+import os
 import re
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+# Caption rules: which environment gets a caption, what counts as an existing caption,
+# which inner environments mean "no caption", and what is inserted before the \end.
+CAPTION_RULES = {
+    "environment": "tcolorbox",
+    "caption": r"\captionof{figure}",
+    "skip_if": ("lstlisting",),
+    "insert": "\n\\captionof{figure}{}",
+}
+
+# Environments whose body is not TeX (no tokens are recognised until their \end).
+VERBATIM = ("lstlisting", "verbatim", "Verbatim", "minted", "comment")
+
+# Order matters: an escaped backslash (\\) or percent (\%) must win over a comment (%).
+TOKEN = re.compile(r"\\(begin|end)\{([^{}]+)\}|" + re.escape(CAPTION_RULES["caption"]) + r"|\\\\|\\%|%")
+
+
+def process_lines(lines, write, rules=CAPTION_RULES):
+    """
+    Streams TeX lines through the caption rules, calling write() with the output pieces.
+    Returns the number of captions inserted.
+    """
+    stack = []  # [environment, has_caption, has_code]
+    verbatim = None
+    inserted = 0
+    env = rules["environment"]
+
+    def innermost_box():
+        for frame in reversed(stack):
+            if frame[0] == env:
+                return frame
+        return None
+
+    for line in lines:
+        pos = 0      # scan position
+        written = 0  # end of the part of the line already written
+        if verbatim is not None:
+            end = line.find(verbatim)
+            if end < 0:
+                write(line)
+                continue
+            pos = end + len(verbatim)
+            verbatim = None
+        for match in TOKEN.finditer(line, pos):
+            if match.start() < pos:
+                continue
+            kind, name = match.group(1), match.group(2)
+            token = match.group(0)
+            if token == "%":
+                break
+            if kind == "begin":
+                box = innermost_box()
+                if box is not None and name in rules["skip_if"]:
+                    box[2] = True
+                if name in VERBATIM:
+                    # Skip the body up to the matching \end (possibly on this line)
+                    closing = "\\end{" + name + "}"
+                    end = line.find(closing, match.end())
+                    if end < 0:
+                        verbatim = closing
+                        break
+                    pos = end + len(closing)
+                    continue
+                stack.append([name, False, False])
+            elif kind == "end":
+                # Pop up to the matching \begin (tolerates unbalanced environments)
+                if not any(frame[0] == name for frame in stack):
+                    continue
+                while stack:
+                    frame = stack.pop()
+                    if frame[0] == name:
+                        break
+                if name == env and not frame[1] and not frame[2]:
+                    write(line[written:match.start()])
+                    write(rules["insert"])
+                    written = match.start()
+                    inserted += 1
+            elif token == rules["caption"]:
+                box = innermost_box()
+                if box is not None:
+                    box[1] = True
+        write(line[written:])
+    return inserted
+
 
 def process_tex_content(content):
+    """Processes the content of a TeX file (as a string); returns the new content."""
+    out = []
+    process_lines(content.splitlines(keepends=True), out.append)
+    return "".join(out)
+
+
+def process_file(input_filename, output_filename=None, dry_run=False):
     """
-    Processes the content of a TeX file. For each tcolorbox environment:
-      - If it already contains a caption (\captionof{figure}), leave it unchanged.
-      - Otherwise, if the environment contains Python code (detected via \begin{lstlisting}),
-        do not add any caption.
-      - Otherwise, add an empty caption (\captionof{figure}{}).
+    Processes one file, streaming into a temporary file next to the output. The output is
+    replaced only if its content changes. Returns (input, captions inserted, written).
     """
-    # Regular expression to match tcolorbox environments with options.
-    pattern = r"(\\begin\{tcolorbox\}\[.*?\])(.*?)(\\end\{tcolorbox\})"
-    
-    def add_caption(match):
-        begin_box = match.group(1)
-        body = match.group(2)
-        end_box = match.group(3)
-        # If a caption is already present, leave the environment unchanged.
-        if r"\captionof{figure}" in body:
-            return match.group(0)
-        # If the box contains Python code (lstlisting), do not add a caption.
-        if r"\begin{lstlisting}" in body:
-            return match.group(0)
-        # Otherwise, insert an empty caption command.
-        new_body = body + "\n\\captionof{figure}{}"
-        return begin_box + new_body + end_box
-
-    # Use re.DOTALL to ensure newlines are included.
-    return re.sub(pattern, add_caption, content, flags=re.DOTALL)
-
-# Prompt user for file names without using sys.argv or any parsing library.
-input_filename = input("Enter the input TeX filename: ")
-output_filename = input("Enter the output TeX filename: ")
-
-# Read the entire TeX file content.
-with open(input_filename, "r", encoding="utf-8") as file:
-    tex_content = file.read()
-
-# Process the content.
-modified_content = process_tex_content(tex_content)
-
-# Write the modified content to the output file.
-with open(output_filename, "w", encoding="utf-8") as file:
-    file.write(modified_content)
-
-print("Processing complete. Modified file saved as", output_filename)
+    output_filename = output_filename or input_filename
+    out_dir = os.path.dirname(os.path.abspath(output_filename))
+    fd, tmp = tempfile.mkstemp(suffix=".tex", dir=out_dir)
+    try:
+        with open(input_filename, "r", encoding="utf-8", newline="") as src, \
+                os.fdopen(fd, "w", encoding="utf-8", newline="") as dst:
+            inserted = process_lines(src, dst.write)
+        unchanged = os.path.exists(output_filename) and (
+            (inserted == 0 and os.path.samefile(input_filename, output_filename))
+            or filecmp.cmp(tmp, output_filename, shallow=False))
+        if unchanged or dry_run:
+            return input_filename, inserted, False
+        os.replace(tmp, output_filename)
+        return input_filename, inserted, True
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def tex_files(paths):
+    """The .tex files of the given files and directory trees (sorted, without duplicates)."""
+    found = set()
+    for path in paths:
+        if os.path.isdir(path):
+            for dirpath, _, filenames in os.walk(path):
+                found.update(os.path.join(dirpath, f) for f in filenames if f.endswith(".tex"))
+        else:
+            found.add(path)
+    return sorted(found)
+
+
+def process_batch(paths, jobs=None, dry_run=False):
+    """Processes all files in a process pool; returns the results."""
+    files = tex_files(paths)
+    if len(files) <= 1 or jobs == 1:
+        return [process_file(f, dry_run=dry_run) for f in files]
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        return list(pool.map(process_file, files, [None] * len(files), [dry_run] * len(files),
+                             chunksize=max(1, len(files) // (4 * (jobs or os.cpu_count() or 1)))))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Adds empty figure captions to tcolorbox environments")
+    parser.add_argument("paths", nargs="*", help="TeX files or directories (processed in place)")
+    parser.add_argument("-o", "--output", help="output file (single input file only)")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="number of worker processes")
+    parser.add_argument("--dry-run", action="store_true", help="only report what would change")
+    args = parser.parse_args()
+
+    if not args.paths:
+        # Interactive mode, as before
+        input_filename = input("Enter the input TeX filename: ")
+        output_filename = input("Enter the output TeX filename: ")
+        process_file(input_filename, output_filename)
+        print("Processing complete. Modified file saved as", output_filename)
+        return
+
+    if args.output:
+        if len(args.paths) != 1 or os.path.isdir(args.paths[0]):
+            parser.error("--output needs exactly one input file")
+        results = [process_file(args.paths[0], args.output, args.dry_run)]
+    else:
+        results = process_batch(args.paths, args.jobs, args.dry_run)
+
+    changed = [r for r in results if r[1]]
+    for filename, inserted, written in changed:
+        print(f"{filename}: {inserted} caption(s) {'added' if written else 'to add'}")
+    print(f"Processing complete: {len(results)} file(s), {len(changed)} with new captions.")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
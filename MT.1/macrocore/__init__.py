@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+"""
+macrocore: κοινός κώδικας για τα scripts του MT.1 (Ασκήσεις 4, 5 και 6)
+
+Υπο-modules:
+  - loading:    φόρτωση & καθαρισμός των φύλλων Excel του Eurostat.
+  - validation: έλεγχος λογιστικών ταυτοτήτων και ακεραιότητας κατά τη φόρτωση.
+  - eurostat:   σειριακή φόρτωση των μαζικών αρχείων TSV/SDMX του Eurostat.
+  - periods:    ακέραιος δείκτης περιόδων και ευθυγράμμιση σειρών.
+  - disaggregation: χρονική αναγωγή ετήσιων σειρών σε τριμηνιαίες (Denton, Chow–Lin).
+  - rebasing:   αλλαγή έτους βάσης και εύρεση περιόδου βάσης για ολόκληρα panels.
+  - chainlinking: αλυσιδωτή σύνδεση και συνάθροιση σειρών όγκου (annual overlap).
+  - growth:     ρυθμοί μεταβολής (q/q, y/y, ετησιοποιημένοι, CAGR) με ένα πέρασμα.
+  - compact:    συμπαγή panels float32 με πακεταρισμένες μάσκες σημαιών ποιότητας.
+  - report:     πρότυπα LaTeX και σταδιακή, παράλληλη μεταγλώττιση ανά κεφάλαιο.
+  - images:     σμίκρυνση στο πλάτος εκτύπωσης και συμπίεση των εικόνων του βιβλίου.
+  - plotting:   αραίωση LTTB, ραστεροποίηση και διανυσματικά διαγράμματα (PDF/PGF) του βιβλίου.
+  - seasonal:   εποχική προσαρμογή (STL) με shared memory workers.
+  - spectral:   φασματική ανάλυση (περιοδόγραμμα, Welch, coherence).
+  - comovement: διασυσχετίσεις προπορείας/υστέρησης με το ΑΕΠ.
+  - lazy:       καθυστερημένη εισαγωγή βαριών βιβλιοθηκών.
+  - cli:        κοινά ορίσματα γραμμής εντολών (--no-plots, --results-db).
+  - pipeline:   εκτελεστής DAG με σταδιακή επανεκτέλεση (run_pipeline.py).
+  - store:      μόνιμη αποθήκευση των παραγόμενων σειρών σε SQLite.
+  - service:    τοπική υπηρεσία HTTP (asyncio) πάνω στη βάση αποτελεσμάτων.
+
+Τα υπο-modules φορτώνονται μόνο όταν χρησιμοποιηθούν (π.χ. macrocore.spectral), ώστε
+η εισαγωγή του πακέτου να μην κοστίζει τίποτα.
+
+Τα scripts βρίσκουν το πακέτο προσθέτοντας τον φάκελο MT.1 στο sys.path.
+"""
+
+import importlib
+
+_submodules = ("loading", "eurostat", "periods", "seasonal", "spectral", "comovement", "lazy", "cli", "pipeline", "store", "service", "validation", "disaggregation", "rebasing", "chainlinking", "growth", "compact", "report", "images", "plotting")
+
+
+def __getattr__(name):
+    if name in _submodules:
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_submodules))
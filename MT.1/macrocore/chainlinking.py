@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+"""
+Αλυσιδωτή σύνδεση (chain-linking) και συνάθροιση σειρών όγκου
+
+Οι αλυσιδωτοί όγκοι δεν αθροίζονται (C + G + I σε όγκους ≠ όγκος του C + G + I). Τα
+συναθροίσματα φτιάχνονται από τις συνιστώσες σε τρέχουσες τιμές (CP) και σε τιμές του
+προηγούμενου έτους (PYP), που είναι προσθετικές, και μετά συνδέονται αλυσιδωτά:
+    L_y   = PYP_y / CP_{y−1}                      (ετήσιος δείκτης όγκου Laspeyres)
+    CLV_y = CP_{y0} · Π_{j≤y} L_j                 (ετήσια αλυσιδωτή σύνδεση)
+Για τριμηνιαία δεδομένα (annual overlap) τα τρίμηνα του έτους y είναι σε μέσες τιμές του
+y−1 και συνδέονται με το ετήσιο επίπεδο του προηγούμενου έτους:
+    CLV_{y,q} = PYP_{y,q} · CLV_{y−1} / CP_{y−1}
+οπότε το άθροισμα των τριμήνων ισούται με τον ετήσιο αλυσιδωτό όγκο. Στο τέλος η σειρά
+μεταφέρεται στο έτος αναφοράς (CLV_ref = CP_ref), όπως οι «Chain linked volumes (2015)».
+
+Όλα γίνονται με πράξεις πινάκων (cumprod, reshape ανά έτος) πάνω σε ολόκληρο το μπλοκ
+(περίοδοι × περιοχές × συνιστώσες)· τα συναθροίσματα ορίζονται με πίνακα βαρών
+(συνιστώσες × συναθροίσματα, π.χ. +1/−1), ώστε δεκάδες συναθροίσματα να υπολογίζονται μαζί.
+
+Τα φύλλα του Eurostat δεν δίνουν PYP· το previous_year_prices τις ανακατασκευάζει από τις
+τρέχουσες τιμές και τους αλυσιδωτούς όγκους κάθε συνιστώσας.
+
+Συντάκτης: thodoreskourtales
+"""
+
+import numpy as np
+
+
+def _annual_totals(block, factor):
+    """Ετήσια αθροίσματα (έτη × …) ενός μπλοκ με factor περιόδους ανά έτος (πλήρη έτη)."""
+    block = np.asarray(block, dtype=float)
+    if block.shape[0] % factor:
+        raise ValueError(f"Ο αριθμός περιόδων ({block.shape[0]}) δεν είναι πολλαπλάσιο του {factor}.")
+    return block.reshape((block.shape[0] // factor, factor) + block.shape[1:]).sum(axis=1)
+
+
+def _by_year(annual, factor):
+    """Επανάληψη κάθε ετήσιας τιμής για τις factor περιόδους του έτους."""
+    return np.repeat(annual, factor, axis=0)
+
+
+def previous_year_prices(current, volume, factor=1):
+    """
+    Ανακατασκευή των σειρών σε τιμές προηγούμενου έτους από τρέχουσες τιμές και αλυσιδωτούς
+    όγκους (ή δείκτες όγκου) της ίδιας σειράς:
+        PYP_{y,q} = CP_{y−1} · V_{y,q} / V_{y−1}
+    όπου CP_{y−1}, V_{y−1} τα ετήσια αθροίσματα. Το πρώτο έτος είναι NaN.
+    factor: περίοδοι ανά έτος (1 ετήσια, 4 τριμηνιαία).
+    """
+    volume = np.asarray(volume, dtype=float)
+    cp_annual = _annual_totals(current, factor)
+    v_annual = _annual_totals(volume, factor)
+    ratio = np.full_like(cp_annual, np.nan)
+    ratio[1:] = cp_annual[:-1] / v_annual[:-1]
+    return volume * _by_year(ratio, factor)
+
+
+def aggregate(block, weights):
+    """
+    Συνάθροιση συνιστωσών (τελευταίος άξονας) με βάρη:
+      - weights (K,):   ένα συνάθροισμα, επιστρέφει (περίοδοι × περιοχές).
+      - weights (K, A): A συναθροίσματα μαζί, επιστρέφει (περίοδοι × περιοχές × A).
+    Οι πράξεις γίνονται σε CP και PYP, που είναι προσθετικές.
+    """
+    return np.asarray(block, dtype=float) @ np.asarray(weights, dtype=float)
+
+
+def chain_link(current, pyp, factor=1, reference=None, years=None):
+    """
+    Αλυσιδωτή σύνδεση (ετήσια ή τριμηνιαία με annual overlap) για όλες τις σειρές του μπλοκ.
+
+    Παράμετροι:
+      - current, pyp: τρέχουσες τιμές και τιμές προηγούμενου έτους (περίοδοι × …), π.χ.
+        τα αποτελέσματα του aggregate. Το πρώτο έτος του pyp αγνοείται.
+      - factor: περίοδοι ανά έτος (1 ή 4).
+      - reference: έτος αναφοράς (CLV_ref = CP_ref)· απαιτεί years (τα έτη του μπλοκ, ένα
+        ανά έτος). None: αναφορά το πρώτο έτος.
+
+    Επιστρέφει τους αλυσιδωτούς όγκους με το σχήμα του current.
+    """
+    current = np.asarray(current, dtype=float)
+    pyp = np.asarray(pyp, dtype=float)
+    cp_annual = _annual_totals(current, factor)
+    pyp_annual = _annual_totals(pyp, factor)
+
+    # Ετήσιοι δείκτες Laspeyres και σωρευτικό γινόμενο: CLV_y σε τιμές του πρώτου έτους
+    links = np.ones_like(cp_annual)
+    links[1:] = pyp_annual[1:] / cp_annual[:-1]
+    clv_annual = cp_annual[0] * np.cumprod(links, axis=0)
+
+    # Τρίμηνα: PYP_{y,q} · CLV_{y−1} / CP_{y−1}· το πρώτο έτος είναι ήδη σε δικές του τιμές
+    scale = np.ones_like(cp_annual)
+    scale[1:] = clv_annual[:-1] / cp_annual[:-1]
+    clv = pyp * _by_year(scale, factor)
+    clv[:factor] = current[:factor]
+
+    if reference is not None:
+        if years is None:
+            raise ValueError("Για έτος αναφοράς χρειάζονται τα έτη του μπλοκ (years).")
+        ref = np.flatnonzero(np.asarray(years) == reference)
+        if len(ref) == 0:
+            raise ValueError(f"Το έτος αναφοράς {reference} δεν υπάρχει στα έτη του μπλοκ.")
+        ref = ref[0]
+        clv *= cp_annual[ref] / clv_annual[ref]
+    return clv
+
+
+def chain_linked_aggregates(current, volume, weights, factor=1, reference=None, years=None):
+    """
+    Αλυσιδωτά συναθροίσματα από τα φύλλα του Eurostat (τρέχουσες τιμές + αλυσιδωτοί όγκοι
+    ανά συνιστώσα).
+
+    current, volume: μπλοκ (περίοδοι × περιοχές × συνιστώσες)· weights: (K,) ή (K, A).
+    Επιστρέφει (current_agg, clv_agg) με σχήμα (περίοδοι × περιοχές [× A]).
+    """
+    pyp = previous_year_prices(current, volume, factor)
+    current_agg = aggregate(current, weights)
+    pyp_agg = aggregate(pyp, weights)
+    return current_agg, chain_link(current_agg, pyp_agg, factor, reference, years)
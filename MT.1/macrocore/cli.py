@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+"""
+Κοινά ορίσματα γραμμής εντολών των scripts των ασκήσεων
+"""
+
+import argparse
+
+from .store import default_path
+
+
+def script_arguments(description, argv=None, compact=True, source=True):
+    """
+    Επιστρέφει τα ορίσματα ενός script. Κοινά ορίσματα:
+      --no-plots:   μόνο υπολογισμοί· γράφονται τα αριθμητικά αποτελέσματα (CSV) χωρίς να
+                    φορτωθεί καθόλου το matplotlib.
+      --results-db: η βάση SQLite όπου αποθηκεύονται οι παραγόμενες σειρές (βλ. store).
+      --no-store:   χωρίς αποθήκευση στη βάση (args.results_db = "").
+      --no-validate: χωρίς τον έλεγχο ταυτοτήτων/ακεραιότητας του αρχείου (βλ. validation).
+      --compact:    συμπαγή panels float32 με μάσκες σημαιών ποιότητας (βλ. compact).
+      --source, --eurostat-file: πηγή των τριμηνιαίων σειρών, το XLSX ή ένα μαζικό αρχείο
+                    του Eurostat (TSV/SDMX, βλ. eurostat.sheet_loader).
+      --check-plots, --figure-format: βλ. add_figure_arguments.
+    Τα --compact και --source/--eurostat-file προστίθενται μόνο στα scripts που τα υλοποιούν
+    (compact=False / source=False για τα υπόλοιπα), ώστε να μην αγνοούνται σιωπηλά.
+    """
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("--no-plots", action="store_true",
+                        help="μόνο υπολογισμοί, χωρίς διαγράμματα (δεν φορτώνεται το matplotlib)")
+    parser.add_argument("--results-db", default=default_path,
+                        help=f"βάση SQLite των αποτελεσμάτων (προεπιλογή: {default_path})")
+    parser.add_argument("--no-store", dest="results_db", action="store_const", const="",
+                        help="χωρίς αποθήκευση των αποτελεσμάτων στη βάση")
+    parser.add_argument("--no-validate", action="store_true",
+                        help="χωρίς έλεγχο λογιστικών ταυτοτήτων και ακεραιότητας του αρχείου")
+    if compact:
+        parser.add_argument("--compact", action="store_true",
+                            help="τιμές float32 με πακεταρισμένες μάσκες σημαιών (ελλείπουσες/εκτιμήσεις/προσωρινές)")
+    if source:
+        parser.add_argument("--source", choices=("xlsx", "eurostat"), default="xlsx",
+                            help="πηγή των σειρών: το αρχείο Excel ή αρχείο Eurostat (προεπιλογή: xlsx)")
+        parser.add_argument("--eurostat-file", default="namq_10_gdp.tsv.gz",
+                            help="αρχείο Eurostat (TSV, SDMX-CSV ή SDMX-ML, και .gz) για --source eurostat "
+                                 "(προεπιλογή: namq_10_gdp.tsv.gz)")
+    add_figure_arguments(parser)
+    return parser.parse_args(argv)
+
+
+def add_figure_arguments(parser):
+    """
+    Ορίσματα των διαγραμμάτων (βλ. plotting), και για scripts χωρίς τα υπόλοιπα κοινά ορίσματα:
+      --check-plots:   έλεγχος πιστότητας των αραιωμένων διαγραμμάτων.
+      --figure-format: μορφή των αρχείων (png ή διανυσματική pdf/pgf/svg για το βιβλίο).
+    """
+    parser.add_argument("--check-plots", action="store_true",
+                        help="σύγκριση κάθε αραιωμένου διαγράμματος με την απόδοση των πλήρων δεδομένων")
+    parser.add_argument("--figure-format", choices=("png", "pdf", "pgf", "svg"), default="png",
+                        help="μορφή των διαγραμμάτων (προεπιλογή: png)")
+    return parser
@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+"""
+Συμπαγής αναπαράσταση panels: float32 τιμές και πακεταρισμένες μάσκες σημαιών
+
+Ένα συμπαγές panel είναι λεξικό (όπως οι ρυθμίσεις των scripts) με:
+  - "values":  πίνακας float32 (περίοδοι × σειρές), με τις τιμές όπως μετά τη συμπλήρωση
+               (ffill/bfill) της φόρτωσης, ώστε οι υπολογισμοί να είναι ίδιοι με πριν.
+  - "periods": οι ακέραιοι αριθμοί περιόδου (int64, βλ. periods).
+  - "columns": τα ονόματα των σειρών.
+  - "masks":   {σημαία: np.packbits κατά τον άξονα του χρόνου} για "missing" (η τιμή
+               συμπληρώθηκε), "estimated" και "provisional" (βλ. loading.cell_flags)·
+               1 bit ανά παρατήρηση αντί για ολόκληρο πίνακα bool/float.
+Έτσι οι τιμές πιάνουν τη μισή μνήμη (και cache) από float64, και οι σημαίες ποιότητας δεν
+χάνονται με τη συμπλήρωση.
+
+Οι υπολογισμοί δέχονται το panel από άκρη σε άκρη:
+  - growth.growth_rates διατηρεί τον τύπο float32.
+  - hp_filter: το σύστημα (I + λ D'D) τ = y λύνεται σε float64 (ταινιωτό, όλες οι σειρές
+    μαζί) και το αποτέλεσμα επιστρέφεται στον τύπο της εισόδου.
+  - volatility: τυπική απόκλιση με άθροιση σε float64, προαιρετικά χωρίς τις σημαδεμένες τιμές.
+
+Συντάκτης: thodoreskourtales
+"""
+
+import numpy as np
+import pandas as pd
+
+from .lazy import lazy_import
+
+linalg = lazy_import("scipy.linalg")
+
+FLAGS = ("missing", "estimated", "provisional")
+
+
+def pack_mask(mask):
+    """Πακετάρει μάσκα bool (περίοδοι × σειρές) σε bits κατά τον άξονα του χρόνου."""
+    return np.packbits(np.asarray(mask, dtype=bool), axis=0)
+
+
+def unpack_mask(packed, n_periods):
+    """Αντίστροφο του pack_mask: μάσκα bool (περίοδοι × σειρές)."""
+    return np.unpackbits(packed, axis=0, count=n_periods).astype(bool)
+
+
+def compact_panel(frame, flags=None, dtype=np.float32):
+    """
+    Συμπαγές panel από DataFrame με ακέραιο δείκτη περιόδων.
+
+    flags: {σημαία: DataFrame bool} με τον ίδιο δείκτη/στήλες (π.χ. από
+    load_and_clean_sheet(..., with_flags=True))· χωρίς flags, missing = NaN του frame.
+    """
+    values = frame.to_numpy(dtype=dtype)
+    flags = dict(flags or {})
+    flags.setdefault("missing", np.isnan(values))
+    masks = {}
+    for name, mask in flags.items():
+        mask = mask.reindex(index=frame.index, columns=frame.columns, fill_value=False) \
+            if isinstance(mask, pd.DataFrame) else mask
+        masks[name] = pack_mask(mask)
+    return {
+        "values": values,
+        "periods": frame.index.to_numpy(dtype=np.int64),
+        "columns": list(frame.columns),
+        "masks": masks,
+    }
+
+
+def combine_flags(*flag_sets):
+    """Ένωση (OR) σημαιών από πολλές πηγές, π.χ. Real από Nominal και Deflator."""
+    combined = {}
+    for flags in flag_sets:
+        for name, mask in flags.items():
+            combined[name] = combined[name] | mask if name in combined else mask
+    return combined
+
+
+def panel_mask(panel, name):
+    """Μάσκα bool (περίοδοι × σειρές) μιας σημαίας (όλα False αν δεν υπάρχει)."""
+    if name not in panel["masks"]:
+        return np.zeros(panel["values"].shape, dtype=bool)
+    return unpack_mask(panel["masks"][name], len(panel["periods"]))
+
+
+def to_frame(panel, values=None, mask=None):
+    """
+    DataFrame από ένα panel (ή από άλλες τιμές ίδιου σχήματος, π.χ. κυκλική συνιστώσα).
+    mask: όνομα σημαίας ή ακολουθία ονομάτων· οι σημαδεμένες τιμές γίνονται NaN.
+    """
+    values = panel["values"] if values is None else values
+    if mask is not None:
+        hidden = np.zeros(values.shape, dtype=bool)
+        for name in ([mask] if isinstance(mask, str) else mask):
+            hidden |= panel_mask(panel, name)
+        values = np.where(hidden, np.nan, values)
+    return pd.DataFrame(values, index=pd.Index(panel["periods"], name="period"), columns=panel["columns"])
+
+
+def nbytes(panel):
+    """Μνήμη τιμών και μασκών του panel σε bytes."""
+    return panel["values"].nbytes + sum(mask.nbytes for mask in panel["masks"].values())
+
+
+def hp_filter(values, lamb=1600):
+    """
+    Φίλτρο Hodrick–Prescott για όλες τις στήλες μαζί.
+
+    Το (I + λ D'D) τ = y (D: δεύτερες διαφορές) είναι συμμετρικό πενταδιαγώνιο· λύνεται μία
+    φορά με solveh_banded και πολλαπλά δεξιά μέλη, πάντα σε float64. Επιστρέφει
+    (cycle, trend) στον τύπο της εισόδου (π.χ. float32).
+    """
+    values = np.asarray(values)
+    y = values.astype(np.float64)
+    squeeze = y.ndim == 1
+    if squeeze:
+        y = y[:, None]
+    n = y.shape[0]
+    # Άνω ζώνη του I + λ D'D: διαγώνιοι 0, 1, 2
+    main = np.full(n, 6.0)
+    main[[0, -1]] = 1.0
+    main[[1, -2]] = 5.0
+    first = np.full(n - 1, -4.0)
+    first[[0, -1]] = -2.0
+    banded = np.zeros((3, n))
+    banded[2] = 1.0 + lamb * main
+    banded[1, 1:] = lamb * first
+    banded[0, 2:] = lamb * 1.0
+    trend = linalg.solveh_banded(banded, y)
+    cycle = y - trend
+    if squeeze:
+        trend, cycle = trend[:, 0], cycle[:, 0]
+    dtype = values.dtype if np.issubdtype(values.dtype, np.floating) else np.float64
+    return cycle.astype(dtype, copy=False), trend.astype(dtype, copy=False)
+
+
+def volatility(values, mask=None):
+    """
+    Τυπική απόκλιση ανά στήλη με άθροιση σε float64 (και για είσοδο float32).
+    mask: μάσκα bool ίδιου σχήματος· οι σημαδεμένες τιμές εξαιρούνται.
+    """
+    values = np.asarray(values)
+    if mask is None:
+        return np.std(values, axis=0, dtype=np.float64)
+    return np.nanstd(np.where(mask, np.nan, values.astype(np.float64)), axis=0)
@@ -0,0 +1,330 @@
+# -*- coding: utf-8 -*-
+"""
+Φόρτωση των μαζικών αρχείων (bulk download) του Eurostat, ως ταχύτερη εναλλακτική του XLSX
+
+Υποστηριζόμενες μορφές (και συμπιεσμένες .gz):
+  - TSV:      "freq,unit,s_adj,na_item,geo\\TIME_PERIOD<TAB>1995-Q1 <TAB>…" και μία σειρά
+              ανά χρονοσειρά, με τιμές όπως "123.4 p" ή ":".
+  - SDMX-CSV: μία σειρά ανά παρατήρηση (…,geo,TIME_PERIOD,OBS_VALUE,OBS_FLAG).
+  - SDMX-ML:  XML 2.1 (structure-specific ή generic) με <Series>/<Obs>.
+
+Τα αρχεία διαβάζονται σειριακά (streaming) χωρίς να φορτωθούν ολόκληρα στη μνήμη:
+  - TSV:      αποσυμπίεση γραμμή-γραμμή· το φιλτράρισμα γίνεται στο κλειδί της σειράς
+              (πριν το πρώτο TAB) και μόνο οι σειρές που ταιριάζουν αναλύονται, μαζί,
+              με τον C parser του pandas.
+  - SDMX-CSV: pd.read_csv σε κομμάτια (chunksize) με τον C parser και φιλτράρισμα ανά κομμάτι.
+  - SDMX-ML:  ET.iterparse· κάθε <Series> καθαρίζεται από τη μνήμη αμέσως μετά την ανάγνωσή του.
+
+Το load_eurostat επιστρέφει DataFrame ίδιας μορφής με το loading.load_and_clean_sheet
+(δείκτης ακέραιων περιόδων, στήλες Ευρωζώνη/Ελλάδα, attrs["seasonal_adjustment"] και, με
+with_flags=True, τις σημαίες ποιότητας), ώστε τα scripts να αλλάζουν μόνο την κλήση
+φόρτωσης. Το SHEET_CODES αντιστοιχίζει τα φύλλα του Quarterly_Data.xlsx στους κωδικούς
+του namq_10_gdp και το sheet_loader επιλέγει την πηγή (xlsx ή eurostat, βλ. --source στο
+cli). Τα αρχεία στο fixtures/eurostat και το check_eurostat.py ελέγχουν ότι οι τρεις μορφές
+δίνουν το ίδιο αποτέλεσμα με τον φορτωτή του XLSX.
+
+Παράδειγμα:
+    df = load_eurostat("namq_10_gdp.tsv.gz",
+                       {"unit": "CP_MEUR", "s_adj": "SCA", "na_item": "B1GQ"})
+
+Συντάκτης: thodoreskourtales
+"""
+
+import gzip
+import io
+import os
+import xml.etree.ElementTree as ET
+
+import numpy as np
+import pandas as pd
+
+from .loading import cell_flags, load_and_clean_sheet
+from .periods import parse_quarter_labels, parse_year_labels, quarter_ordinal
+
+# Κωδικοί geo για (Ευρωζώνη, Ελλάδα)· το "EA" είναι η ευρωζώνη κυλιόμενης σύνθεσης
+# ("Euro area (EA11-1999, …, EA20-2023)"), όπως στα XLSX
+DEFAULT_GEOS = ("EA", "EL")
+
+# Φύλλα του Quarterly_Data.xlsx -> κωδικοί namq_10_gdp (εποχικά και ημερολογιακά προσαρμοσμένα)
+_NA_ITEMS = {"40": "B1GQ", "41": "B1G", "42": "P3", "43": "P3_S13", "47": "P31_S14",
+             "51": "P51G", "55": "P6", "58": "P7"}
+SHEET_CODES = {
+    **{f"Sheet {n}": {"unit": "CP_MEUR", "s_adj": "SCA", "na_item": item} for n, item in _NA_ITEMS.items()},
+    # Τα φύλλα αποπληθωριστών (implicit deflator, 2015=100) είναι 39 θέσεις μετά τα ονομαστικά
+    **{f"Sheet {int(n) + 39}": {"unit": "PD15_EUR", "s_adj": "SCA", "na_item": item} for n, item in _NA_ITEMS.items()},
+}
+
+# Ετικέτες εποχικής προσαρμογής, όπως εμφανίζονται στα XLSX (βλ. seasonal.is_seasonally_adjusted)
+SEASONAL_ADJUSTMENT_LABELS = {
+    "NSA": "Unadjusted data (i.e. neither seasonally adjusted nor calendar adjusted data)",
+    "SA": "Seasonally adjusted data, not calendar adjusted data",
+    "CA": "Calendar adjusted data, not seasonally adjusted data",
+    "SCA": "Seasonally and calendar adjusted data",
+}
+
+_NUMBER_PATTERN = r"([-+]?[0-9]*\.?[0-9]+)"
+
+# Στήλες του SDMX-CSV που δεν είναι διαστάσεις της σειράς
+_NON_KEY_COLUMNS = ("geo", "TIME_PERIOD", "OBS_VALUE", "OBS_FLAG", "CONF_STATUS", "DATAFLOW", "LAST UPDATE")
+
+
+def _open_text(path):
+    """Ανοίγει ένα αρχείο (ή .gz) για σειριακή ανάγνωση κειμένου."""
+    if str(path).endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8", newline="")
+    return open(path, "r", encoding="utf-8", newline="")
+
+
+def _open_binary(path):
+    if str(path).endswith(".gz"):
+        return gzip.open(path, "rb")
+    return open(path, "rb")
+
+
+def detect_format(path):
+    """Αναγνωρίζει τη μορφή ("tsv", "sdmx-csv" ή "sdmx-ml") από την πρώτη γραμμή του αρχείου."""
+    with _open_text(path) as f:
+        first = f.readline().lstrip("\ufeff")
+    if first.lstrip().startswith("<"):
+        return "sdmx-ml"
+    if "\\" in first.split("\t", 1)[0]:
+        return "tsv"
+    return "sdmx-csv"
+
+
+def _clean_values(values):
+    """Διανυσματικός καθαρισμός τιμών (":" -> NaN, αφαίρεση σημαιών όπως "p", "b")."""
+    s = pd.Series(values, dtype=object).astype(str).str.strip().str.replace(",", ".", regex=False)
+    return pd.to_numeric(s.str.extract(_NUMBER_PATTERN)[0], errors="coerce").to_numpy()
+
+
+def _value_flags(values):
+    """Οι σημαίες που είναι γραμμένες μέσα στις τιμές του TSV (π.χ. "123.4 p" -> "p")."""
+    return pd.Series(values, dtype=object).astype(str).str.replace(r"[-+0-9.,:\s]", "", regex=True).to_numpy()
+
+
+def _matches(codes, filters):
+    return all(codes.get(dim) in allowed for dim, allowed in filters.items())
+
+
+def _normalize_filters(filters):
+    """{"unit": "CP_MEUR"} ή {"unit": ["CP_MEUR", …]} -> {"unit": {"CP_MEUR", …}}."""
+    return {dim: {v} if isinstance(v, str) else set(v) for dim, v in (filters or {}).items()}
+
+
+def read_tsv(path, filters):
+    """
+    Διαβάζει σειριακά ένα TSV(.gz) του Eurostat και επιστρέφει DataFrame σε «μακριά» μορφή
+    με στήλες τις διαστάσεις, "TIME_PERIOD", "OBS_VALUE" και "OBS_FLAG". Όλες οι περίοδοι
+    του αρχείου (και των σειρών που απορρίφθηκαν) είναι στο attrs["periods"].
+    """
+    filters = _normalize_filters(filters)
+    with _open_text(path) as f:
+        header = f.readline().lstrip("\ufeff").rstrip("\r\n").split("\t")
+        dims = header[0].split("\\")[0].split(",")
+        periods = [p.strip() for p in header[1:]]
+
+        # Φιλτράρισμα στο κλειδί, χωρίς ανάλυση των τιμών των σειρών που απορρίπτονται
+        checks = [(dims.index(dim), allowed) for dim, allowed in filters.items()]
+        keys, rows = [], []
+        for line in f:
+            key, _, rest = line.partition("\t")
+            codes = key.split(",")
+            if all(codes[i] in allowed for i, allowed in checks):
+                keys.append(dict(zip(dims, codes)))
+                rows.append(rest)
+
+    columns = dims + ["TIME_PERIOD", "OBS_VALUE", "OBS_FLAG"]
+    if not rows:
+        long = pd.DataFrame(columns=columns)
+        long.attrs["periods"] = periods
+        return long
+    raw = pd.read_csv(io.StringIO("".join(rows)), sep="\t", header=None, dtype=str,
+                      keep_default_na=False, usecols=range(len(periods)))
+    n_series, n_periods = raw.shape
+    long = pd.DataFrame({dim: np.repeat([k[dim] for k in keys], n_periods) for dim in dims})
+    long["TIME_PERIOD"] = np.tile(periods, n_series)
+    long["OBS_VALUE"] = _clean_values(raw.to_numpy().ravel())
+    long["OBS_FLAG"] = _value_flags(raw.to_numpy().ravel())
+    long.attrs["periods"] = periods
+    return long
+
+
+def read_sdmx_csv(path, filters, chunksize=200_000):
+    """Διαβάζει σε κομμάτια ένα SDMX-CSV(.gz), κρατώντας μόνο τις παρατηρήσεις των φίλτρων."""
+    filters = _normalize_filters(filters)
+    parts, periods = [], set()
+    for chunk in pd.read_csv(path, dtype=str, chunksize=chunksize, keep_default_na=False):
+        periods.update(chunk["TIME_PERIOD"].unique())
+        mask = np.ones(len(chunk), dtype=bool)
+        for dim, allowed in filters.items():
+            mask &= chunk[dim].isin(allowed).to_numpy()
+        if mask.any():
+            parts.append(chunk.loc[mask])
+    if not parts:
+        long = pd.DataFrame(columns=list(filters) + ["TIME_PERIOD", "OBS_VALUE", "OBS_FLAG"])
+    else:
+        long = pd.concat(parts, ignore_index=True)
+        long["OBS_VALUE"] = _clean_values(long["OBS_VALUE"].to_numpy())
+    long.attrs["periods"] = sorted(periods)
+    return long
+
+
+def _local(tag):
+    return tag.rsplit("}", 1)[-1]
+
+
+def read_sdmx_ml(path, filters):
+    """
+    Διαβάζει σειριακά ένα SDMX-ML 2.1(.gz) με iterparse. Υποστηρίζει τη structure-specific
+    μορφή (διαστάσεις και OBS_FLAG ως attributes του <Series>/<Obs>) και τη generic
+    (<SeriesKey>/<Value> και <Obs>/<Attributes>/<Value id="OBS_FLAG">).
+    """
+    filters = _normalize_filters(filters)
+    records, periods = [], set()
+    codes, observations = {}, []
+    period, value, flag = None, None, None
+    in_key = in_obs = False
+    with _open_binary(path) as f:
+        for event, elem in ET.iterparse(f, events=("start", "end")):
+            tag = _local(elem.tag)
+            if event == "start":
+                if tag == "Series":
+                    codes = {k: v for k, v in elem.attrib.items()}
+                    observations = []
+                elif tag == "SeriesKey":
+                    in_key = True
+                elif tag == "Obs":
+                    in_obs = True
+                continue
+
+            if tag == "Value" and in_key:
+                codes[elem.get("id")] = elem.get("value")
+            elif tag == "Value" and in_obs:
+                if elem.get("id") in ("OBS_FLAG", "OBS_STATUS"):
+                    flag = elem.get("value")
+            elif tag == "SeriesKey":
+                in_key = False
+            elif tag == "ObsDimension":
+                period = elem.get("value")
+            elif tag == "ObsValue":
+                value = elem.get("value")
+            elif tag == "Obs":
+                observations.append((elem.get("TIME_PERIOD", period), elem.get("OBS_VALUE", value),
+                                     elem.get("OBS_FLAG", elem.get("OBS_STATUS", flag)) or ""))
+                periods.add(observations[-1][0])
+                period, value, flag = None, None, None
+                in_obs = False
+            elif tag == "Series":
+                if _matches(codes, filters):
+                    records.extend({**codes, "TIME_PERIOD": p, "OBS_VALUE": v, "OBS_FLAG": f}
+                                   for p, v, f in observations)
+                elem.clear()
+    long = pd.DataFrame.from_records(
+        records, columns=None if records else list(filters) + ["TIME_PERIOD", "OBS_VALUE", "OBS_FLAG"])
+    long["OBS_VALUE"] = _clean_values(long["OBS_VALUE"].to_numpy())
+    long.attrs["periods"] = sorted(periods)
+    return long
+
+
+_READERS = {"tsv": read_tsv, "sdmx-csv": read_sdmx_csv, "sdmx-ml": read_sdmx_ml}
+
+
+def read_eurostat(path, filters, fmt=None):
+    """
+    Διαβάζει ένα αρχείο Eurostat σε «μακριά» μορφή (βλ. read_tsv)· η μορφή ανιχνεύεται
+    αυτόματα. Το attrs["periods"] κρατά όλες τις περιόδους του αρχείου.
+    """
+    if not os.path.exists(path):
+        raise FileNotFoundError(path)
+    long = _READERS[fmt or detect_format(path)](path, filters)
+    if "OBS_FLAG" not in long.columns:
+        long["OBS_FLAG"] = ""
+    long["OBS_FLAG"] = long["OBS_FLAG"].fillna("").astype(str)
+    return long
+
+
+def load_eurostat(path, filters, geos=DEFAULT_GEOS, columns=("Euro", "Ελλάδα"), start=(1995, 1),
+                  drop_unchanged=False, with_flags=False, fmt=None):
+    """
+    Φορτώνει μία μεταβλητή (π.χ. unit/s_adj/na_item) για δύο περιοχές από αρχείο Eurostat.
+
+    Παράμετροι:
+      - path: TSV, SDMX-CSV ή SDMX-ML (και .gz).
+      - filters: κωδικοί διαστάσεων εκτός του geo, π.χ. {"unit": "CP_MEUR", "na_item": "B1GQ"}.
+      - geos: κωδικοί geo για (Ευρωζώνη, Ελλάδα)· αντιστοιχούν στα ονόματα `columns`.
+      - start: (έτος, τρίμηνο) για τριμηνιαία ή (έτος, 1) για ετήσια δεδομένα.
+      - drop_unchanged, with_flags: όπως στο load_and_clean_sheet.
+
+    Επιστρέφει DataFrame της ίδιας μορφής με το load_and_clean_sheet (τριμηνιαία: δείκτης
+    "period", ετήσια: δείκτης "year"). Σηκώνει ValueError αν τα φίλτρα δεν ορίζουν μία μοναδική
+    σειρά ανά περιοχή.
+    """
+    long = read_eurostat(path, {**filters, "geo": list(geos)}, fmt=fmt)
+
+    key_dims = [c for c in long.columns if c not in _NON_KEY_COLUMNS and long[c].nunique() > 1]
+    if key_dims:
+        raise ValueError(f"Τα φίλτρα δεν ορίζουν μοναδική σειρά· διαφορετικές τιμές στις διαστάσεις: {key_dims}")
+
+    labels = long["TIME_PERIOD"].to_numpy()
+    file_labels = np.asarray(long.attrs.get("periods", []), dtype=object)
+    ordinals = parse_quarter_labels(labels)
+    if (ordinals >= 0).any():
+        index_name, first = "period", quarter_ordinal(*start)
+        file_ordinals = parse_quarter_labels(file_labels)
+    else:
+        ordinals, index_name, first = parse_year_labels(labels), "year", start[0]
+        file_ordinals = parse_year_labels(file_labels)
+    # Οι μη έγκυρες ετικέτες (-1) απορρίπτονται μαζί με τις περιόδους πριν το `start`
+    keep = ordinals >= max(first, 0)
+    long = long.loc[keep].assign(**{index_name: ordinals[keep]})
+    file_ordinals = file_ordinals[file_ordinals >= max(first, 0)]
+
+    wide = long.pivot(index=index_name, columns="geo", values="OBS_VALUE")
+    wide = wide.reindex(columns=list(geos)).sort_index().astype(float)
+    # Το SDMX παραλείπει τις ελλείπουσες παρατηρήσεις· συνεχές εύρος όπως στο XLSX (":" -> NaN),
+    # ως τις περιόδους του αρχείου, ώστε οι ελλείπουσες στις άκρες να συμπληρώνονται όπως εκεί
+    if len(wide):
+        bounds = np.concatenate([wide.index[[0, -1]].to_numpy(), file_ordinals])
+        wide = wide.reindex(pd.RangeIndex(bounds.min(), bounds.max() + 1, name=index_name))
+    wide.columns = list(columns)
+    wide.columns.name = None
+    raw = wide
+
+    wide = wide.ffill().bfill()
+    if drop_unchanged:
+        wide = wide.loc[wide.diff().abs().sum(axis=1) != 0]
+    wide = wide.dropna()
+    s_adj = long["s_adj"].iloc[0] if "s_adj" in long.columns and len(long) else None
+    wide.attrs["seasonal_adjustment"] = SEASONAL_ADJUSTMENT_LABELS.get(s_adj, s_adj)
+    if with_flags:
+        codes = long.pivot(index=index_name, columns="geo", values="OBS_FLAG")
+        codes = codes.reindex(index=raw.index, columns=list(geos)).fillna("")
+        per_column = [cell_flags(raw[col].to_numpy(), codes[geo].to_numpy()) for col, geo in zip(columns, geos)]
+        flags = {name: pd.DataFrame({col: f[name] for col, f in zip(columns, per_column)}, index=raw.index)
+                 for name in per_column[0]}
+        return wide, {name: frame.loc[wide.index] for name, frame in flags.items()}
+    return wide
+
+
+def sheet_loader(source="xlsx", eurostat_file=None):
+    """
+    Συνάρτηση φόρτωσης με την υπογραφή του load_and_clean_sheet(excel_file, sheet, …) για
+    την πηγή `source`: "xlsx" (το φύλλο του Excel) ή "eurostat" (η ίδια σειρά, βλ.
+    SHEET_CODES, από το αρχείο eurostat_file· το excel_file αγνοείται).
+    """
+    if source == "xlsx":
+        return load_and_clean_sheet
+    if source != "eurostat":
+        raise ValueError(f"Άγνωστη πηγή '{source}' (xlsx ή eurostat).")
+    if not eurostat_file:
+        raise ValueError("Η πηγή eurostat χρειάζεται αρχείο Eurostat (--eurostat-file).")
+    if not os.path.exists(eurostat_file):
+        raise FileNotFoundError(f"Δεν βρέθηκε το αρχείο Eurostat '{eurostat_file}'.")
+
+    def load(excel_file, sheet, **kwargs):
+        if sheet not in SHEET_CODES:
+            raise ValueError(f"Δεν υπάρχουν κωδικοί Eurostat για το φύλλο '{sheet}' (βλ. SHEET_CODES).")
+        return load_eurostat(eurostat_file, SHEET_CODES[sheet], **kwargs)
+
+    return load
@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+"""
+Ρυθμοί μεταβολής σε πολλούς ορίζοντες με ένα πέρασμα
+
+Για ένα μπλοκ επιπέδων (περίοδοι × σειρές) ο λογάριθμος υπολογίζεται μία φορά και κάθε
+ορίζοντας είναι μία αφαίρεση δύο όψεων (views) του ίδιου πίνακα, γραμμένη απευθείας σε
+έναν προ-δεσμευμένο buffer (ορίζοντες × περίοδοι × σειρές)· δεν γίνονται επαναλαμβανόμενα
+diff/shift ούτε αντίγραφα των δεδομένων:
+  - "qq":         log(x_t) − log(x_{t−1})                  (μεταβολή περιόδου, π.χ. q/q)
+  - "yy":         log(x_t) − log(x_{t−s})                  (ετήσια μεταβολή, s = περίοδοι/έτος)
+  - "annualized": s · (log(x_t) − log(x_{t−1}))            (ετησιοποιημένη q/q)
+  - "cagr_k":     (log(x_t) − log(x_{t−k·s})) / k          (μέσος ετήσιος ρυθμός k ετών)
+
+Οι ελλείπουσες και μη θετικές τιμές γίνονται NaN και μεταφέρονται (καμία συμπλήρωση)· οι
+πρώτες περίοδοι κάθε ορίζοντα είναι NaN, ώστε όλοι οι ορίζοντες να έχουν το ίδιο μήκος
+και τον ίδιο δείκτη με τα επίπεδα. Με percent=True επιστρέφονται ποσοστά (e^g − 1)·100.
+
+Οι υστερήσεις μετρούν περιόδους, όχι γραμμές: όταν δίνονται οι αριθμοί περιόδου (periods,
+ή ο ακέραιος δείκτης στο growth_frames) και έχουν κενά (π.χ. από το drop_unchanged της
+φόρτωσης), το μπλοκ απλώνεται σε συνεχές εύρος πριν από τις διαφορές. Οι περίοδοι που
+λείπουν παίρνουν την προηγούμενη τιμή (το drop_unchanged αφαιρεί ακριβώς τις περιόδους
+χωρίς μεταβολή), όπως στο seasonal.seasonal_adjust_panel· NaN μένουν μόνο οι ελλείπουσες
+ή μη θετικές τιμές των ίδιων των γραμμών.
+
+Συντάκτης: thodoreskourtales
+"""
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_HORIZONS = ("qq", "yy", "annualized")
+
+
+def _lag(horizon, periods_per_year):
+    """(υστέρηση σε περιόδους, πολλαπλασιαστής) για έναν ορίζοντα."""
+    if horizon == "qq":
+        return 1, 1.0
+    if horizon == "yy":
+        return periods_per_year, 1.0
+    if horizon == "annualized":
+        return 1, float(periods_per_year)
+    if horizon.startswith("cagr_"):
+        years = int(horizon[len("cagr_"):])
+        return years * periods_per_year, 1.0 / years
+    raise ValueError(f"Άγνωστος ορίζοντας '{horizon}' (qq, yy, annualized, cagr_<έτη>).")
+
+
+def log_levels(block):
+    """
+    Λογάριθμος επιπέδων με NaN για ελλείπουσες ή μη θετικές τιμές (χωρίς συμπλήρωση).
+    Τα μπλοκ float32 (βλ. compact) μένουν float32· όλα τα άλλα γίνονται float64.
+    """
+    block = np.asarray(block)
+    block = block if block.dtype == np.float32 else block.astype(np.float64)
+    out = np.full(block.shape, np.nan, dtype=block.dtype)
+    np.log(block, out=out, where=block > 0)
+    return out
+
+
+def contiguous_rows(periods):
+    """
+    Θέσεις των γραμμών σε συνεχές εύρος περιόδων (από την πρώτη), ή None αν οι αριθμοί
+    περιόδου είναι ήδη συνεχείς. Σφάλμα αν δεν είναι γνησίως αύξοντες.
+    """
+    periods = np.asarray(periods, dtype=np.int64)
+    steps = np.diff(periods)
+    if (steps <= 0).any():
+        raise ValueError("Οι αριθμοί περιόδου πρέπει να είναι γνησίως αύξοντες.")
+    if (steps == 1).all():
+        return None
+    return periods - periods[0]
+
+
+def growth_rates(block, periods_per_year=4, horizons=DEFAULT_HORIZONS, percent=False, periods=None):
+    """
+    Ρυθμοί μεταβολής για όλους τους ορίζοντες ενός μπλοκ (περίοδοι × σειρές).
+
+    periods: οι αριθμοί περιόδου των γραμμών· με κενά οι υστερήσεις υπολογίζονται στο
+    συνεχές εύρος, με την προηγούμενη τιμή στα κενά (βλ. παραπάνω). Χωρίς periods οι
+    γραμμές θεωρούνται διαδοχικές περίοδοι.
+
+    Επιστρέφει {ορίζοντας: πίνακας (περίοδοι × σειρές)}· οι πίνακες είναι όψεις ενός κοινού
+    buffer (ορίζοντες × περίοδοι × σειρές).
+    """
+    logs = log_levels(block)
+    rows = None if periods is None else contiguous_rows(periods)
+    if rows is not None:
+        # Κάθε περίοδος του συνεχούς εύρους παίρνει την τελευταία γραμμή ως αυτήν (ffill των κενών)
+        logs = logs[np.searchsorted(rows, np.arange(rows[-1] + 1), side="right") - 1]
+    n = logs.shape[0]
+    out = np.full((len(horizons),) + logs.shape, np.nan, dtype=logs.dtype)
+    for h, horizon in enumerate(horizons):
+        lag, multiplier = _lag(horizon, periods_per_year)
+        if lag >= n:
+            continue
+        target = out[h, lag:]
+        np.subtract(logs[lag:], logs[:-lag], out=target)
+        if multiplier != 1.0:
+            target *= multiplier
+    if percent:
+        np.expm1(out, out=out)
+        out *= 100.0
+    if rows is not None:
+        out = out[:, rows]
+    return {horizon: out[h] for h, horizon in enumerate(horizons)}
+
+
+def growth_flags(mask, periods_per_year=4, horizons=DEFAULT_HORIZONS, periods=None):
+    """
+    Σημαίες ποιότητας των ρυθμών (βλ. compact): ο ρυθμός στο t για υστέρηση k σημαδεύεται
+    όταν σημαδεύεται το επίπεδο στο t ή στο t − k, με τα κενά των periods όπως στο
+    growth_rates. Επιστρέφει {ορίζοντας: μάσκα bool (περίοδοι × σειρές)}.
+    """
+    mask = np.asarray(mask, dtype=bool)
+    rows = None if periods is None else contiguous_rows(periods)
+    if rows is not None:
+        mask = mask[np.searchsorted(rows, np.arange(rows[-1] + 1), side="right") - 1]
+    out = {}
+    for horizon in horizons:
+        lag, _ = _lag(horizon, periods_per_year)
+        flagged = mask.copy()
+        if lag < len(mask):
+            flagged[lag:] |= mask[:-lag]
+        out[horizon] = flagged if rows is None else flagged[rows]
+    return out
+
+
+def growth_frames(df, periods_per_year=4, horizons=DEFAULT_HORIZONS, percent=False):
+    """Όπως το growth_rates για DataFrame: {ορίζοντας: DataFrame με τον δείκτη/στήλες του df}."""
+    periods = df.index if pd.api.types.is_integer_dtype(df.index) else None
+    rates = growth_rates(df.to_numpy(), periods_per_year, horizons, percent, periods)
+    return {horizon: pd.DataFrame(values, index=df.index, columns=df.columns) for horizon, values in rates.items()}
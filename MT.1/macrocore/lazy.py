@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+"""
+Καθυστερημένη (lazy) εισαγωγή βαριών βιβλιοθηκών
+
+Τα matplotlib, seaborn, statsmodels και scipy.signal χρειάζονται δευτερόλεπτα για να
+φορτωθούν. Με το lazy_import το module φορτώνεται μόνο την πρώτη φορά που θα
+χρησιμοποιηθεί κάποιο χαρακτηριστικό του, οπότε μια εκτέλεση μόνο υπολογισμών
+(--no-plots) δεν φορτώνει ποτέ το matplotlib.
+
+Παράδειγμα:
+    plt = lazy_import("matplotlib.pyplot")
+    ...
+    plt.figure()   # εδώ γίνεται η πραγματική εισαγωγή
+"""
+
+import importlib
+import sys
+import types
+
+
+class _LazyModule(types.ModuleType):
+    """Αντικαταστάτης module που κάνει την εισαγωγή στην πρώτη πρόσβαση."""
+
+    def _load(self):
+        module = importlib.import_module(self.__name__)
+        self.__dict__.update(module.__dict__)
+        self.__class__ = types.ModuleType
+        return module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+
+def lazy_import(name):
+    """
+    Επιστρέφει το module `name` αν είναι ήδη φορτωμένο, αλλιώς έναν αντικαταστάτη που
+    το φορτώνει στην πρώτη πρόσβαση σε κάποιο χαρακτηριστικό του.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    return _LazyModule(name)
+
+
+def is_loaded(name):
+    """True αν το module `name` έχει ήδη φορτωθεί (π.χ. για έλεγχο του --no-plots)."""
+    return name in sys.modules
@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+"""
+Φόρτωση & καθαρισμός των φύλλων Excel του Eurostat (κοινά για τις Ασκήσεις 4, 5 και 6)
+
+Δομή των τριμηνιαίων φύλλων (Quarterly_Data.xlsx):
+  - Σειρά 7 (index 6), στήλη 3: ετικέτα εποχικής προσαρμογής.
+  - Σειρά 10 (index 9): ετικέτες περιόδων ("1995-Q1", "1995-Q2", …).
+  - Σειρά 12 (index 11): Ευρωζώνη.
+  - Σειρά 13 (index 12): Ελλάδα.
+
+Δομή των ετήσιων φύλλων (Annual_Data.xlsx), μετά την παράλειψη 8 σειρών:
+  - Σειρά 0: έτη.
+  - Σειρές 2 και 3: Ευρωζώνη και Ελλάδα.
+
+Και στα δύο αρχεία η σημαία (flag) του Eurostat κάθε τιμής βρίσκεται στην αμέσως επόμενη
+στήλη (π.χ. "p" προσωρινή, "e" εκτίμηση, "b" διακοπή σειράς).
+"""
+
+import re
+
+import numpy as np
+import pandas as pd
+
+from .periods import parse_quarter_labels, parse_year_labels, quarter_ordinal
+
+
+def clean_cell(cell):
+    """
+    Καθαρίζει μια τιμή κελιού:
+      - Επιστρέφει np.nan εάν το κελί είναι ":".
+      - Αντικαθιστά το κόμμα με τελεία και εξάγει το αριθμητικό μέρος, αγνοώντας
+        τυχόν σημαίες (flags) του Eurostat (π.χ. "123p", "45.6 b").
+      - Διαφορετικά προσπαθεί να μετατρέψει την τιμή σε float.
+    """
+    if isinstance(cell, str):
+        cell = cell.strip().replace(",", ".")
+        if cell == ":":
+            return np.nan
+        m = re.search(r"([-+]?[0-9]*\.?[0-9]+)", cell)
+        if m:
+            try:
+                return float(m.group(1))
+            except Exception:
+                return np.nan
+        else:
+            try:
+                return float(cell)
+            except Exception:
+                return np.nan
+    try:
+        return float(cell)
+    except Exception:
+        return np.nan
+
+
+# Σημαίες ποιότητας που κρατιούνται (βλ. compact), με τους κωδικούς του Eurostat
+FLAG_CODES = {"estimated": "e", "provisional": "p"}
+
+
+def cell_flags(values, flag_cells):
+    """
+    Σημαίες ποιότητας για μια σειρά κελιών (διανυσματικά).
+
+    values: τα κελιά τιμών· flag_cells: τα κελιά της επόμενης στήλης (σημαίες Eurostat).
+    Επιστρέφει {"missing": …, "estimated": …, "provisional": …} με πίνακες bool. Λαμβάνονται
+    υπόψη και σημαίες γραμμένες μέσα στο κελί τιμής (π.χ. "123.4 p").
+    """
+    codes = (pd.Series(np.asarray(flag_cells, dtype=object)).fillna("").astype(str) + " "
+             + pd.Series(np.asarray(values, dtype=object)).astype(str).str.replace(r"[-+0-9.,\s]", "", regex=True))
+    numeric = pd.Series(np.asarray(values, dtype=object)).map(clean_cell).to_numpy(dtype=float)
+    flags = {"missing": np.isnan(numeric)}
+    for name, code in FLAG_CODES.items():
+        flags[name] = codes.str.contains(code, regex=False).to_numpy() & ~flags["missing"]
+    return flags
+
+
+def _flag_frames(df_raw, rows, cols, columns, index):
+    """Πίνακες σημαιών (DataFrame bool ανά σημαία) για τις σειρές rows και στήλες τιμών cols."""
+    flag_cols = np.minimum(cols + 1, df_raw.shape[1] - 1)
+    per_row = [cell_flags(df_raw.iloc[row, cols].values, df_raw.iloc[row, flag_cols].values) for row in rows]
+    return {name: pd.DataFrame({col: flags[name] for col, flags in zip(columns, per_row)}, index=index)
+            for name in per_row[0]}
+
+
+def convert_to_float(x):
+    """Μετατρέπει ένα κελί σε float· το ":" θεωρείται NaN (χωρίς εξαγωγή από σημαίες)."""
+    try:
+        if isinstance(x, str):
+            x = x.strip()
+            if x == ":":
+                return np.nan
+        return float(x)
+    except Exception:
+        return np.nan
+
+
+def load_and_clean_sheet(excel_file, sheet, columns=("Euro", "Ελλάδα"), start=(1995, 1), drop_unchanged=False,
+                         with_flags=False):
+    """
+    Διαβάζει ένα τριμηνιαίο φύλλο και καθαρίζει τα δεδομένα.
+
+    Παράμετροι:
+      - excel_file, sheet: το αρχείο και το φύλλο.
+      - columns: ονόματα στηλών για (Ευρωζώνη, Ελλάδα).
+      - start: (έτος, τρίμηνο) από το οποίο κρατάμε δεδομένα.
+      - drop_unchanged: αφαιρεί τις περιόδους χωρίς μεταβολή από την προηγούμενη
+        (συμπεριλαμβανομένης της πρώτης), όπως στην Άσκηση 5.
+      - with_flags: επιστρέφει επιπλέον τις σημαίες ποιότητας (βλ. cell_flags) πριν από τη
+        συμπλήρωση (ffill/bfill), ως {σημαία: DataFrame bool} με τον ίδιο δείκτη.
+
+    Επιστρέφει DataFrame με δείκτη τους ακέραιους αριθμούς περιόδου (βλ. periods) και
+    την ετικέτα εποχικής προσαρμογής στο attrs["seasonal_adjustment"].
+    """
+    df = pd.read_excel(excel_file, sheet_name=sheet, header=None)
+
+    ordinals = parse_quarter_labels(df.iloc[9].values)
+    first = quarter_ordinal(*start)
+    if not (ordinals == first).any():
+        print(f"Προειδοποίηση: Δεν βρέθηκε το '{start[0]}-Q{start[1]}' στο φύλλο {sheet}. "
+              f"Θα χρησιμοποιηθούν όλες οι διαθέσιμες στήλες.")
+        first = 0
+    valid_cols = np.flatnonzero(ordinals >= first)
+
+    euro_data = df.iloc[11, valid_cols].apply(clean_cell).values
+    gr_data = df.iloc[12, valid_cols].apply(clean_cell).values
+
+    cleaned_df = pd.DataFrame({columns[0]: euro_data, columns[1]: gr_data},
+                              index=pd.Index(ordinals[valid_cols], name="period"))
+    cleaned_df = cleaned_df.ffill().bfill()
+    if drop_unchanged:
+        cleaned_df = cleaned_df.loc[cleaned_df.diff().abs().sum(axis=1) != 0]
+    cleaned_df = cleaned_df.dropna()
+    cleaned_df.attrs["seasonal_adjustment"] = df.iloc[6, 2] if df.shape[1] > 2 else None
+    if with_flags:
+        flags = _flag_frames(df, (11, 12), valid_cols, columns, pd.Index(ordinals[valid_cols], name="period"))
+        return cleaned_df, {name: frame.loc[cleaned_df.index] for name, frame in flags.items()}
+    return cleaned_df
+
+
+def load_annual_sheet(excel_file, sheet, first_year=1995, last_year=2022, columns=("Euro", "Greece"),
+                      with_flags=False):
+    """
+    Διαβάζει ένα ετήσιο φύλλο (Annual_Data.xlsx) για τα έτη first_year–last_year.
+
+    Επιστρέφει DataFrame με δείκτη τα έτη (int) και στήλες (Ευρωζώνη, Ελλάδα).
+    Οι ελλείπουσες τιμές συμπληρώνονται μόνο προς τα εμπρός (ffill), όπως στην Άσκηση 4.
+    Με with_flags=True επιστρέφει επιπλέον τις σημαίες ποιότητας (βλ. load_and_clean_sheet).
+    """
+    df = pd.read_excel(excel_file, sheet_name=sheet, header=None, skiprows=8, nrows=4)
+    years = parse_year_labels(df.iloc[0].values)
+    cols = np.flatnonzero((years >= first_year) & (years <= last_year))
+    data = df.iloc[2:4, cols].map(convert_to_float).ffill(axis=1)
+    frame = pd.DataFrame(data.transpose().values, columns=list(columns),
+                         index=pd.Index(years[cols], name="year"))
+    if with_flags:
+        return frame, _flag_frames(df, (2, 3), cols, list(columns), frame.index)
+    return frame
@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+"""
+Ακέραιος δείκτης περιόδων και γρήγορη ευθυγράμμιση σειρών
+
+Οι ετικέτες του Eurostat ("1995-Q1", "1995-Q2", …) μετατρέπονται μία φορά, κατά τη
+φόρτωση, σε ακέραιους αριθμούς περιόδου (ordinals):
+    τρίμηνο: έτος * 4 + (τρίμηνο - 1)     π.χ. "1995-Q1" -> 7980
+    έτος:    έτος                        π.χ. 1995.0    -> 1995
+
+Όλες οι πράξεις (ευθυγράμμιση, επιλογή εύρους, ticks) γίνονται σε ταξινομημένους
+πίνακες int64· οι ετικέτες ξαναδημιουργούνται μόνο για εμφάνιση (άξονες, πίνακες).
+
+Η ευθυγράμμιση πολλών σειρών γίνεται με συγχώνευση (merge-join) ταξινομημένων πινάκων
+με np.searchsorted αντί για index.intersection/.loc σε δείκτες αντικειμένων (object).
+Αν όλες οι σειρές καλύπτουν συνεχόμενες περιόδους, η τομή είναι ένα διάστημα και οι
+σειρές επιστρέφονται ως όψεις (slices) χωρίς αντιγραφή.
+
+Συντάκτης: thodoreskourtales
+"""
+
+import numpy as np
+import pandas as pd
+
+QUARTERS_PER_YEAR = 4
+
+_QUARTER_PATTERN = r"^\s*(\d{4})\s*-?\s*Q([1-4])\s*$"
+
+
+def parse_quarter_labels(labels):
+    """
+    Μετατρέπει ετικέτες τριμήνων ("1995-Q1" ή "1995Q1") σε ακέραιους αριθμούς περιόδου.
+    Οι μη έγκυρες ετικέτες επιστρέφονται ως -1.
+    """
+    parts = pd.Series(np.asarray(labels, dtype=object)).astype(str).str.extract(_QUARTER_PATTERN)
+    valid = parts[0].notna().to_numpy()
+    ordinals = np.full(len(parts), -1, dtype=np.int64)
+    years = parts[0][valid].astype(np.int64).to_numpy()
+    quarters = parts[1][valid].astype(np.int64).to_numpy()
+    ordinals[valid] = years * QUARTERS_PER_YEAR + (quarters - 1)
+    return ordinals
+
+
+def parse_year_labels(labels):
+    """
+    Μετατρέπει ετικέτες ετών (π.χ. 1995, 1995.0 ή "1995") σε ακέραια έτη.
+    Οι μη έγκυρες ετικέτες επιστρέφονται ως -1.
+    """
+    values = pd.to_numeric(pd.Series(np.asarray(labels, dtype=object)), errors="coerce").to_numpy()
+    years = np.full(len(values), -1, dtype=np.int64)
+    valid = np.isfinite(values) & (np.round(values) == values)
+    years[valid] = values[valid].astype(np.int64)
+    return years
+
+
+def quarter_ordinal(year, quarter):
+    """Αριθμός περιόδου για ένα (έτος, τρίμηνο)."""
+    return year * QUARTERS_PER_YEAR + (quarter - 1)
+
+
+def quarter_labels(ordinals):
+    """Ετικέτες εμφάνισης ("1995-Q1") για πίνακα αριθμών περιόδου τριμήνων."""
+    ordinals = np.asarray(ordinals, dtype=np.int64)
+    years, quarters = np.divmod(ordinals, QUARTERS_PER_YEAR)
+    return [f"{y}-Q{q + 1}" for y, q in zip(years, quarters)]
+
+
+def year_ticks(ordinals, every_years=5):
+    """
+    Επιλέγει τις θέσεις των ticks του άξονα Χ: το Q1 κάθε `every_years` ετών.
+    Επιστρέφει (ticks, labels).
+    """
+    ordinals = np.asarray(ordinals, dtype=np.int64)
+    years, quarters = np.divmod(ordinals, QUARTERS_PER_YEAR)
+    ticks = ordinals[(quarters == 0) & (years % every_years == 0)]
+    return ticks, quarter_labels(ticks)
+
+
+def common_periods(*ordinal_arrays):
+    """
+    Τομή ταξινομημένων (αύξουσα σειρά, χωρίς διπλότυπα) πινάκων αριθμών περιόδου.
+
+    Αν όλοι οι πίνακες είναι συνεχόμενες περίοδοι, η τομή υπολογίζεται σε O(1) ως διάστημα.
+    Διαφορετικά γίνεται merge-join με np.searchsorted.
+    """
+    arrays = [np.asarray(a, dtype=np.int64) for a in ordinal_arrays]
+    if any(len(a) == 0 for a in arrays):
+        return np.empty(0, dtype=np.int64)
+    if all(a[-1] - a[0] + 1 == len(a) for a in arrays):
+        start = max(a[0] for a in arrays)
+        stop = min(a[-1] for a in arrays)
+        return np.arange(start, stop + 1, dtype=np.int64)
+
+    common = arrays[0]
+    for a in arrays[1:]:
+        pos = np.searchsorted(a, common)
+        pos_clipped = np.minimum(pos, len(a) - 1)
+        common = common[a[pos_clipped] == common]
+    return common
+
+
+def align_frames(*frames):
+    """
+    Ευθυγραμμίζει DataFrame με ακέραιο δείκτη περιόδων (ταξινομημένο) στις κοινές περιόδους.
+
+    Επιστρέφει λίστα με τα ευθυγραμμισμένα DataFrame (κενά αν δεν υπάρχει κοινό εύρος).
+    Για συνεχόμενους δείκτες η επιλογή γίνεται με slice (όψη, χωρίς αντιγραφή).
+    """
+    common = common_periods(*(frame.index.to_numpy() for frame in frames))
+    aligned = []
+    for frame in frames:
+        ordinals = frame.index.to_numpy()
+        if len(common) == 0:
+            aligned.append(frame.iloc[0:0])
+            continue
+        start = np.searchsorted(ordinals, common[0])
+        stop = np.searchsorted(ordinals, common[-1], side="right")
+        if stop - start == len(common):
+            aligned.append(frame.iloc[start:stop])
+        else:
+            aligned.append(frame.iloc[np.searchsorted(ordinals, common)])
+    return aligned
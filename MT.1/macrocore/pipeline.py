@@ -0,0 +1,207 @@
+# -*- coding: utf-8 -*-
+"""
+Εκτελεστής pipeline (DAG) με εξαρτήσεις και σταδιακή επανεκτέλεση, τύπου make
+
+Κάθε κόμβος (node) είναι ένα λεξικό:
+    {
+        "name":    μοναδικό όνομα,
+        "cmd":     εντολή (λίστα ορισμάτων) που εκτελείται ως διεργασία,
+        "cwd":     φάκελος εκτέλεσης (σχετικός με τη ρίζα),
+        "inputs":  αρχεία/μοτίβα glob (σχετικά με τη ρίζα) που διαβάζει ο κόμβος,
+        "outputs": αρχεία/μοτίβα glob (σχετικά με τη ρίζα) που παράγει ο κόμβος,
+        "deps":    ονόματα κόμβων που πρέπει να έχουν εκτελεστεί πρώτα,
+        "stdin":   (προαιρετικό) κείμενο για την standard input της εντολής,
+    }
+
+Για κάθε κόμβο υπολογίζεται ένα hash (SHA-256) της εντολής και του περιεχομένου όλων
+των αρχείων εισόδου. Αν το hash είναι ίδιο με αυτό της τελευταίας επιτυχούς εκτέλεσης
+και υπάρχουν όλες οι έξοδοι, ο κόμβος παραλείπεται. Τα hash των αρχείων κρατιούνται
+μαζί με mtime/μέγεθος, ώστε να μην ξαναδιαβάζονται αρχεία που δεν άλλαξαν.
+
+Οι ανεξάρτητοι κόμβοι εκτελούνται παράλληλα σε ThreadPoolExecutor (κάθε κόμβος είναι
+ξεχωριστή διεργασία). Η έξοδος κάθε κόμβου γράφεται σε .pipeline_logs/<όνομα>.log.
+"""
+
+import glob
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+state_filename = ".pipeline_state.json"
+logs_dirname = ".pipeline_logs"
+
+
+def _expand(root, patterns):
+    """Ανάπτυξη μοτίβων glob (σχετικών με τη ρίζα) σε ταξινομημένη λίστα αρχείων."""
+    paths = set()
+    for pattern in patterns:
+        paths.update(p for p in glob.glob(os.path.join(root, pattern), recursive=True) if os.path.isfile(p))
+    return sorted(paths)
+
+
+def file_digest(path, file_cache):
+    """
+    SHA-256 του περιεχομένου ενός αρχείου. Το file_cache ({path: [mtime_ns, size, digest]})
+    επιτρέπει την παράλειψη της ανάγνωσης όταν το αρχείο δεν έχει αλλάξει.
+    """
+    st = os.stat(path)
+    cached = file_cache.get(path)
+    if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+        return cached[2]
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    digest = h.hexdigest()
+    file_cache[path] = [st.st_mtime_ns, st.st_size, digest]
+    return digest
+
+
+def node_digest(node, root, file_cache):
+    """Hash της εντολής και όλων των αρχείων εισόδου ενός κόμβου."""
+    h = hashlib.sha256()
+    h.update(json.dumps([node["cmd"], node.get("cwd", "."), node.get("stdin")]).encode())
+    for path in _expand(root, node.get("inputs", [])):
+        h.update(os.path.relpath(path, root).encode())
+        h.update(file_digest(path, file_cache).encode())
+    return h.hexdigest()
+
+
+def outputs_exist(node, root):
+    """True αν κάθε μοτίβο εξόδου αντιστοιχεί σε τουλάχιστον ένα αρχείο."""
+    return all(_expand(root, [pattern]) for pattern in node.get("outputs", []))
+
+
+def topological_order(nodes, targets=None):
+    """
+    Επιστρέφει τα ονόματα των κόμβων σε τοπολογική σειρά, περιορισμένα στους `targets`
+    και στις εξαρτήσεις τους. Σηκώνει ValueError για άγνωστες εξαρτήσεις ή κύκλους.
+    """
+    graph = {node["name"]: node for node in nodes}
+    for name in targets or []:
+        if name not in graph:
+            raise ValueError(f"Άγνωστος κόμβος: {name}")
+
+    order, visiting, visited = [], set(), set()
+
+    def visit(name):
+        if name in visited:
+            return
+        if name in visiting:
+            raise ValueError(f"Κύκλος στο pipeline στον κόμβο: {name}")
+        visiting.add(name)
+        for dep in graph[name].get("deps", []):
+            if dep not in graph:
+                raise ValueError(f"Ο κόμβος '{name}' εξαρτάται από άγνωστο κόμβο '{dep}'")
+            visit(dep)
+        visiting.discard(name)
+        visited.add(name)
+        order.append(name)
+
+    for name in (targets or list(graph)):
+        visit(name)
+    return order
+
+
+def _run_node(node, root):
+    """Εκτελεί την εντολή ενός κόμβου· επιστρέφει (επιτυχία, διάρκεια)."""
+    os.makedirs(os.path.join(root, logs_dirname), exist_ok=True)
+    log_path = os.path.join(root, logs_dirname, f"{node['name']}.log")
+    start = time.perf_counter()
+    with open(log_path, "w", encoding="utf-8") as log:
+        result = subprocess.run(node["cmd"], cwd=os.path.join(root, node.get("cwd", ".")),
+                                input=node.get("stdin"), text=True, stdout=log, stderr=subprocess.STDOUT)
+    return result.returncode == 0, time.perf_counter() - start
+
+
+def _load_state(path):
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    return {"nodes": {}, "files": {}}
+
+
+def _save_state(path, state):
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=1, ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+def run_pipeline(nodes, root, targets=None, jobs=None, force=False, dry_run=False):
+    """
+    Εκτελεί τους κόμβους (και τις εξαρτήσεις τους) που δεν είναι ενημερωμένοι.
+
+    Παράμετροι:
+      - nodes: λίστα κόμβων (βλ. docstring του module).
+      - root: ο φάκελος ρίζας για τις σχετικές διαδρομές.
+      - targets: ονόματα κόμβων-στόχων (προεπιλογή: όλοι).
+      - jobs: μέγιστος αριθμός παράλληλων κόμβων (προεπιλογή: os.cpu_count()).
+      - force: εκτέλεση όλων των επιλεγμένων κόμβων ανεξαρτήτως hash.
+      - dry_run: μόνο εμφάνιση του τι θα εκτελεστεί.
+
+    Επιστρέφει λεξικό {κόμβος: κατάσταση} με καταστάσεις "ενημερωμένος", "εκτελέστηκε",
+    "θα εκτελεστεί", "απέτυχε" ή "παραλείφθηκε" (λόγω αποτυχημένης εξάρτησης).
+    """
+    graph = {node["name"]: node for node in nodes}
+    order = topological_order(nodes, targets)
+    state_path = os.path.join(root, state_filename)
+    state = _load_state(state_path)
+    ok_states = ("ενημερωμένος", "εκτελέστηκε", "θα εκτελεστεί")
+
+    status = {}
+    pending = list(order)
+    running = {}
+    with ThreadPoolExecutor(max_workers=jobs or os.cpu_count() or 1) as pool:
+        while pending or running:
+            for name in list(pending):
+                deps = graph[name].get("deps", [])
+                if any(status.get(dep) in ("απέτυχε", "παραλείφθηκε") for dep in deps):
+                    status[name] = "παραλείφθηκε"
+                    pending.remove(name)
+                    print(f"[παραλείφθηκε] {name} (αποτυχημένη εξάρτηση)")
+                    continue
+                if not all(status.get(dep) in ok_states for dep in deps):
+                    continue
+                pending.remove(name)
+                node = graph[name]
+                stale_deps = any(status[dep] in ("εκτελέστηκε", "θα εκτελεστεί") for dep in deps)
+                if dry_run and stale_deps:
+                    status[name] = "θα εκτελεστεί"
+                    print(f"[θα εκτελεστεί] {name}")
+                    continue
+                digest = node_digest(node, root, state["files"])
+                if not force and state["nodes"].get(name) == digest and outputs_exist(node, root):
+                    status[name] = "ενημερωμένος"
+                    print(f"[ενημερωμένος] {name}")
+                    continue
+                if dry_run:
+                    status[name] = "θα εκτελεστεί"
+                    print(f"[θα εκτελεστεί] {name}")
+                    continue
+                print(f"[εκκίνηση] {name}: {' '.join(node['cmd'])}")
+                running[pool.submit(_run_node, node, root)] = name
+
+            if not running:
+                continue
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                success, elapsed = future.result()
+                if success:
+                    status[name] = "εκτελέστηκε"
+                    # Το hash υπολογίζεται μετά την εκτέλεση, ώστε κόμβοι που τροποποιούν
+                    # τα ίδια τους τα αρχεία εισόδου (π.χ. captions) να μη ξανατρέχουν.
+                    state["nodes"][name] = node_digest(graph[name], root, state["files"])
+                    _save_state(state_path, state)
+                    print(f"[εκτελέστηκε] {name} σε {elapsed:.1f} s")
+                else:
+                    status[name] = "απέτυχε"
+                    state["nodes"].pop(name, None)
+                    _save_state(state_path, state)
+                    print(f"[απέτυχε] {name} (βλ. {os.path.join(logs_dirname, name + '.log')})", file=sys.stderr)
+    return status
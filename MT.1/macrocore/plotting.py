@@ -0,0 +1,283 @@
+# -*- coding: utf-8 -*-
+"""
+Κοινό επίπεδο σχεδίασης χρονοσειρών: αραίωση σημείων, αραίωση markers, ραστεροποίηση
+
+Ένα διάγραμμα δεν μπορεί να δείξει περισσότερα σημεία από όσα pixels έχει ο άξονας, ενώ
+κάθε σημείο (και κάθε marker) κοστίζει στη σχεδίαση, στην αποθήκευση και στο μέγεθος του
+αρχείου. Το plot_series αντικαθιστά το ax.plot:
+  - Αραίωση LTTB (Largest-Triangle-Three-Buckets): όταν η σειρά έχει περισσότερα σημεία
+    από τον «προϋπολογισμό» pixels του άξονα (πλάτος σε pixels στα settings["dpi"] ×
+    settings["points_per_pixel"]), κρατιούνται τα σημεία που διατηρούν το οπτικό σχήμα
+    (κορυφές, βυθίσεις). Τα τμήματα ανάμεσα σε NaN αραιώνονται χωριστά, ώστε τα κενά
+    να μένουν κενά.
+  - Αραίωση markers: όταν οι markers θα επικαλύπτονταν (απόσταση μικρότερη από το
+    μέγεθός τους), σχεδιάζεται ένας ανά markevery σημεία.
+  Για τις τριμηνιαίες σειρές των ασκήσεων (~120 σημεία) δεν αλλάζει τίποτα· τα παραπάνω
+  ενεργοποιούνται μόνο σε μακριές ή υψηλής συχνότητας σειρές.
+
+Το save_figure αντικαθιστά το plt.savefig:
+  - σε διανυσματικές μορφές (pdf, svg, eps, pgf) ραστεροποιεί ανά άξονα τις γραμμές των
+    αξόνων με πάνω από settings["rasterize_points"] σημεία (τα κείμενα και οι άξονες
+    μένουν διανυσματικά).
+  - με settings["check"] (--check-plots) συγκρίνει την απόδοση με αυτή των πλήρων
+    δεδομένων (fidelity) και προειδοποιεί αν διαφέρει ορατά· με 2 σημεία ανά pixel, ένας
+    τυχαίος περίπατος 10^5 σημείων διαφέρει σε ~0.1% των pixels (γραμμή πάχους 2).
+
+Διανυσματικά διαγράμματα για το βιβλίο (--figure-format pdf|pgf|svg):
+  Με settings["format"] το save_figure γράφει το διάγραμμα στη μορφή αυτή (ίδιο όνομα,
+  άλλη κατάληξη) και επιστρέφει τη διαδρομή του. Το configure (και το use_style μετά από
+  κάθε αλλαγή στυλ) εφαρμόζει το
+  FIGURE_TEMPLATE (γραμματοσειρά του βιβλίου Noto Serif, με DejaVu Serif ως εφεδρεία για
+  όσους δεν την έχουν): στο PDF οι γραμματοσειρές ενσωματώνονται ως υποσύνολο TrueType
+  (μόνο οι χαρακτήρες που χρησιμοποιούνται), ενώ στο PGF το κείμενο στοιχειοθετείται από
+  το ίδιο το XeLaTeX με τις γραμματοσειρές του εγγράφου (καμία ενσωμάτωση). Το
+  build_figures.py τρέχει όλα τα scripts σε μία διεργασία, ώστε οι γραμματοσειρές να
+  φορτώνονται μία φορά. Στη μορφή png (προεπιλογή) τα διαγράμματα δεν αλλάζουν.
+
+Συντάκτης: thodoreskourtales
+"""
+
+import io
+import math
+import os
+import shutil
+
+import numpy as np
+
+from .lazy import lazy_import
+
+plt = lazy_import("matplotlib.pyplot")
+mpl = lazy_import("matplotlib")
+
+# Ρυθμίσεις (αλλάζουν με το configure, π.χ. από τα ορίσματα των scripts)
+settings = {
+    "dpi": 300,               # ανάλυση για τον υπολογισμό του προϋπολογισμού σημείων
+    "points_per_pixel": 2,    # σημεία ανά pixel πλάτους μετά την αραίωση
+    "rasterize_points": 5000, # σημεία ανά άξονα πάνω από τα οποία ραστεροποιούνται οι γραμμές
+    "check": False,           # σύγκριση με την απόδοση των πλήρων δεδομένων στο save_figure
+    "tolerance": 0.002,       # ανεκτό ποσοστό pixels που διαφέρουν ορατά
+    "format": "png",          # μορφή αρχείων του save_figure (png, pdf, pgf, svg)
+}
+
+VECTOR_FORMATS = ("pdf", "svg", "eps", "ps", "pgf")
+
+# Κοινό πρότυπο (rcParams) των διανυσματικών διαγραμμάτων του βιβλίου
+FIGURE_TEMPLATE = {
+    "font.family": "serif",
+    "font.serif": ["Noto Serif", "DejaVu Serif"],
+    "mathtext.fontset": "dejavuserif",
+    "pdf.fonttype": 42,       # TrueType, ενσωμάτωση υποσυνόλου
+    "ps.fonttype": 42,
+    "svg.fonttype": "none",   # κείμενο ως κείμενο
+    "pgf.texsystem": "xelatex",
+    "pgf.rcfonts": False,     # στο PGF ισχύουν οι γραμματοσειρές του εγγράφου
+    "pgf.preamble": "\\usepackage{fontspec}\\setmainfont{Noto Serif}",
+}
+
+
+def configure(**kwargs):
+    """
+    Ενημέρωση των ρυθμίσεων (π.χ. configure(check=args.check_plots, format="pdf")). Για
+    διανυσματική μορφή εφαρμόζεται το FIGURE_TEMPLATE (πριν δημιουργηθούν τα διαγράμματα).
+    """
+    unknown = set(kwargs) - set(settings)
+    if unknown:
+        raise KeyError(f"Άγνωστες ρυθμίσεις σχεδίασης: {sorted(unknown)}")
+    settings.update(kwargs)
+    if settings["format"] == "pgf" and shutil.which(FIGURE_TEMPLATE["pgf.texsystem"]) is None:
+        raise FileNotFoundError(f"Η μορφή pgf χρειάζεται το '{FIGURE_TEMPLATE['pgf.texsystem']}' (τοπική εγκατάσταση TeX).")
+    apply_template()
+
+
+def apply_template():
+    """Εφαρμογή του FIGURE_TEMPLATE (μόνο για διανυσματική μορφή)."""
+    if settings["format"] in VECTOR_FORMATS:
+        mpl.rcParams.update(FIGURE_TEMPLATE)
+
+
+def use_style(*styles):
+    """
+    plt.style.use με το πρώτο διαθέσιμο από τα styles, χωρίς να χαθεί το FIGURE_TEMPLATE
+    (ένα style επαναφέρει και τις γραμματοσειρές).
+    """
+    for style in styles:
+        try:
+            plt.style.use(style)
+            break
+        except OSError:
+            continue
+    apply_template()
+
+
+def figure_path(filename, format=None):
+    """
+    Το όνομα αρχείου με την κατάληξη της format (προεπιλογή: settings["format"])·
+    αντικείμενα αρχείου (π.χ. io.BytesIO) επιστρέφονται ως έχουν.
+    """
+    if not isinstance(filename, (str, os.PathLike)):
+        return filename
+    return os.path.splitext(os.fspath(filename))[0] + "." + (format or settings["format"])
+
+
+# ----------------------------------------------------------------------------
+# Αραίωση LTTB
+# ----------------------------------------------------------------------------
+
+def lttb(x, y, n_out):
+    """
+    Δείκτες των n_out σημείων που κρατά ο αλγόριθμος Largest-Triangle-Three-Buckets
+    (πεπερασμένα x, y). Το πρώτο και το τελευταίο σημείο κρατιούνται πάντα· από κάθε
+    ενδιάμεσο κάδο κρατιέται το σημείο που σχηματίζει το μεγαλύτερο τρίγωνο με το
+    προηγούμενο επιλεγμένο σημείο και τον μέσο όρο του επόμενου κάδου.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    # Όρια των n_out − 2 ενδιάμεσων κάδων στο [1, n − 1)
+    bounds = (np.arange(n_out - 1) * ((n - 2) / (n_out - 2))).astype(np.int64) + 1
+    bounds[-1] = n - 1
+    counts = np.diff(bounds)
+    # Μέσοι όροι όλων των κάδων μαζί· ο «επόμενος» του τελευταίου κάδου είναι το τελευταίο σημείο
+    mean_x = np.append(np.add.reduceat(x[:-1], bounds[:-1]) / counts, x[-1])
+    mean_y = np.append(np.add.reduceat(y[:-1], bounds[:-1]) / counts, y[-1])
+
+    keep = np.empty(n_out, dtype=np.int64)
+    keep[0], keep[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start, end = bounds[i], bounds[i + 1]
+        ax_, ay = x[a], y[a]
+        area = np.abs((ax_ - mean_x[i + 1]) * (y[start:end] - ay) - (ax_ - x[start:end]) * (mean_y[i + 1] - ay))
+        a = start + int(np.argmax(area))
+        keep[i + 1] = a
+    return keep
+
+
+def decimate(x, y, n_out):
+    """
+    Αραίωση LTTB με σεβασμό στα κενά: κάθε συνεχές τμήμα πεπερασμένων τιμών αραιώνεται
+    χωριστά (με μερίδιο του n_out ανάλογο του μήκους του). Επιστρέφει τους δείκτες των
+    σημείων που κρατιούνται, μαζί με ένα NaN σημείο ανάμεσα στα τμήματα.
+    """
+    xf = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    finite = np.isfinite(y) & np.isfinite(xf)
+    if len(y) <= n_out:
+        return np.arange(len(y))
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], finite.astype(np.int8), [0]))))
+    segments = list(zip(edges[::2], edges[1::2]))
+    total = int(finite.sum())
+    keep = []
+    for start, end in segments:
+        budget = max(3, int(round(n_out * (end - start) / max(total, 1))))
+        keep.append(start + lttb(xf[start:end], y[start:end], budget))
+        if end < len(y):
+            keep.append(np.array([end]))  # το πρώτο NaN μετά το τμήμα κρατά το κενό
+    return np.concatenate(keep) if keep else np.arange(0)
+
+
+# ----------------------------------------------------------------------------
+# Σχεδίαση
+# ----------------------------------------------------------------------------
+
+def point_budget(ax):
+    """Μέγιστος αριθμός σημείων για μια γραμμή του άξονα (πλάτος σε pixels × σημεία/pixel)."""
+    width_in = ax.get_position().width * ax.figure.get_figwidth()
+    return max(3, int(width_in * settings["dpi"] * settings["points_per_pixel"]))
+
+
+def marker_every(ax, n_points, markersize):
+    """Κάθε πόσα σημεία σχεδιάζεται marker ώστε να μην επικαλύπτονται (1: όλα)."""
+    width_pt = ax.get_position().width * ax.figure.get_figwidth() * 72.0
+    spacing = width_pt / max(n_points - 1, 1)
+    return max(1, math.ceil(markersize / spacing))
+
+
+def plot_series(ax, x, y, *args, **kwargs):
+    """
+    Όπως το ax.plot(x, y, ...) για μία σειρά, με αραίωση LTTB πάνω από τον προϋπολογισμό
+    σημείων του άξονα και αραίωση των markers όταν επικαλύπτονται. Τα πλήρη δεδομένα
+    κρατιούνται στη γραμμή (για τον έλεγχο του save_figure).
+    """
+    x_full, y_full = np.asarray(x), np.asarray(y)
+    budget = point_budget(ax)
+    keep = decimate(x_full, y_full, budget) if len(y_full) > budget else None
+    xs, ys = (x_full, y_full) if keep is None else (x_full[keep], y_full[keep])
+    if kwargs.get("marker") and "markevery" not in kwargs:
+        markersize = kwargs.get("markersize", kwargs.get("ms", mpl.rcParams["lines.markersize"]))
+        every = marker_every(ax, len(ys), markersize)
+        if every > 1:
+            kwargs["markevery"] = every
+    line, = ax.plot(xs, ys, *args, **kwargs)
+    if keep is not None or "markevery" in kwargs:
+        line._macrocore_full = (x_full, y_full)
+    return line
+
+
+# ----------------------------------------------------------------------------
+# Αποθήκευση, ραστεροποίηση και έλεγχος πιστότητας
+# ----------------------------------------------------------------------------
+
+def rasterize_dense_axes(fig, threshold=None):
+    """Ραστεροποίηση (ανά άξονα) των γραμμών όσων αξόνων έχουν πολλά σημεία."""
+    threshold = settings["rasterize_points"] if threshold is None else threshold
+    for ax in fig.axes:
+        lines = ax.get_lines()
+        if sum(len(line.get_xdata()) for line in lines) > threshold:
+            for line in lines:
+                line.set_rasterized(True)
+
+
+def render(fig, dpi=None):
+    """Η εικόνα (ύψος × πλάτος × κανάλια, float 0–1) του διαγράμματος στα dpi."""
+    buf = io.BytesIO()
+    fig.savefig(buf, format="png", dpi=dpi)
+    buf.seek(0)
+    return plt.imread(buf)
+
+
+def fidelity(fig, dpi=None, threshold=0.25):
+    """
+    Ποσοστό pixels που διαφέρουν ορατά (> threshold σε κάποιο κανάλι) ανάμεσα στην απόδοση
+    του διαγράμματος και σε αυτή με τα πλήρη δεδομένα. Οι markers των αραιωμένων γραμμών
+    κρύβονται και στις δύο αποδόσεις (η αραίωσή τους είναι σκόπιμη)· συγκρίνεται το σχήμα.
+    """
+    lines = [line for ax in fig.axes for line in ax.get_lines() if hasattr(line, "_macrocore_full")]
+    if not lines:
+        return 0.0
+    saved = [(line.get_data(), line.get_marker()) for line in lines]
+    try:
+        for line in lines:
+            line.set_marker("None")
+        reduced = render(fig, dpi)
+        for line in lines:
+            line.set_data(*line._macrocore_full)
+        full = render(fig, dpi)
+    finally:
+        for line, (data, marker) in zip(lines, saved):
+            line.set_data(*data)
+            line.set_marker(marker)
+    if reduced.shape != full.shape:
+        return 1.0
+    return float(np.mean(np.abs(reduced - full).max(axis=-1) > threshold))
+
+
+def save_figure(fig, filename, dpi=None, format=None):
+    """
+    Όπως το fig.savefig, στη μορφή format (προεπιλογή: settings["format"]): ραστεροποίηση των πυκνών αξόνων σε
+    διανυσματικές μορφές και, με settings["check"], έλεγχος πιστότητας έναντι των πλήρων
+    δεδομένων. Επιστρέφει τη διαδρομή του αρχείου που γράφτηκε. Σε αντικείμενα αρχείου
+    (π.χ. io.BytesIO της υπηρεσίας) η μορφή δίνεται ρητά στο savefig.
+    """
+    fmt = format or settings["format"]
+    filename = figure_path(filename, fmt)
+    if fmt in VECTOR_FORMATS:
+        rasterize_dense_axes(fig)
+    if settings["check"]:
+        diff = fidelity(fig, dpi)
+        if diff > settings["tolerance"]:
+            print(f"Προσοχή: το '{filename}' διαφέρει ορατά από την πλήρη απόδοση ({diff:.2%} των pixels).")
+    fig.savefig(filename, dpi=dpi, format=fmt)
+    return filename
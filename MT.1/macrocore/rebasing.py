@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+"""
+Αλλαγή έτους βάσης (rebasing) και εύρεση της περιόδου βάσης για ολόκληρα panels
+
+Όλες οι συναρτήσεις δουλεύουν πάνω σε ένα «μπλοκ» (περίοδοι × …), συνήθως
+(περίοδοι × περιοχές × μεταβλητές), με τον χρόνο στον άξονα 0· οι υπόλοιποι άξονες είναι
+ανεξάρτητες σειρές και όλα γίνονται με broadcasting σε ένα πέρασμα:
+  - base_period_crossing: η περίοδος όπου ονομαστική ≈ πραγματική σειρά (αποπληθωριστής = 100),
+    με γραμμική παρεμβολή ανάμεσα στις δύο περιόδους όπου η διαφορά αλλάζει πρόσημο.
+  - base_values:          οι τιμές βάσης ανά σειρά (μία περίοδος, μέσος όρος διαστήματος ή
+                          διαφορετική περίοδος ανά σειρά).
+  - rebase:               μπλοκ / βάση · 100, με out= ώστε η εναλλαγή έτους βάσης να
+                          ξαναγράφει τον ίδιο buffer χωρίς νέες δεσμεύσεις μνήμης.
+
+Η βάση δίνεται ως:
+  - ακέραιος: περίοδος (έτος ή αριθμός τριμήνου, βλ. periods) αν δοθεί periods, αλλιώς θέση.
+  - (αρχή, τέλος): μέσος όρος των περιόδων του κλειστού διαστήματος (π.χ. (2015, 2015)
+    ή (quarter_ordinal(2015, 1), quarter_ordinal(2015, 4)) για βάση «2015 = 100»).
+  - πίνακας θέσεων με σχήμα block.shape[1:]: διαφορετική περίοδος ανά σειρά (π.χ. η
+    base_period_crossing(...)[0]).
+
+Συντάκτης: thodoreskourtales
+"""
+
+import numpy as np
+
+
+def base_period_crossing(nominal, real):
+    """
+    Βρίσκει ανά σειρά την περίοδο όπου η ονομαστική σειρά ισούται με την πραγματική.
+
+    nominal, real: πίνακες ίδιου σχήματος (περίοδοι × …).
+    Επιστρέφει (index, position):
+      - index:    θέση της περιόδου με τη μικρότερη |ονομαστική − πραγματική| (ακέραιοι,
+                  σχήμα nominal.shape[1:]).
+      - position: κλασματική θέση της τομής (π.χ. 20.4 = το 40% της απόστασης από την
+                  περίοδο 20 στην 21), με γραμμική παρεμβολή στο διάστημα δίπλα στο index
+                  όπου η διαφορά αλλάζει πρόσημο· NaN αν δεν υπάρχει τέτοιο διάστημα.
+    """
+    diff = np.asarray(nominal, dtype=float) - np.asarray(real, dtype=float)
+    gap = np.abs(diff)
+    # Οι ελλείπουσες τιμές δεν επιλέγονται ποτέ (σειρές μόνο με NaN δίνουν index 0 και NaN)
+    index = np.argmin(np.where(np.isnan(gap), np.inf, gap), axis=0)
+    n = diff.shape[0]
+
+    def at(i):
+        return np.take_along_axis(diff, np.clip(i, 0, n - 1)[None], axis=0)[0]
+
+    d0 = at(index)
+    position = np.full(index.shape, np.nan)
+    position[d0 == 0] = index[d0 == 0]
+    # Πρώτα το διάστημα [index, index + 1] και μετά το [index − 1, index]
+    for lo in (index, index - 1):
+        a, b = at(lo), at(lo + 1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            crosses = (lo >= 0) & (lo + 1 < n) & (a * b < 0) & np.isnan(position)
+            position = np.where(crosses, lo + a / (a - b), position)
+    return index, position
+
+
+def interpolate_period(periods, position):
+    """Μετατρέπει κλασματικές θέσεις (βλ. base_period_crossing) σε κλασματικές περιόδους."""
+    periods = np.asarray(periods, dtype=float)
+    return np.interp(position, np.arange(len(periods)), periods, left=np.nan, right=np.nan)
+
+
+def _positions(periods, first, last=None):
+    """Θέσεις [αρχή, τέλος] για περιόδους ή απλές θέσεις όταν periods είναι None."""
+    last = first if last is None else last
+    if periods is None:
+        return int(first), int(last)
+    periods = np.asarray(periods)
+    start, stop = np.searchsorted(periods, [first, last], side="left")
+    if start >= len(periods) or stop >= len(periods) or periods[start] != first or periods[stop] != last:
+        raise ValueError(f"Η περίοδος βάσης {first}–{last} δεν υπάρχει στις περιόδους "
+                         f"{periods[0]}–{periods[-1]}.")
+    return int(start), int(stop)
+
+
+def base_values(block, base, periods=None):
+    """
+    Τιμές βάσης ανά σειρά (σχήμα block.shape[1:]) για τη δοσμένη βάση (βλ. docstring του module).
+    Για βάση-διάστημα χρησιμοποιείται ο μέσος όρος (nanmean) των περιόδων του.
+    """
+    block = np.asarray(block)
+    if isinstance(base, tuple):
+        start, stop = _positions(periods, *base)
+        if start == stop:
+            return block[start]
+        return np.nanmean(block[start:stop + 1], axis=0)
+    base = np.asarray(base)
+    if base.ndim == 0:
+        return block[_positions(periods, base.item())[0]]
+    # Διαφορετική θέση ανά σειρά
+    return np.take_along_axis(block, base[None].astype(np.intp), axis=0)[0]
+
+
+def rebase(block, base, periods=None, scale=100.0, out=None):
+    """
+    Αλλαγή βάσης: block / base_values · scale, για όλες τις σειρές του μπλοκ μαζί.
+
+    Με out= (πίνακας float ίδιου σχήματος, ή το ίδιο το block για επιτόπια αλλαγή) δεν
+    δεσμεύεται νέος πίνακας· οι τιμές βάσης διαβάζονται πριν γραφτεί το out.
+    """
+    block = np.asarray(block)
+    values = base_values(block, base, periods)
+    if out is block or (out is not None and np.may_share_memory(out, values)):
+        values = np.array(values)
+    out = np.divide(block, values, out=out)
+    out *= scale
+    return out
@@ -0,0 +1,253 @@
+# -*- coding: utf-8 -*-
+"""
+Σταδιακή δημιουργία των αναφορών LaTeX (πρότυπα, αυτόνομα κεφάλαια, παράλληλη μεταγλώττιση)
+
+Πρότυπα:
+  Τα κείμενα των αναφορών είναι αρχεία .tex με θέσεις @@όνομα (ή @@{όνομα}) που
+  συμπληρώνονται με τα υπολογισμένα μεγέθη (π.χ. max_identity_diff, έτη βάσης). Το "$" και
+  οι αγκύλες της LaTeX μένουν ανέγγιχτα. Το render_template γράφει το αρχείο μόνο όταν
+  αλλάζει το περιεχόμενο, ώστε να μη θεωρείται «αλλαγμένο» χωρίς λόγο. Οι πίνακες (π.χ.
+  σχετικές μεταβλητότητες) γράφονται ως αρχεία tabular με το latex_table.
+
+Βιβλίο:
+  Το latex/big_book/main.tex είναι preamble.tex + \\include{chapters/…}. Κάθε κεφάλαιο
+  μεταγλωττίζεται και αυτόνομα μέσω ενός μικρού αρχείου-περιτυλίγματος στο build/ (ίδιο
+  preamble, ίδιος αριθμός κεφαλαίου), οπότε:
+    - ξαναχτίζονται μόνο τα κεφάλαια των οποίων άλλαξε κάποια είσοδος (το ίδιο το
+      κεφάλαιο, το preamble, εικόνες από \\includegraphics, αρχεία από \\input), με
+      hash (βλ. pipeline.file_digest) αποθηκευμένο στο build/.report_state.json.
+    - τα ανεξάρτητα κεφάλαια μεταγλωττίζονται παράλληλα.
+    - τα .aux της προηγούμενης μεταγλώττισης κρατιούνται· νέο πέρασμα γίνεται μόνο αν το
+      .aux άλλαξε στο τελευταίο πέρασμα (παραπομπές/περιεχόμενα), συνήθως ένα πέρασμα.
+  Το πλήρες βιβλίο (main.pdf) ξαναχτίζεται μόνο αν άλλαξε κάποιο κεφάλαιο, με τον ίδιο
+  κανόνα περασμάτων (το \\include κρατά ξεχωριστό .aux ανά κεφάλαιο).
+
+Συντάκτης: thodoreskourtales
+"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import string
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+from .pipeline import file_digest
+
+STATE_FILE = ".report_state.json"
+BUILD_DIR = "build"
+
+
+class LatexTemplate(string.Template):
+    """string.Template με θέσεις @@όνομα, ώστε το "$" της LaTeX να μη χρειάζεται διαφυγή."""
+    delimiter = "@@"
+
+
+def latex_escape(text):
+    """Διαφυγή των ειδικών χαρακτήρων της LaTeX σε απλό κείμενο."""
+    replacements = {"\\": r"\textbackslash{}", "&": r"\&", "%": r"\%", "$": r"\$", "#": r"\#",
+                    "_": r"\_", "{": r"\{", "}": r"\}", "~": r"\textasciitilde{}", "^": r"\textasciicircum{}"}
+    return "".join(replacements.get(ch, ch) for ch in str(text))
+
+
+def write_if_changed(path, content):
+    """Γράφει το αρχείο μόνο αν διαφέρει· επιστρέφει True αν γράφτηκε."""
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            if f.read() == content:
+                return False
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(content)
+    return True
+
+
+def render_template(template_path, context, output_path):
+    """Συμπληρώνει το πρότυπο με το context και γράφει το output_path (αν άλλαξε)."""
+    with open(template_path, encoding="utf-8") as f:
+        content = LatexTemplate(f.read()).substitute(context)
+    return write_if_changed(output_path, content)
+
+
+def latex_table(df, output_path=None, float_format="{:.4f}"):
+    """
+    Πίνακας booktabs (tabular) από DataFrame, π.χ. οι πίνακες σχετικής μεταβλητότητας.
+    Επιστρέφει το κείμενο και, αν δοθεί output_path, το γράφει (μόνο αν άλλαξε).
+    """
+    def cell(value):
+        return float_format.format(value) if isinstance(value, float) else latex_escape(value)
+
+    lines = [r"\begin{tabular}{" + "l" + "r" * (df.shape[1] - 1) + "}", r"\toprule",
+             " & ".join(latex_escape(c) for c in df.columns) + r" \\", r"\midrule"]
+    lines += [" & ".join(cell(v) for v in row) + r" \\" for row in df.itertuples(index=False)]
+    lines += [r"\bottomrule", r"\end{tabular}", ""]
+    text = "\n".join(lines)
+    if output_path:
+        write_if_changed(output_path, text)
+    return text
+
+
+# ----------------------------------------------------------------------------
+# Βιβλίο: κεφάλαια, εισόδοι και μεταγλώττιση
+# ----------------------------------------------------------------------------
+
+_INCLUDE = re.compile(r"^\s*\\include\{([^}]+)\}", re.MULTILINE)
+_GRAPHICS = re.compile(r"\\includegraphics(?:\[[^\]]*\])?\{([^}]+)\}")
+_GRAPHICSPATH = re.compile(r"\\graphicspath\{((?:\{[^}]*\})+)\}")
+_INPUT = re.compile(r"\\input\{([^}]+)\}")
+# Η σειρά αναζήτησης του graphicx για εικόνες χωρίς κατάληξη (xelatex/pdflatex)
+GRAPHICS_EXTENSIONS = (".pdf", ".png", ".jpg", ".jpeg")
+
+
+def chapters(book_dir, main="main.tex"):
+    """Τα κεφάλαια (\\include{…}) του βιβλίου με τη σειρά τους."""
+    with open(os.path.join(book_dir, main), encoding="utf-8") as f:
+        return _INCLUDE.findall(f.read())
+
+
+def _strip_comments(text):
+    return re.sub(r"(?<!\\)%.*", "", text)
+
+
+def chapter_inputs(book_dir, chapter, preamble="preamble.tex"):
+    """
+    Τα αρχεία από τα οποία εξαρτάται ένα κεφάλαιο: το ίδιο, το preamble, τα \\input και οι
+    εικόνες (με τα \\graphicspath του κεφαλαίου). Για εικόνες χωρίς κατάληξη επιστρέφονται
+    όλες οι υποψήφιες του GRAPHICS_EXTENSIONS (π.χ. ένα νέο .pdf δίπλα στο .png αλλάζει την
+    εικόνα του graphicx). Όσα δεν υπάρχουν επιστρέφονται κι αυτά, ώστε η εμφάνισή τους να
+    μετράει ως αλλαγή.
+    """
+    path = os.path.join(book_dir, chapter + ".tex")
+    with open(path, encoding="utf-8") as f:
+        text = _strip_comments(f.read())
+    inputs = [path, os.path.join(book_dir, preamble)]
+    for name in _INPUT.findall(text):
+        inputs.append(os.path.join(book_dir, name if os.path.splitext(name)[1] else name + ".tex"))
+    dirs = [""] + [d for group in _GRAPHICSPATH.findall(text) for d in re.findall(r"\{([^}]*)\}", group)]
+    for name in _GRAPHICS.findall(text):
+        extensions = [""] if os.path.splitext(name)[1].lower() in GRAPHICS_EXTENSIONS else GRAPHICS_EXTENSIONS
+        candidates = [[os.path.join(book_dir, d, name + ext) for ext in extensions] for d in dirs]
+        inputs.extend(next((group for group in candidates if any(map(os.path.exists, group))), candidates[0]))
+    return inputs
+
+
+def inputs_digest(paths, cache):
+    """Ενιαίο hash για μια λίστα αρχείων (τα ανύπαρκτα μετρούν με το όνομά τους)."""
+    parts = [f"{p}:{file_digest(p, cache) if os.path.exists(p) else 'missing'}" for p in paths]
+    return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()
+
+
+def _unit_name(chapter):
+    return os.path.basename(chapter)
+
+
+def write_unit(book_dir, chapter, number, preamble="preamble.tex"):
+    """
+    Αρχείο-περιτύλιγμα build/<κεφάλαιο>.tex για αυτόνομη μεταγλώττιση ενός κεφαλαίου, με
+    το ίδιο preamble και τον ίδιο αριθμό κεφαλαίου όπως στο βιβλίο.
+    """
+    os.makedirs(os.path.join(book_dir, BUILD_DIR), exist_ok=True)
+    content = (f"% Αυτόματο αρχείο (macrocore.report): αυτόνομη μονάδα του κεφαλαίου {chapter}\n"
+               f"\\input{{{os.path.splitext(preamble)[0]}}}\n"
+               "\\begin{document}\n"
+               f"\\setcounter{{chapter}}{{{number - 1}}}\n"
+               f"\\input{{{chapter}}}\n"
+               "\\end{document}\n")
+    path = os.path.join(book_dir, BUILD_DIR, _unit_name(chapter) + ".tex")
+    write_if_changed(path, content)
+    return os.path.relpath(path, book_dir)
+
+
+def _aux_digest(aux_path):
+    if not os.path.exists(aux_path):
+        return None
+    with open(aux_path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def compile_tex(book_dir, tex, output_dir=None, engine="xelatex", max_passes=3, aux_files=None):
+    """
+    Μεταγλωττίζει ένα αρχείο (σχετική διαδρομή από το book_dir) με όσο το δυνατόν λιγότερα
+    περάσματα: νέο πέρασμα μόνο αν κάποιο .aux άλλαξε στο προηγούμενο (με το .aux της
+    προηγούμενης μεταγλώττισης, ένα πέρασμα αρκεί όταν δεν άλλαξε η δομή).
+
+    Επιστρέφει (επιτυχία, περάσματα).
+    """
+    jobname = os.path.splitext(os.path.basename(tex))[0]
+    out_dir = output_dir or os.path.dirname(tex) or "."
+    cmd = [engine, "-interaction=nonstopmode", "-halt-on-error"]
+    if output_dir:
+        cmd.append(f"-output-directory={output_dir}")
+    cmd.append(tex)
+    aux_files = [os.path.join(book_dir, out_dir, jobname + ".aux")] + list(aux_files or [])
+    for passes in range(1, max_passes + 1):
+        before = [_aux_digest(a) for a in aux_files]
+        result = subprocess.run(cmd, cwd=book_dir, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        if result.returncode != 0:
+            return False, passes
+        if [_aux_digest(a) for a in aux_files] == before:
+            break
+    return True, passes
+
+
+def build_report(book_dir, targets=None, jobs=None, force=False, dry_run=False, engine="xelatex",
+                 book=True, main="main.tex"):
+    """
+    Ξαναχτίζει τα κεφάλαια που άλλαξαν (παράλληλα) και, αν χρειάζεται, το πλήρες βιβλίο.
+
+    Επιστρέφει {μονάδα: κατάσταση} με τις καταστάσεις του pipeline (ενημερωμένος,
+    εκτελέστηκε, θα εκτελεστεί, απέτυχε).
+    """
+    units = chapters(book_dir, main)
+    selected = [c for c in units if not targets or _unit_name(c) in targets or c in targets]
+    state_path = os.path.join(book_dir, BUILD_DIR, STATE_FILE)
+    state = {}
+    if os.path.exists(state_path):
+        with open(state_path, encoding="utf-8") as f:
+            state = json.load(f)
+
+    cache = {}
+    digests = {c: inputs_digest(chapter_inputs(book_dir, c), cache) for c in units}
+    stale = [c for c in selected if force or state.get(_unit_name(c)) != digests[c]]
+    book_digest = hashlib.sha256("".join([inputs_digest([os.path.join(book_dir, main)], cache)]
+                                         + [digests[c] for c in units]).encode("utf-8")).hexdigest()
+    rebuild_book = book and (force or state.get("main") != book_digest or
+                             not os.path.exists(os.path.join(book_dir, os.path.splitext(main)[0] + ".pdf")))
+
+    status = {_unit_name(c): "ενημερωμένος" for c in selected}
+    if book:
+        status["main"] = "ενημερωμένος"
+    if dry_run:
+        status.update({_unit_name(c): "θα εκτελεστεί" for c in stale})
+        if rebuild_book:
+            status["main"] = "θα εκτελεστεί"
+        return status
+    if (stale or rebuild_book) and shutil.which(engine) is None:
+        raise FileNotFoundError(f"Δεν βρέθηκε το '{engine}' (τοπική εγκατάσταση TeX).")
+
+    def run(chapter):
+        tex = write_unit(book_dir, chapter, units.index(chapter) + 1)
+        ok, passes = compile_tex(book_dir, tex, BUILD_DIR, engine)
+        print(f"  {_unit_name(chapter):<28} {'εκτελέστηκε' if ok else 'απέτυχε'} ({passes} περάσματα)")
+        return chapter, ok
+
+    with ThreadPoolExecutor(max_workers=jobs or os.cpu_count()) as pool:
+        for chapter, ok in pool.map(run, stale):
+            status[_unit_name(chapter)] = "εκτελέστηκε" if ok else "απέτυχε"
+            if ok:
+                state[_unit_name(chapter)] = digests[chapter]
+
+    if rebuild_book:
+        # Τα .aux ανά κεφάλαιο (\include) ξαναχρησιμοποιούνται από την προηγούμενη μεταγλώττιση
+        aux = [os.path.join(book_dir, c + ".aux") for c in units]
+        ok, passes = compile_tex(book_dir, main, engine=engine, aux_files=aux)
+        print(f"  {'main':<28} {'εκτελέστηκε' if ok else 'απέτυχε'} ({passes} περάσματα)")
+        status["main"] = "εκτελέστηκε" if ok else "απέτυχε"
+        if ok:
+            state["main"] = book_digest
+
+    os.makedirs(os.path.dirname(state_path), exist_ok=True)
+    with open(state_path, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=1, ensure_ascii=False)
+    return status
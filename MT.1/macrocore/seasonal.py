@@ -0,0 +1,204 @@
+# -*- coding: utf-8 -*-
+"""
+Εποχική προσαρμογή (STL) όλων των τριμηνιαίων σειρών πριν από τους ρυθμούς ανάπτυξης
+και το φίλτρο HP
+
+Τα φύλλα του Eurostat δηλώνουν στη σειρά 7 (index 6) αν τα δεδομένα είναι εποχικά
+προσαρμοσμένα ("Seasonally and calendar adjusted data") ή όχι ("Unadjusted data ...").
+Για τα μη προσαρμοσμένα φύλλα εφαρμόζουμε αποσύνθεση STL (statsmodels) σε κάθε σειρά:
+  - Για σειρές επιπέδου (θετικές τιμές) η αποσύνθεση γίνεται στον λογάριθμο
+    (πολλαπλασιαστικό μοντέλο) και επιστρέφουμε exp(log(x) - εποχική).
+  - Διαφορετικά, x - εποχική (προσθετικό μοντέλο).
+
+Το STL τρέχει ανά σειρά και είναι βαρύ σε CPU. Για να μην αντιγράφονται πίνακες προς
+τους workers, ο πίνακας (χρόνος × σειρές) τοποθετείται σε multiprocessing.shared_memory
+και κάθε worker λαμβάνει μόνο τον αριθμό της στήλης· γράφει την εποχική συνιστώσα
+απευθείας σε κοινόχρηστο πίνακα εξόδου.
+
+Το STL με period=4 προϋποθέτει διαδοχικά τρίμηνα. Αν ο δείκτης (αριθμοί περιόδου) έχει
+κενά, π.χ. από το drop_unchanged της φόρτωσης, ο πίνακας απλώνεται πρώτα σε συνεχές εύρος
+περιόδων και τα κενά συμπληρώνονται με την προηγούμενη τιμή (ακριβώς οι τιμές που
+αφαίρεσε το drop_unchanged), ώστε οι εποχικές φάσεις να μη μετατοπίζονται· επιστρέφονται
+μόνο οι αρχικές περίοδοι.
+
+Τα αποτελέσματα αποθηκεύονται σε cache ανά σειρά (κλειδί: hash τιμών και παραμέτρων),
+οπότε ξαναϋπολογίζονται μόνο οι σειρές που άλλαξαν.
+
+Συντάκτης: thodoreskourtales
+"""
+
+import hashlib
+import os
+from multiprocessing import Pool, shared_memory
+
+import numpy as np
+import pandas as pd
+
+from .growth import contiguous_rows
+from .lazy import lazy_import
+
+_stl = lazy_import("statsmodels.tsa.seasonal")
+
+cache_dir = ".seasonal_cache"
+
+# Κατάσταση κάθε worker (συνδέεται στα shared memory blocks μία φορά, στον initializer)
+_worker = {}
+
+
+def is_seasonally_adjusted(label):
+    """
+    Ερμηνεύει την ετικέτα "Seasonal adjustment" του Eurostat.
+    Επιστρέφει False μόνο για μη προσαρμοσμένα δεδομένα ("Unadjusted data ...").
+    """
+    if not isinstance(label, str):
+        return True
+    return not label.strip().lower().startswith("unadjusted")
+
+
+def needs_seasonal_adjustment(*frames):
+    """
+    Επιστρέφει True αν κάποιο από τα DataFrame προέρχεται από μη εποχικά προσαρμοσμένο φύλλο
+    (βλ. df.attrs["seasonal_adjustment"] που ορίζει το load_and_clean_sheet).
+    """
+    return any(not is_seasonally_adjusted(df.attrs.get("seasonal_adjustment")) for df in frames)
+
+
+def _series_key(values, period, robust, multiplicative):
+    """Hash SHA-256 μιας σειράς και των παραμέτρων STL (κλειδί της cache)."""
+    h = hashlib.sha256()
+    h.update(np.ascontiguousarray(values, dtype=float).tobytes())
+    h.update(repr((period, robust, multiplicative)).encode())
+    return h.hexdigest()[:32]
+
+
+def _init_worker(in_name, out_name, shape, period, robust):
+    """Initializer του Pool: σύνδεση με τα shared memory blocks χωρίς αντιγραφή."""
+    shm_in = shared_memory.SharedMemory(name=in_name)
+    shm_out = shared_memory.SharedMemory(name=out_name)
+    _worker["shm"] = (shm_in, shm_out)
+    _worker["in"] = np.ndarray(shape, dtype=float, buffer=shm_in.buf, order="F")
+    _worker["out"] = np.ndarray(shape, dtype=float, buffer=shm_out.buf, order="F")
+    _worker["period"] = period
+    _worker["robust"] = robust
+
+
+def _stl_column(j):
+    """Εκτελεί STL στη στήλη j του κοινόχρηστου πίνακα και γράφει την εποχική συνιστώσα."""
+    result = _stl.STL(_worker["in"][:, j], period=_worker["period"], robust=_worker["robust"]).fit()
+    _worker["out"][:, j] = result.seasonal
+    return j
+
+
+def _stl_block(block, period, robust, workers):
+    """
+    Υπολογίζει την εποχική συνιστώσα κάθε στήλης ενός πίνακα (T × N).
+    Με workers > 1 ο πίνακας μοιράζεται μέσω shared memory σε Pool διεργασιών.
+    """
+    n_cols = block.shape[1]
+    if workers <= 1 or n_cols < 2:
+        seasonal = np.empty_like(block)
+        for j in range(n_cols):
+            seasonal[:, j] = _stl.STL(block[:, j], period=period, robust=robust).fit().seasonal
+        return seasonal
+
+    shm_in = shared_memory.SharedMemory(create=True, size=block.nbytes)
+    shm_out = shared_memory.SharedMemory(create=True, size=block.nbytes)
+    try:
+        shared_in = np.ndarray(block.shape, dtype=float, buffer=shm_in.buf, order="F")
+        shared_in[:] = block
+        shared_out = np.ndarray(block.shape, dtype=float, buffer=shm_out.buf, order="F")
+        with Pool(processes=min(workers, n_cols), initializer=_init_worker,
+                  initargs=(shm_in.name, shm_out.name, block.shape, period, robust)) as pool:
+            for _ in pool.imap_unordered(_stl_column, range(n_cols)):
+                pass
+        seasonal = np.array(shared_out)
+        del shared_in, shared_out
+    finally:
+        shm_in.close()
+        shm_in.unlink()
+        shm_out.close()
+        shm_out.unlink()
+    return seasonal
+
+
+def seasonal_adjust_panel(panel, period=4, robust=True, multiplicative=True, workers=None, use_cache=True):
+    """
+    Εποχική προσαρμογή όλων των στηλών ενός DataFrame (χρόνος × σειρές) με STL.
+
+    Παράμετροι:
+      - panel: DataFrame χωρίς NaN (όπως επιστρέφει το load_and_clean_sheet).
+      - period: περίοδος εποχικότητας (4 για τριμηνιαία δεδομένα).
+      - robust: ανθεκτική (robust) εκδοχή του STL.
+      - multiplicative: αποσύνθεση στον λογάριθμο για σειρές με θετικές τιμές.
+      - workers: πλήθος διεργασιών (προεπιλογή: os.cpu_count()).
+      - use_cache: χρήση της cache ανά σειρά.
+
+    Επιστρέφει DataFrame με τις εποχικά προσαρμοσμένες σειρές (ίδιος δείκτης και στήλες).
+    """
+    values = panel.to_numpy(dtype=float)
+    if np.isnan(values).any():
+        raise ValueError("Η εποχική προσαρμογή απαιτεί σειρές χωρίς NaN.")
+    # Κενά στους αριθμούς περιόδου: συνεχές εύρος, με την προηγούμενη τιμή στα κενά
+    rows = contiguous_rows(panel.index) if pd.api.types.is_integer_dtype(panel.index) else None
+    if rows is not None:
+        full = np.full((rows[-1] + 1, values.shape[1]), np.nan)
+        full[rows] = values
+        values = pd.DataFrame(full).ffill().to_numpy()
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    use_log = np.zeros(values.shape[1], dtype=bool)
+    if multiplicative:
+        use_log = (values > 0).all(axis=0)
+    transformed = np.where(use_log, np.log(np.where(values > 0, values, 1.0)), values)
+
+    seasonal = np.empty_like(transformed)
+    keys = [_series_key(transformed[:, j], period, robust, use_log[j]) for j in range(transformed.shape[1])]
+    missing = []
+    for j, key in enumerate(keys):
+        cache_file = os.path.join(cache_dir, f"stl_{key}.npy")
+        if use_cache and os.path.exists(cache_file):
+            seasonal[:, j] = np.load(cache_file)
+        else:
+            missing.append(j)
+
+    if missing:
+        block = np.asfortranarray(transformed[:, missing])
+        seasonal[:, missing] = _stl_block(block, period, robust, workers)
+        if use_cache:
+            os.makedirs(cache_dir, exist_ok=True)
+            for j in missing:
+                np.save(os.path.join(cache_dir, f"stl_{keys[j]}.npy"), seasonal[:, j])
+
+    adjusted = transformed - seasonal
+    adjusted = np.where(use_log, np.exp(adjusted), adjusted)
+    if rows is not None:
+        adjusted = adjusted[rows]
+    print(f"Εποχική προσαρμογή (STL): {values.shape[1]} σειρές, {len(missing)} νέοι υπολογισμοί, "
+          f"{values.shape[1] - len(missing)} από την cache.")
+    return pd.DataFrame(adjusted, index=panel.index, columns=panel.columns)
+
+
+def seasonal_adjust_frames(frames, **kwargs):
+    """
+    Εποχική προσαρμογή πολλών DataFrame σε ένα πέρασμα.
+
+    Το frames είναι λεξικό {κλειδί: DataFrame}· τα DataFrame με τον ίδιο χρονικό δείκτη
+    συνενώνονται σε έναν πίνακα, ώστε όλες οι σειρές να μοιράζονται το ίδιο Pool.
+    Επιστρέφει λεξικό με τα ίδια κλειδιά και τα προσαρμοσμένα DataFrame.
+    """
+    groups = {}
+    for key, df in frames.items():
+        groups.setdefault(tuple(df.index), []).append(key)
+
+    adjusted = {}
+    for keys in groups.values():
+        panel = pd.concat([frames[key] for key in keys], axis=1, ignore_index=True)
+        result = seasonal_adjust_panel(panel, **kwargs)
+        start = 0
+        for key in keys:
+            width = frames[key].shape[1]
+            adjusted[key] = pd.DataFrame(result.iloc[:, start:start + width].values,
+                                         index=frames[key].index, columns=frames[key].columns)
+            start += width
+    return adjusted
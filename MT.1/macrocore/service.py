@@ -0,0 +1,374 @@
+# -*- coding: utf-8 -*-
+"""
+Τοπική υπηρεσία HTTP (asyncio) για τις προϋπολογισμένες σειρές της βάσης αποτελεσμάτων
+
+Κατά την εκκίνηση όλες οι σειρές της τελευταίας εκτέλεσης (βλ. store) φορτώνονται στη
+μνήμη ως πίνακες numpy, οπότε κάθε αίτημα είναι μια αναζήτηση σε λεξικό και ένα slice με
+np.searchsorted. Ο server είναι γραμμένος πάνω στο asyncio.start_server (HTTP/1.1 με
+keep-alive), χωρίς εξωτερικές βιβλιοθήκες.
+
+Endpoints (μόνο GET):
+  - /catalog                       όλα τα κλειδιά σειρών.
+  - /series?measure=&concept=&geo=&frequency=&filter=&lambda=&start=&end=&format=json|arrow
+                                   οι σειρές που ταιριάζουν, περιορισμένες στο [start, end]
+                                   ("1995-Q1" ή έτος). Το format=arrow απαιτεί pyarrow.
+  - /statistics?name=&measure=&concept=&geo=&frequency=&filter=&lambda=
+                                   βαθμωτά μεγέθη (π.χ. μεταβλητότητες), με τα κριτήρια
+                                   του /series.
+  - /plot/trend.png?measure=       διαγράμματα της Άσκησης 6, με τις ίδιες συναρτήσεις του
+    /plot/cycle.png?measure=       6.py (plot_actual_vs_trend_dual, plot_cyclical_dual).
+
+Όλες οι απαντήσεις έχουν ETag (SHA-1 του περιεχομένου, με κατάληξη -gzip για το
+συμπιεσμένο σώμα) και απαντούν 304 σε If-None-Match (λίστα ετικετών, W/ ή *).
+Οι απαντήσεις κειμένου συμπιέζονται με gzip όταν το επιτρέπει το Accept-Encoding. Οι
+απαντήσεις και τα PNG κρατιούνται σε LRU caches· τα διαγράμματα σχεδιάζονται σε ένα
+νήμα (το matplotlib δεν είναι thread-safe) και ταυτόχρονα αιτήματα για το ίδιο διάγραμμα
+περιμένουν την ίδια σχεδίαση.
+
+Συντάκτης: thodoreskourtales
+"""
+
+import asyncio
+import gzip
+import hashlib
+import importlib.util
+import io
+import json
+import os
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+import pandas as pd
+
+from . import plotting
+from .lazy import lazy_import
+from .periods import parse_quarter_labels, parse_year_labels, quarter_labels
+from .store import open_store, query_series, query_statistics
+
+pa = lazy_import("pyarrow")
+
+# Το 6.py, του οποίου οι συναρτήσεις σχεδίασης χρησιμοποιούνται για τα PNG
+PLOTS_SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "exercise.6", "6.py")
+PLOT_FUNCTIONS = {"trend": "plot_actual_vs_trend_dual", "cycle": "plot_cyclical_dual"}
+# Στήλες των DataFrame του 6.py ανά κωδικό geo
+PLOT_COLUMNS = {"EA": "Euro", "EL": "Ελλάδα"}
+
+KEY_FIELDS = ("measure", "concept", "geo", "frequency", "filter", "lambda")
+MIN_GZIP_BYTES = 1024
+
+
+def load_state(db_path=None, cache_size=512, render_cache_size=64):
+    """
+    Φορτώνει στη μνήμη τις σειρές και τα βαθμωτά μεγέθη της τελευταίας εκτέλεσης.
+    Επιστρέφει το λεξικό κατάστασης της υπηρεσίας.
+    """
+    conn = open_store(db_path)
+    try:
+        long = query_series(conn)
+        statistics = query_statistics(conn)
+    finally:
+        conn.close()
+
+    series = {}
+    for key, group in long.groupby(list(KEY_FIELDS), sort=True):
+        series[key] = (group["period"].to_numpy(dtype=np.int64), group["value"].to_numpy(dtype=float))
+    return {
+        "series": series,
+        "statistics": statistics,
+        "cache": OrderedDict(),
+        "cache_size": cache_size,
+        "renders": OrderedDict(),
+        "render_cache_size": render_cache_size,
+        "render_executor": ThreadPoolExecutor(max_workers=1),
+        "plots": None,
+    }
+
+
+def _lru_get(cache, key):
+    value = cache.get(key)
+    if value is not None:
+        cache.move_to_end(key)
+    return value
+
+
+def _lru_put(cache, key, value, size):
+    cache[key] = value
+    cache.move_to_end(key)
+    while len(cache) > size:
+        cache.popitem(last=False)
+
+
+def _parse_bound(value, frequency):
+    """Όριο περιόδου από "1995-Q1" (τρίμηνα) ή έτος· None αν δεν δόθηκε."""
+    if value is None:
+        return None
+    if frequency == "Q":
+        ordinal = parse_quarter_labels([value])[0]
+        if ordinal < 0:
+            year = parse_year_labels([value])[0]
+            ordinal = year * 4 if year >= 0 else -1
+    else:
+        ordinal = parse_year_labels([value])[0]
+    if ordinal < 0:
+        raise ValueError(f"Μη έγκυρη περίοδος: {value}")
+    return ordinal
+
+
+def _period_labels(periods, frequency):
+    return quarter_labels(periods) if frequency == "Q" else [str(p) for p in periods.tolist()]
+
+
+def _criteria(params):
+    """Τα κριτήρια KEY_FIELDS του αιτήματος (το lambda ως float· ValueError αν δεν είναι αριθμός)."""
+    criteria = {field: params[field] for field in KEY_FIELDS if field in params}
+    if "lambda" in criteria:
+        criteria["lambda"] = float(criteria["lambda"])
+    return criteria
+
+
+def select_series(state, params):
+    """
+    Επιλέγει τις σειρές που ταιριάζουν με τα κριτήρια του αιτήματος και τις περιορίζει στο
+    [start, end]. Επιστρέφει λίστα από (κλειδί, περίοδοι, τιμές).
+    """
+    criteria = _criteria(params)
+    selected = []
+    for key, (periods, values) in state["series"].items():
+        if any(key[KEY_FIELDS.index(field)] != value for field, value in criteria.items()):
+            continue
+        start = _parse_bound(params.get("start"), key[3])
+        end = _parse_bound(params.get("end"), key[3])
+        lo = 0 if start is None else np.searchsorted(periods, start)
+        hi = len(periods) if end is None else np.searchsorted(periods, end, side="right")
+        selected.append((key, periods[lo:hi], values[lo:hi]))
+    return selected
+
+
+def _series_json(selected):
+    payload = [{**dict(zip(KEY_FIELDS, key)),
+                "periods": _period_labels(periods, key[3]),
+                "values": [None if np.isnan(v) else v for v in values.tolist()]}
+               for key, periods, values in selected]
+    return json.dumps(payload, ensure_ascii=False).encode("utf-8")
+
+
+def _series_arrow(selected):
+    """Πίνακας Arrow (IPC stream) σε «μακριά» μορφή: κλειδί, period, value."""
+    columns = {field: [] for field in KEY_FIELDS}
+    periods_all, values_all = [], []
+    for key, periods, values in selected:
+        for field, value in zip(KEY_FIELDS, key):
+            columns[field].extend([value] * len(periods))
+        periods_all.append(periods)
+        values_all.append(values)
+    table = pa.table({**columns,
+                      "period": np.concatenate(periods_all) if periods_all else np.empty(0, np.int64),
+                      "value": np.concatenate(values_all) if values_all else np.empty(0)})
+    sink = io.BytesIO()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue()
+
+
+def _plots_module(state):
+    """Φορτώνει (μία φορά) το 6.py ως module, για τις συναρτήσεις σχεδίασης του."""
+    if state["plots"] is None:
+        os.environ.setdefault("MPLBACKEND", "Agg")
+        spec = importlib.util.spec_from_file_location("exercise6_plots", PLOTS_SCRIPT)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        state["plots"] = module
+    return state["plots"]
+
+
+def _render_plot(state, kind, measure):
+    """Σχεδιάζει ένα διάγραμμα του 6.py σε PNG (στη μνήμη)."""
+    frame = {}
+    for geo, column in PLOT_COLUMNS.items():
+        entry = state["series"].get((measure, "real", geo, "Q", "", 0.0))
+        if entry is None:
+            raise KeyError(measure)
+        frame[column] = pd.Series(entry[1], index=entry[0])
+    df_real = pd.DataFrame(frame).dropna()
+    buffer = io.BytesIO()
+    # Η υπηρεσία σερβίρει πάντα PNG, ανεξάρτητα από τη μορφή των διαγραμμάτων του βιβλίου
+    previous = plotting.settings["format"]
+    plotting.settings["format"] = "png"
+    try:
+        getattr(_plots_module(state), PLOT_FUNCTIONS[kind])(df_real, measure, buffer)
+    finally:
+        plotting.settings["format"] = previous
+    return buffer.getvalue()
+
+
+async def render_png(state, kind, measure):
+    """PNG από την cache ή νέα σχεδίαση· ταυτόχρονα αιτήματα μοιράζονται την ίδια σχεδίαση."""
+    key = (kind, measure)
+    entry = _lru_get(state["renders"], key)
+    if entry is None:
+        loop = asyncio.get_running_loop()
+        entry = loop.run_in_executor(state["render_executor"], _render_plot, state, kind, measure)
+        _lru_put(state["renders"], key, entry, state["render_cache_size"])
+    try:
+        return await entry
+    except Exception:
+        state["renders"].pop(key, None)
+        raise
+
+
+def _response(status, body=b"", content_type="application/json; charset=utf-8", headers=None):
+    return status, {"Content-Type": content_type, **(headers or {})}, body
+
+
+def _error(status, message):
+    return _response(status, json.dumps({"error": message}, ensure_ascii=False).encode("utf-8"))
+
+
+async def _build_response(state, path, params):
+    """Παράγει (status, headers, body) για ένα αίτημα, χωρίς ETag/συμπίεση."""
+    if path == "/catalog":
+        keys = [dict(zip(KEY_FIELDS, key)) for key in state["series"]]
+        return _response(HTTPStatus.OK, json.dumps(keys, ensure_ascii=False).encode("utf-8"))
+
+    if path == "/series":
+        try:
+            selected = select_series(state, params)
+        except ValueError as e:
+            return _error(HTTPStatus.BAD_REQUEST, str(e))
+        if not selected:
+            return _error(HTTPStatus.NOT_FOUND, "Δεν βρέθηκαν σειρές")
+        if params.get("format") == "arrow":
+            if importlib.util.find_spec("pyarrow") is None:
+                return _error(HTTPStatus.NOT_ACCEPTABLE, "Το format=arrow απαιτεί το pyarrow")
+            return _response(HTTPStatus.OK, _series_arrow(selected), "application/vnd.apache.arrow.stream")
+        return _response(HTTPStatus.OK, _series_json(selected))
+
+    if path == "/statistics":
+        try:
+            criteria = _criteria(params)
+        except ValueError as e:
+            return _error(HTTPStatus.BAD_REQUEST, str(e))
+        if "name" in params:
+            criteria["name"] = params["name"]
+        table = state["statistics"]
+        for field, value in criteria.items():
+            table = table[table[field] == value]
+        return _response(HTTPStatus.OK, table.to_json(orient="records", force_ascii=False).encode("utf-8"))
+
+    if path.startswith("/plot/") and path.endswith(".png"):
+        kind = path[len("/plot/"):-len(".png")]
+        if kind not in PLOT_FUNCTIONS or "measure" not in params:
+            return _error(HTTPStatus.NOT_FOUND, "Άγνωστο διάγραμμα")
+        try:
+            png = await render_png(state, kind, params["measure"])
+        except KeyError:
+            return _error(HTTPStatus.NOT_FOUND, f"Δεν υπάρχει πραγματική σειρά για '{params['measure']}'")
+        return _response(HTTPStatus.OK, png, "image/png")
+
+    return _error(HTTPStatus.NOT_FOUND, "Άγνωστο endpoint")
+
+
+def _etag_matches(if_none_match, etag):
+    """
+    Ασθενής σύγκριση (RFC 9110) του ETag με τη λίστα του If-None-Match: ετικέτες
+    χωρισμένες με κόμμα, με προαιρετικό W/, ή "*" για οποιαδήποτε αναπαράσταση.
+    """
+    if not if_none_match:
+        return False
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*":
+            return True
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if tag == etag:
+            return True
+    return False
+
+
+async def handle_request(state, method, target, headers):
+    """
+    Εξυπηρετεί ένα αίτημα: cache απαντήσεων (ανά URL), ETag/304 και συμπίεση gzip.
+    Επιστρέφει (status, headers, body).
+    """
+    if method not in ("GET", "HEAD"):
+        return _error(HTTPStatus.METHOD_NOT_ALLOWED, "Μόνο GET")
+
+    entry = _lru_get(state["cache"], target)
+    if entry is None:
+        url = urlsplit(target)
+        params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        status, response_headers, body = await _build_response(state, url.path, params)
+        etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+        compressed = None
+        if response_headers["Content-Type"] != "image/png" and len(body) >= MIN_GZIP_BYTES:
+            compressed = gzip.compress(body, compresslevel=6)
+        entry = (status, response_headers, body, compressed, etag)
+        if status == HTTPStatus.OK:
+            _lru_put(state["cache"], target, entry, state["cache_size"])
+
+    status, response_headers, body, compressed, etag = entry
+    gzipped = compressed is not None and "gzip" in headers.get("accept-encoding", "")
+    if gzipped:
+        # Διαφορετική αναπαράσταση (Vary: Accept-Encoding), άρα και διαφορετικό ETag
+        etag = etag[:-1] + '-gzip"'
+    response_headers = {**response_headers, "ETag": etag, "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+    if status == HTTPStatus.OK and _etag_matches(headers.get("if-none-match"), etag):
+        return HTTPStatus.NOT_MODIFIED, {"ETag": etag, "Vary": "Accept-Encoding"}, b""
+    if gzipped:
+        response_headers["Content-Encoding"] = "gzip"
+        body = compressed
+    if method == "HEAD":
+        response_headers["Content-Length"] = str(len(body))
+        body = b""
+    return status, response_headers, body
+
+
+async def _handle_connection(state, reader, writer):
+    """Μία σύνδεση HTTP/1.1 (keep-alive)· τα αιτήματα εξυπηρετούνται με τη σειρά."""
+    try:
+        while True:
+            request_line = await reader.readline()
+            if not request_line.strip():
+                break
+            method, target, version = request_line.decode("latin-1").split()
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+            if int(headers.get("content-length", 0) or 0):
+                await reader.readexactly(int(headers["content-length"]))
+
+            try:
+                status, response_headers, body = await handle_request(state, method, target, headers)
+            except Exception as e:
+                # Σφάλμα σχεδίασης/υπολογισμού: απάντηση 500 αντί για κλείσιμο της σύνδεσης
+                print(f"Σφάλμα στο αίτημα {target}: {type(e).__name__}: {e}")
+                status, response_headers, body = _error(HTTPStatus.INTERNAL_SERVER_ERROR, f"{type(e).__name__}: {e}")
+            keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+            response_headers.setdefault("Content-Length", str(len(body)))
+            response_headers["Connection"] = "keep-alive" if keep_alive else "close"
+            head = f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            head += "".join(f"{name}: {value}\r\n" for name, value in response_headers.items())
+            writer.write(head.encode("latin-1") + b"\r\n" + body)
+            await writer.drain()
+            if not keep_alive:
+                break
+    except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+        pass
+    finally:
+        writer.close()
+
+
+async def serve(state, host="127.0.0.1", port=8050):
+    """Εκκινεί τον server και εξυπηρετεί μέχρι να διακοπεί."""
+    server = await asyncio.start_server(lambda r, w: _handle_connection(state, r, w), host, port)
+    print(f"Εξυπηρέτηση {len(state['series'])} σειρών στο http://{host}:{port}/catalog")
+    async with server:
+        await server.serve_forever()
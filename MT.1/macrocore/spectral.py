@@ -0,0 +1,193 @@
+# -*- coding: utf-8 -*-
+"""
+Φασματική ανάλυση των κυκλικών συνιστωσών (ή των ρυθμών ανάπτυξης)
+
+Για όλες τις σειρές ενός πίνακα (χρόνος × σειρές) υπολογίζουμε με μία κλήση
+scipy.signal ανά μέθοδο (σε 2-D πίνακα, κατά μήκος του άξονα του χρόνου):
+  1. Το περιοδόγραμμα.
+  2. Το φάσμα Welch.
+  3. Τη συνοχή (coherence) κάθε σειράς με το ΑΕΠ της ίδιας περιοχής.
+  4. Το ποσοστό της διακύμανσης που ανήκει στη ζώνη του οικονομικού κύκλου
+     (περίοδοι 6–32 τριμήνων).
+
+Είσοδος μπορεί να είναι το cycles_all της main() στο 6.py
+({μεταβλητή: {περιοχή: Series}}) ή τα growth DataFrame του compute_growth στο 5.py
+({μέτρο: DataFrame με στήλες περιοχές}).
+
+Τα αποτελέσματα αποθηκεύονται σε cache στον δίσκο (αρχεία .npz), με κλειδί το hash
+των δεδομένων εισόδου και των παραμέτρων, ώστε μια επανάληψη με τα ίδια δεδομένα
+να μην ξαναϋπολογίζει τίποτα.
+
+Συντάκτης: thodoreskourtales
+"""
+
+import hashlib
+import os
+
+import numpy as np
+import pandas as pd
+
+from .lazy import lazy_import
+from .plotting import save_figure
+
+plt = lazy_import("matplotlib.pyplot")
+signal = lazy_import("scipy.signal")
+
+# Ζώνη οικονομικού κύκλου σε τρίμηνα (Burns–Mitchell: 1.5 έως 8 έτη)
+BUSINESS_CYCLE_BAND = (6, 32)
+
+cache_dir = ".spectral_cache"
+
+
+def panel_from_nested(nested):
+    """
+    Μετατρέπει ένα λεξικό {μεταβλητή: {περιοχή: Series}} ή {μεταβλητή: DataFrame}
+    σε ένα DataFrame (χρόνος × (μεταβλητή, περιοχή)) με κοινό δείγμα περιόδων.
+    """
+    frames = {}
+    for var, item in nested.items():
+        if isinstance(item, pd.DataFrame):
+            for region in item.columns:
+                frames[(var, region)] = item[region]
+        else:
+            for region, series in item.items():
+                frames[(var, region)] = series
+    return pd.concat(frames, axis=1).dropna()
+
+
+def _input_hash(values, **params):
+    """Hash SHA-256 των τιμών του πίνακα και των παραμέτρων (κλειδί της cache)."""
+    h = hashlib.sha256()
+    values = np.ascontiguousarray(values, dtype=float)
+    h.update(str(values.shape).encode())
+    h.update(values.tobytes())
+    h.update(repr(sorted(params.items())).encode())
+    return h.hexdigest()[:32]
+
+
+def band_share(freqs, power, band=BUSINESS_CYCLE_BAND):
+    """
+    Επιστρέφει το ποσοστό της φασματικής ισχύος (για κάθε σειρά) που ανήκει σε περιόδους
+    μεταξύ band[0] και band[1] τριμήνων. Η μηδενική συχνότητα αγνοείται.
+    """
+    low, high = 1.0 / band[1], 1.0 / band[0]
+    in_band = (freqs >= low) & (freqs <= high)
+    positive = freqs > 0
+    total = power[:, positive].sum(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return power[:, in_band].sum(axis=1) / total
+
+
+def _band_mean(freqs, values, band=BUSINESS_CYCLE_BAND):
+    """Μέση τιμή (π.χ. της συνοχής) στη ζώνη του οικονομικού κύκλου για κάθε σειρά."""
+    low, high = 1.0 / band[1], 1.0 / band[0]
+    in_band = (freqs >= low) & (freqs <= high)
+    return values[:, in_band].mean(axis=1)
+
+
+def compute_spectra(x, y, nperseg=None):
+    """
+    Υπολογίζει περιοδόγραμμα, φάσμα Welch και συνοχή για όλες τις στήλες του x.
+
+    Παράμετροι:
+      - x: πίνακας (T × N) με τις σειρές.
+      - y: πίνακας (T × N) με τη σειρά αναφοράς (ΑΕΠ) που αντιστοιχεί σε κάθε στήλη του x.
+      - nperseg: μήκος τμήματος για Welch/coherence (προεπιλογή: min(64, T // 2)).
+
+    Οι συχνότητες είναι σε κύκλους ανά τρίμηνο (fs = 1), οπότε περίοδος = 1 / συχνότητα.
+    Επιστρέφει λεξικό με πίνακες NumPy (σειρές στις γραμμές).
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = x.shape[0]
+    if nperseg is None:
+        nperseg = min(64, n // 2)
+
+    f_per, p_per = signal.periodogram(x, fs=1.0, detrend="constant", axis=0)
+    f_welch, p_welch = signal.welch(x, fs=1.0, nperseg=nperseg, detrend="constant", axis=0)
+    f_coh, coh = signal.coherence(x, y, fs=1.0, nperseg=nperseg, detrend="constant", axis=0)
+
+    return {
+        "freq_periodogram": f_per,
+        "periodogram": p_per.T,
+        "freq_welch": f_welch,
+        "welch": p_welch.T,
+        "coherence": coh.T,
+        "band_share_periodogram": band_share(f_per, p_per.T),
+        "band_share_welch": band_share(f_welch, p_welch.T),
+        "band_coherence": _band_mean(f_coh, coh.T),
+    }
+
+
+def spectral_analysis(nested, reference="ΑΕΠ", nperseg=None, use_cache=True):
+    """
+    Φασματική ανάλυση όλων των σειρών ενός λεξικού (βλ. panel_from_nested), με cache στον δίσκο.
+
+    Η συνοχή υπολογίζεται για κάθε σειρά ως προς τη σειρά `reference` της ίδιας περιοχής.
+    Επιστρέφει (columns, results), όπου columns η λίστα (μεταβλητή, περιοχή) για κάθε
+    γραμμή των πινάκων του results.
+    """
+    if reference not in nested:
+        raise KeyError(f"Η μεταβλητή αναφοράς '{reference}' δεν υπάρχει στα δεδομένα.")
+    panel = panel_from_nested(nested)
+    columns = list(panel.columns)
+    x = panel.values
+    y = panel[[(reference, region) for _, region in columns]].values
+
+    key = _input_hash(x, columns=[f"{v}|{r}" for v, r in columns], reference=reference, nperseg=nperseg)
+    cache_file = os.path.join(cache_dir, f"spectra_{key}.npz")
+    if use_cache and os.path.exists(cache_file):
+        with np.load(cache_file) as cached:
+            results = {name: cached[name] for name in cached.files}
+        print(f"Φασματική ανάλυση: φορτώθηκε από την cache ({cache_file}).")
+        return columns, results
+
+    results = compute_spectra(x, y, nperseg=nperseg)
+    if use_cache:
+        os.makedirs(cache_dir, exist_ok=True)
+        np.savez(cache_file, **results)
+    return columns, results
+
+
+def spectral_summary_table(columns, results):
+    """
+    Επιστρέφει DataFrame με, για κάθε (μεταβλητή, περιοχή), το ποσοστό διακύμανσης στη
+    ζώνη του κύκλου (περιοδόγραμμα και Welch) και τη μέση συνοχή με το ΑΕΠ στη ζώνη.
+    """
+    table = pd.DataFrame({
+        "Ζώνη κύκλου (περιοδόγραμμα)": results["band_share_periodogram"],
+        "Ζώνη κύκλου (Welch)": results["band_share_welch"],
+        "Συνοχή με ΑΕΠ (ζώνη κύκλου)": results["band_coherence"],
+    }, index=pd.MultiIndex.from_tuples(columns, names=["Μεταβλητή", "Περιοχή"]))
+    return table
+
+
+def plot_spectra_dual(columns, results, region, filename):
+    """
+    Σχεδιάζει (2 υποπλοτ) το φάσμα Welch και τη συνοχή με το ΑΕΠ όλων των μεταβλητών μιας
+    περιοχής, με σκιασμένη τη ζώνη του οικονομικού κύκλου (6–32 τρίμηνα).
+    """
+    freqs = results["freq_welch"]
+    low, high = 1.0 / BUSINESS_CYCLE_BAND[1], 1.0 / BUSINESS_CYCLE_BAND[0]
+
+    fig, axs = plt.subplots(2, 1, figsize=(14, 8), sharex=True)
+    for j, (var, reg) in enumerate(columns):
+        if reg != region:
+            continue
+        axs[0].semilogy(freqs[1:], results["welch"][j, 1:], linewidth=2, label=var)
+        axs[1].plot(freqs[1:], results["coherence"][j, 1:], linewidth=2, label=var)
+
+    for ax in axs:
+        ax.axvspan(low, high, color="grey", alpha=0.2, label="Ζώνη κύκλου (6–32 τρίμηνα)")
+        ax.legend(fontsize=12)
+    axs[0].set_title(f"Φάσμα Welch ({region})", fontsize=14)
+    axs[0].set_ylabel("Φασματική πυκνότητα", fontsize=12)
+    axs[1].set_title(f"Συνοχή με το ΑΕΠ ({region})", fontsize=14)
+    axs[1].set_ylabel("Coherence", fontsize=12)
+    axs[1].set_xlabel("Συχνότητα (κύκλοι ανά τρίμηνο)", fontsize=12)
+
+    fig.suptitle(f"Φασματική Ανάλυση Κυκλικών Συνιστωσών ({region})", fontsize=16)
+    plt.tight_layout(rect=[0, 0.03, 1, 0.95])
+    filename = save_figure(fig, filename, dpi=300)
+    plt.close()
+    print(f"Αποθηκεύτηκε το φασματικό διάγραμμα για {region} ως: {filename}")
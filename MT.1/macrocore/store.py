@@ -0,0 +1,216 @@
+# -*- coding: utf-8 -*-
+"""
+Μόνιμη αποθήκευση όλων των παραγόμενων σειρών σε τοπική βάση SQLite
+
+Κάθε εκτέλεση ενός script καταγράφεται ως run (με hash των αρχείων εισόδου ως «vintage»)
+και κάθε παραγόμενη σειρά (πραγματική, αποπληθωριστής, ρυθμοί, τάση, κυκλική…) αποθηκεύεται
+με κλειδί (measure, concept, geo, frequency, filter, λ, run_id). Έτσι οι αναφορές μπορούν να
+διαβάζουν έτοιμες σειρές σε χιλιοστά του δευτερολέπτου χωρίς επανεκτέλεση, και κρατιέται το
+ιστορικό ανάμεσα σε διαφορετικές εκδόσεις των δεδομένων.
+
+Πίνακες:
+  - runs:         run_id, script, started_at, vintage.
+  - series:       series_id και το κλειδί της σειράς (μοναδικό ανά run).
+  - observations: (series_id, period, value)· period είναι ο ακέραιος αριθμός περιόδου
+                  (τρίμηνα, βλ. periods) ή το έτος.
+  - statistics:   βαθμωτά μεγέθη ανά σειρά (π.χ. μεταβλητότητα της κυκλικής συνιστώσας).
+
+Χρήση από τα scripts:
+    conn, run_id = open_run(args.results_db, "6.py", inputs=[excel_file])
+    write_frame(conn, run_id, df_real, "ΑΕΠ", "real", "Q")
+    ...
+    close_run(conn)
+
+Ερωτήματα:
+    load_series(conn, "ΑΕΠ", "cycle", "EL", filter="HP", lam=1600)
+    query_series(conn, concept="growth_real", geo="EA")
+
+Συντάκτης: thodoreskourtales
+"""
+
+import datetime
+import os
+import sqlite3
+
+import numpy as np
+import pandas as pd
+
+from .pipeline import file_digest
+
+# MT.1/results.sqlite
+default_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "results.sqlite")
+
+# Ονόματα στηλών των scripts -> κωδικοί geo του Eurostat
+GEO_CODES = {"Euro": "EA", "Greece": "EL", "Ελλάδα": "EL"}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id     INTEGER PRIMARY KEY,
+    script     TEXT NOT NULL,
+    started_at TEXT NOT NULL,
+    vintage    TEXT
+);
+CREATE TABLE IF NOT EXISTS series (
+    series_id INTEGER PRIMARY KEY,
+    run_id    INTEGER NOT NULL REFERENCES runs(run_id) ON DELETE CASCADE,
+    measure   TEXT NOT NULL,
+    concept   TEXT NOT NULL,
+    geo       TEXT NOT NULL,
+    frequency TEXT NOT NULL,
+    filter    TEXT NOT NULL DEFAULT '',
+    lambda    REAL NOT NULL DEFAULT 0,
+    UNIQUE (run_id, measure, concept, geo, frequency, filter, lambda)
+);
+CREATE INDEX IF NOT EXISTS series_key ON series (measure, concept, geo, frequency, filter, lambda, run_id);
+CREATE TABLE IF NOT EXISTS observations (
+    series_id INTEGER NOT NULL REFERENCES series(series_id) ON DELETE CASCADE,
+    period    INTEGER NOT NULL,
+    value     REAL,
+    PRIMARY KEY (series_id, period)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS statistics (
+    series_id INTEGER NOT NULL REFERENCES series(series_id) ON DELETE CASCADE,
+    name      TEXT NOT NULL,
+    value     REAL,
+    PRIMARY KEY (series_id, name)
+) WITHOUT ROWID;
+"""
+
+
+def open_store(path=None):
+    """Ανοίγει (ή δημιουργεί) τη βάση και επιστρέφει τη σύνδεση sqlite3."""
+    # Τα scripts του pipeline γράφουν παράλληλα· κάθε γραφή είναι σύντομη συναλλαγή
+    conn = sqlite3.connect(path or default_path, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA foreign_keys=ON")
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+def start_run(conn, script, inputs=()):
+    """Καταγράφει μια νέα εκτέλεση· το vintage είναι το hash των αρχείων εισόδου."""
+    vintage = None
+    if inputs:
+        cache = {}
+        vintage = ",".join(file_digest(path, cache)[:16] for path in inputs if os.path.exists(path))
+    started_at = datetime.datetime.now().isoformat(timespec="seconds")
+    cur = conn.execute("INSERT INTO runs (script, started_at, vintage) VALUES (?, ?, ?)",
+                       (script, started_at, vintage))
+    conn.commit()
+    return cur.lastrowid
+
+
+def open_run(path, script, inputs=()):
+    """
+    Ανοίγει τη βάση και ξεκινά ένα run. Επιστρέφει (conn, run_id) ή (None, None) αν path
+    είναι κενό (π.χ. --no-store), ώστε τα scripts να ελέγχουν απλώς `if conn`.
+    """
+    if not path:
+        return None, None
+    conn = open_store(path)
+    return conn, start_run(conn, script, inputs)
+
+
+def close_run(conn):
+    """Ολοκληρώνει τη συναλλαγή του run και κλείνει τη σύνδεση."""
+    if conn is not None:
+        conn.commit()
+        conn.close()
+
+
+def _series_id(conn, run_id, measure, concept, geo, frequency, filter, lam):
+    cur = conn.execute(
+        "INSERT OR IGNORE INTO series (run_id, measure, concept, geo, frequency, filter, lambda) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?)", (run_id, measure, concept, geo, frequency, filter, float(lam)))
+    if cur.rowcount:
+        return cur.lastrowid
+    return conn.execute(
+        "SELECT series_id FROM series WHERE run_id=? AND measure=? AND concept=? AND geo=? "
+        "AND frequency=? AND filter=? AND lambda=?",
+        (run_id, measure, concept, geo, frequency, filter, float(lam))).fetchone()[0]
+
+
+def write_series(conn, run_id, values, periods, measure, concept, geo, frequency, filter="", lam=0.0):
+    """Αποθηκεύει μία σειρά (πίνακες τιμών και αριθμών περιόδου) με ένα executemany."""
+    sid = _series_id(conn, run_id, measure, concept, geo, frequency, filter, lam)
+    values = np.asarray(values, dtype=float)
+    periods = np.asarray(periods, dtype=np.int64)
+    rows = zip([sid] * len(values), periods.tolist(),
+               [None if np.isnan(v) else v for v in values.tolist()])
+    conn.executemany("INSERT OR REPLACE INTO observations (series_id, period, value) VALUES (?, ?, ?)", rows)
+    return sid
+
+
+def write_frame(conn, run_id, frame, measure, concept, frequency, filter="", lam=0.0):
+    """
+    Αποθηκεύει όλες τις στήλες (περιοχές) ενός DataFrame με ακέραιο δείκτη περιόδων.
+    Τα ονόματα στηλών μετατρέπονται σε κωδικούς geo μέσω του GEO_CODES.
+    """
+    periods = frame.index.to_numpy()
+    for column in frame.columns:
+        write_series(conn, run_id, frame[column].to_numpy(), periods, measure, concept,
+                     GEO_CODES.get(column, column), frequency, filter, lam)
+    conn.commit()
+
+
+def write_statistic(conn, run_id, measure, concept, geo, frequency, name, value, filter="", lam=0.0):
+    """Αποθηκεύει ένα βαθμωτό μέγεθος (π.χ. "std") για τη σειρά με το δοσμένο κλειδί."""
+    sid = _series_id(conn, run_id, measure, concept, GEO_CODES.get(geo, geo), frequency, filter, lam)
+    conn.execute("INSERT OR REPLACE INTO statistics (series_id, name, value) VALUES (?, ?, ?)",
+                 (sid, name, float(value)))
+
+
+def _where(measure, concept, geo, frequency, filter, lam, run_id):
+    clauses, params = [], []
+    for column, value in (("measure", measure), ("concept", concept), ("geo", geo),
+                          ("frequency", frequency), ("filter", filter), ("lambda", lam)):
+        if value is not None:
+            clauses.append(f"s.{column} = ?")
+            params.append(float(value) if column == "lambda" else value)
+    if run_id is None:
+        # Τελευταία εκτέλεση για κάθε κλειδί σειράς (αξιοποιεί το ευρετήριο series_key)
+        clauses.append("s.run_id = (SELECT MAX(s2.run_id) FROM series s2 WHERE s2.measure = s.measure "
+                       "AND s2.concept = s.concept AND s2.geo = s.geo AND s2.frequency = s.frequency "
+                       "AND s2.filter = s.filter AND s2.lambda = s.lambda)")
+    else:
+        clauses.append("s.run_id = ?")
+        params.append(run_id)
+    return " AND ".join(clauses), params
+
+
+def query_series(conn, measure=None, concept=None, geo=None, frequency=None, filter=None, lam=None, run_id=None):
+    """
+    Επιστρέφει σε «μακριά» μορφή (DataFrame) τις παρατηρήσεις όλων των σειρών που ταιριάζουν.
+    Τα κριτήρια που είναι None δεν περιορίζουν· με run_id=None επιλέγεται η τελευταία
+    εκτέλεση για κάθε σειρά.
+    """
+    where, params = _where(measure, concept, geo, frequency, filter, lam, run_id)
+    sql = ("SELECT s.run_id, s.measure, s.concept, s.geo, s.frequency, s.filter, s.lambda, o.period, o.value "
+           f"FROM series s JOIN observations o ON o.series_id = s.series_id WHERE {where} "
+           "ORDER BY s.measure, s.concept, s.geo, o.period")
+    return pd.read_sql_query(sql, conn, params=params)
+
+
+def load_series(conn, measure, concept, geo, frequency="Q", filter="", lam=0.0, run_id=None):
+    """Μία σειρά ως pd.Series με δείκτη τους αριθμούς περιόδου."""
+    long = query_series(conn, measure, concept, GEO_CODES.get(geo, geo), frequency, filter, lam, run_id)
+    return pd.Series(long["value"].to_numpy(), index=pd.Index(long["period"].to_numpy(), name="period"),
+                     name=f"{measure} {concept} {geo}")
+
+
+def query_statistics(conn, name=None, measure=None, concept=None, geo=None, frequency=None, filter=None,
+                     lam=None, run_id=None):
+    """Βαθμωτά μεγέθη (π.χ. μεταβλητότητες) σε DataFrame, με τα ίδια κριτήρια με το query_series."""
+    where, params = _where(measure, concept, geo, frequency, filter, lam, run_id)
+    if name is not None:
+        where += " AND t.name = ?"
+        params.append(name)
+    sql = ("SELECT s.run_id, s.measure, s.concept, s.geo, s.frequency, s.filter, s.lambda, t.name, t.value "
+           f"FROM series s JOIN statistics t ON t.series_id = s.series_id WHERE {where} "
+           "ORDER BY s.measure, s.geo, t.name")
+    return pd.read_sql_query(sql, conn, params=params)
+
+
+def list_runs(conn):
+    """Όλες οι καταγεγραμμένες εκτελέσεις (ιστορικό vintages)."""
+    return pd.read_sql_query("SELECT * FROM runs ORDER BY run_id", conn)
@@ -0,0 +1,207 @@
+# -*- coding: utf-8 -*-
+"""
+Έλεγχος λογιστικών ταυτοτήτων και ακεραιότητας των φύλλων Eurostat κατά τη φόρτωση
+
+Όλα τα φύλλα που χρειάζονται οι έλεγχοι διαβάζονται μία φορά και στοιβάζονται σε έναν
+πίνακα (φύλλα × περίοδοι × περιοχές), ώστε κάθε έλεγχος να είναι μία πράξη πινάκων για
+όλες τις περιοχές και περιόδους:
+  - layout:     ίδιες ετικέτες περιόδων σε όλα τα φύλλα (αλλιώς το αρχείο είναι χαλασμένο).
+  - identity:   ΑΕΠ = C + G + I + X − M σε τρέχουσες τιμές (σχετική απόκλιση).
+  - deflator:   συνέπεια ονομαστικής σειράς, όγκου και αποπληθωριστή μεταξύ φύλλων:
+                Δlog(ονομαστική) − Δlog(όγκος) − Δlog(αποπληθωριστής) ≈ 0.
+  - negative:   αρνητικές τιμές σε σειρές επιπέδου.
+  - gap:        ελλείπουσες τιμές (":") ανάμεσα σε διαθέσιμες τιμές.
+  - empty:      σειρά χωρίς καμία τιμή.
+
+Τα layout, identity, deflator και negative είναι σφάλματα· τα gap και empty προειδοποιήσεις.
+Το validate_workbook σηκώνει ValidationError όταν υπάρχει σφάλμα, πριν ξεκινήσουν οι
+υπολογισμοί (φίλτρα, διαγράμματα).
+
+Συντάκτης: thodoreskourtales
+"""
+
+import numpy as np
+import pandas as pd
+
+from .loading import clean_cell
+from .periods import parse_quarter_labels, parse_year_labels, quarter_labels
+
+# Θέσεις (index) της σειράς ετικετών περιόδων και των σειρών Ευρωζώνη/Ελλάδα ανά συχνότητα
+LAYOUTS = {
+    "Q": {"labels_row": 9, "rows": (11, 12)},
+    "A": {"labels_row": 8, "rows": (10, 11)},
+}
+GEOS = ("Euro", "Greece")
+
+# Η αρίθμηση των φύλλων τρεχουσών τιμών είναι ίδια στα δύο αρχεία (Sheet 40–78).
+EXPENDITURE_IDENTITY = {
+    "name": "GDP = C + G + I + X - M",
+    "total": "Sheet 40",                                       # ΑΕΠ
+    "plus": ("Sheet 46", "Sheet 43", "Sheet 50", "Sheet 55"),  # C (νοικοκυριά & ΜΚΙ), G, I (ακαθ. σχηματισμός κεφαλαίου), X
+    "minus": ("Sheet 58",),                                    # M
+}
+
+# (ονομαστική, όγκος, αποπληθωριστής) ανά μεταβλητή:
+#   - Annual_Data.xlsx: όγκος = Sheet n+39 (chain linked, million euro), αποπληθωριστής = Sheet n+78.
+#   - Quarterly_Data.xlsx: όγκος = Sheet n−39 (index 2015=100), αποπληθωριστής = Sheet n+39.
+_NOMINAL_SHEETS = (40, 42, 43, 47, 51, 55, 58)
+DEFLATOR_TRIPLETS = {
+    "A": [(f"Sheet {n}", f"Sheet {n + 39}", f"Sheet {n + 78}") for n in _NOMINAL_SHEETS],
+    "Q": [(f"Sheet {n}", f"Sheet {n - 39}", f"Sheet {n + 39}") for n in _NOMINAL_SHEETS],
+}
+
+# Ανοχές: σχετική απόκλιση της ταυτότητας και απόκλιση (log) ανά περίοδο για τον αποπληθωριστή.
+# Στα τριμηνιαία δεδομένα της Ευρωζώνης ο δείκτης όγκου είναι συνάθροιση χωρών (chain-linking),
+# οπότε η τριμηνιαία απόκλιση φτάνει το ~2%· ένα χαλασμένο αρχείο δίνει πολύ μεγαλύτερες.
+TOLERANCES = {
+    "A": {"identity": 1e-3, "deflator": 1e-3},
+    "Q": {"identity": 1e-3, "deflator": 5e-2},
+}
+
+ERROR_CHECKS = ("layout", "identity", "deflator", "negative")
+
+
+class ValidationError(ValueError):
+    """Το αρχείο απέτυχε στους ελέγχους· το report είναι η συνοπτική αναφορά παραβιάσεων."""
+
+    def __init__(self, excel_file, report):
+        errors = report[report["severity"] == "error"]
+        super().__init__(f"Το '{excel_file}' απέτυχε σε {len(errors)} ελέγχους:\n{errors.to_string(index=False)}")
+        self.report = report
+
+
+def read_panel(excel_file, sheets, frequency, start_year=1995):
+    """
+    Διαβάζει τα φύλλα (μία ανάγνωση του αρχείου) χωρίς συμπλήρωση ελλειπουσών τιμών.
+
+    Επιστρέφει (ordinals, values, layout_errors):
+      - ordinals: αριθμοί περιόδων (τρίμηνα ή έτη) από το start_year και μετά.
+      - values: πίνακας (φύλλα × περίοδοι × 2) με NaN για ":".
+      - layout_errors: τα φύλλα των οποίων οι ετικέτες περιόδων διαφέρουν από του πρώτου.
+    """
+    layout = LAYOUTS[frequency]
+    parse = parse_quarter_labels if frequency == "Q" else parse_year_labels
+    first = start_year * 4 if frequency == "Q" else start_year
+    raw = pd.read_excel(excel_file, sheet_name=list(sheets), header=None)
+
+    reference = parse(raw[sheets[0]].iloc[layout["labels_row"]].values)
+    cols = np.flatnonzero(reference >= first)
+    values = np.full((len(sheets), len(cols), len(GEOS)), np.nan)
+    layout_errors = []
+    for k, sheet in enumerate(sheets):
+        df = raw[sheet]
+        labels = parse(df.iloc[layout["labels_row"]].values)
+        if len(labels) != len(reference) or not np.array_equal(labels[cols], reference[cols]):
+            layout_errors.append(sheet)
+            continue
+        values[k] = df.iloc[list(layout["rows"]), cols].map(clean_cell).to_numpy(dtype=float).T
+    return reference[cols], values, layout_errors
+
+
+def _labels(ordinals, frequency):
+    return quarter_labels(ordinals) if frequency == "Q" else [str(p) for p in np.asarray(ordinals).tolist()]
+
+
+def _summarize(check, subjects, mask, deviation, ordinals, frequency):
+    """
+    Συνοπτική αναφορά: μία γραμμή ανά (έλεγχος, αντικείμενο, περιοχή) με πλήθος παραβιάσεων,
+    πρώτη/τελευταία περίοδο και τη χειρότερη απόκλιση.
+    mask, deviation: πίνακες (αντικείμενα × περίοδοι × περιοχές).
+    """
+    rows = []
+    counts = mask.sum(axis=1)
+    for k, g in zip(*np.nonzero(counts)):
+        periods = np.flatnonzero(mask[k, :, g])
+        worst = np.nanmax(np.abs(deviation[k, periods, g])) if deviation is not None else np.nan
+        first, last = _labels(ordinals[[periods[0], periods[-1]]], frequency) if check != "empty" else ("", "")
+        rows.append({
+            "check": check,
+            "severity": "error" if check in ERROR_CHECKS else "warning",
+            "subject": subjects[k],
+            "geo": GEOS[g],
+            "count": int(counts[k, g]),
+            "first": first,
+            "last": last,
+            "worst": worst,
+        })
+    return rows
+
+
+def validate_panel(ordinals, values, sheets, frequency, identity=EXPENDITURE_IDENTITY, triplets=None,
+                   level_sheets=None, tolerances=None):
+    """
+    Εκτελεί όλους τους ελέγχους πάνω σε ήδη φορτωμένο πίνακα (βλ. read_panel).
+    Επιστρέφει τη συνοπτική αναφορά ως DataFrame (κενό αν δεν βρέθηκε τίποτα).
+    """
+    tolerances = tolerances or TOLERANCES[frequency]
+    triplets = DEFLATOR_TRIPLETS[frequency] if triplets is None else triplets
+    index = {sheet: k for k, sheet in enumerate(sheets)}
+    rows = []
+
+    # Ελλείπουσες τιμές: κενές σειρές και κενά ανάμεσα στην πρώτη και την τελευταία τιμή
+    valid = ~np.isnan(values)
+    empty = ~valid.any(axis=1, keepdims=True)
+    inside = (np.cumsum(valid, axis=1) > 0) & (np.cumsum(valid[:, ::-1], axis=1)[:, ::-1] > 0)
+    rows += _summarize("empty", sheets, empty, None, ordinals, frequency)
+    rows += _summarize("gap", sheets, ~valid & inside, None, ordinals, frequency)
+
+    # Αρνητικές τιμές στις σειρές επιπέδου (όλα τα φύλλα εκτός αν δοθεί λίστα)
+    level = np.array([sheet in level_sheets for sheet in sheets]) if level_sheets is not None \
+        else np.ones(len(sheets), dtype=bool)
+    with np.errstate(invalid="ignore"):
+        negative = (values < 0) & level[:, None, None]
+    rows += _summarize("negative", sheets, negative, values, ordinals, frequency)
+
+    # ΑΕΠ = C + G + I + X − M
+    if identity and all(s in index for s in (identity["total"],) + identity["plus"] + identity["minus"]):
+        total = values[index[identity["total"]]]
+        components = values[[index[s] for s in identity["plus"]]].sum(axis=0) \
+            - values[[index[s] for s in identity["minus"]]].sum(axis=0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            deviation = ((total - components) / np.abs(total))[None]
+            mask = np.abs(deviation) > tolerances["identity"]
+        rows += _summarize("identity", [identity["name"]], mask, deviation, ordinals, frequency)
+
+    # Δlog(ονομαστική) − Δlog(όγκος) − Δlog(αποπληθωριστής), για όλες τις τριάδες μαζί
+    triplets = [t for t in triplets if all(s in index for s in t)]
+    if triplets:
+        nominal, volume, deflator = (values[[index[t[i]] for t in triplets]] for i in range(3))
+        with np.errstate(invalid="ignore", divide="ignore"):
+            residual = np.diff(np.log(nominal) - np.log(volume) - np.log(deflator), axis=1)
+            mask = np.abs(residual) > tolerances["deflator"]
+        subjects = [f"{n} / {v} / {d}" for n, v, d in triplets]
+        rows += _summarize("deflator", subjects, mask, residual, ordinals[1:], frequency)
+
+    return pd.DataFrame(rows, columns=["check", "severity", "subject", "geo", "count", "first", "last", "worst"])
+
+
+def required_sheets(frequency, identity=EXPENDITURE_IDENTITY, triplets=None):
+    """Όλα τα φύλλα που χρειάζονται οι έλεγχοι, χωρίς διπλότυπα και με σταθερή σειρά."""
+    triplets = DEFLATOR_TRIPLETS[frequency] if triplets is None else triplets
+    sheets = [identity["total"], *identity["plus"], *identity["minus"]] + [s for t in triplets for s in t]
+    return list(dict.fromkeys(sheets))
+
+
+def validate_workbook(excel_file, frequency, start_year=1995, fail_fast=True):
+    """
+    Ελέγχει ένα αρχείο Eurostat (Annual_Data.xlsx: "A", Quarterly_Data.xlsx: "Q").
+
+    Τυπώνει τη συνοπτική αναφορά και την επιστρέφει· με fail_fast=True σηκώνει
+    ValidationError αν υπάρχει κάποιο σφάλμα.
+    """
+    sheets = required_sheets(frequency)
+    ordinals, values, layout_errors = read_panel(excel_file, sheets, frequency, start_year)
+    report = validate_panel(ordinals, values, sheets, frequency)
+    if layout_errors:
+        layout = pd.DataFrame([{"check": "layout", "severity": "error", "subject": sheet, "geo": "",
+                                "count": 1, "first": "", "last": "", "worst": np.nan} for sheet in layout_errors])
+        report = pd.concat([layout, report], ignore_index=True)
+
+    if report.empty:
+        print(f"Έλεγχος '{excel_file}': {len(sheets)} φύλλα, καμία παραβίαση.")
+    else:
+        print(f"Έλεγχος '{excel_file}': {len(sheets)} φύλλα")
+        print(report.to_string(index=False))
+    if fail_fast and (report["severity"] == "error").any():
+        raise ValidationError(excel_file, report)
+    return report
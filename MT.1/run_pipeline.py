@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+"""
+Συντάκτης: thodoreskourtales
+
+Σκοπός:
+  Σταδιακή (incremental) αναπαραγωγή όλης της αναφοράς του MT.1, τύπου make.
+
+  Κάθε script δηλώνεται ως κόμβος με τα αρχεία εισόδου και εξόδου του. Ένας κόμβος
+  εκτελείται μόνο αν άλλαξε κάποια είσοδός του (ή ο κώδικάς του) από την τελευταία
+  επιτυχή εκτέλεση, ενώ οι ανεξάρτητοι κλάδοι εκτελούνται παράλληλα (π.χ. ο ετήσιος
+  κλάδος του 4.py μαζί με τον τριμηνιαίο του 6.py).
+
+  Κόμβοι:
+    - exercises_1_3: GDP_data.mat -> διαγράμματα και report.tex (Ασκήσεις 1-3).
+    - exercise_4:    Annual_Data.xlsx (+ Quarterly_Data.xlsx για τη Chow-Lin) -> πραγματικές σειρές,
+                     ρυθμοί, τριμηνιαίες σειρές, διαγράμματα.
+    - exercise_5:    Quarterly_Data.xlsx -> εποχική προσαρμογή, ρυθμοί, διαγράμματα.
+    - exercise_6:    Quarterly_Data.xlsx -> HP, πίνακες μεταβλητότητας, διαγράμματα.
+    - appendix:      διαγράμματα της Άσκησης 4 -> βελτιστοποιημένες εικόνες και all_plots_boxes.tex
+                     (plot.maker.py, σταδιακά με manifest).
+    - captions:      λεζάντες στο all_plots_boxes.tex (caption.adder.py).
+    - book:          σταδιακή μεταγλώττιση του latex/big_book ανά κεφάλαιο (build_report.py).
+
+  Κάθε script εκτελεί ολόκληρη την αλυσίδα του (φόρτωση -> καθαρισμός -> υπολογισμοί ->
+  πίνακες -> διαγράμματα) σε μία main(), οπότε οι κόμβοι είναι ανά script.
+
+Χρήση:
+  python run_pipeline.py                  # ό,τι δεν είναι ενημερωμένο
+  python run_pipeline.py exercise_6       # μόνο ο κόμβος και οι εξαρτήσεις του
+  python run_pipeline.py --dry-run        # τι θα εκτελεστεί
+  python run_pipeline.py --force -j 2     # όλα, με έως 2 παράλληλους κόμβους
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from macrocore.pipeline import run_pipeline
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+PYTHON = sys.executable
+SHARED = ["macrocore/*.py"]
+
+NODES = [
+    {
+        "name": "exercises_1_3",
+        "cmd": [PYTHON, "exercises.1-3.py"],
+        "cwd": "exercise.1-3",
+        "inputs": ["exercise.1-3/exercises.1-3.py", "exercise.1-3/GDP_data.mat",
+                   "exercise.1-3/report_template.tex"] + SHARED,
+        "outputs": ["exercise.1-3/report.tex", "exercise.1-3/*.png"],
+        "deps": [],
+    },
+    {
+        "name": "exercise_4",
+        "cmd": [PYTHON, "4.py"],
+        "cwd": "exercise.4",
+        "inputs": ["exercise.4/4.py", "exercise.4/Annual_Data.xlsx", "exercise.5/Quarterly_Data.xlsx"] + SHARED,
+        "outputs": ["exercise.4/*_growth.csv", "exercise.4/*_combined_levels.png"],
+        "deps": [],
+    },
+    {
+        "name": "exercise_5",
+        "cmd": [PYTHON, "5.py"],
+        "cwd": "exercise.5",
+        "inputs": ["exercise.5/5.py", "exercise.5/Quarterly_Data.xlsx"] + SHARED,
+        "outputs": ["exercise.5/*_growth.csv", "exercise.5/*_combined_growth.png"],
+        "deps": [],
+    },
+    {
+        "name": "exercise_6",
+        "cmd": [PYTHON, "6.py"],
+        "cwd": "exercise.6",
+        "inputs": ["exercise.6/6.py", "exercise.6/Quarterly_Data.xlsx"] + SHARED,
+        "outputs": ["exercise.6/hp_decomposition.csv", "exercise.6/relative_volatility_*.csv",
+                    "exercise.6/relative_volatility_*.tex",
+                    "exercise.6/all_cyclical_components_*.png"],
+        "deps": [],
+    },
+    {
+        "name": "appendix",
+        "cmd": [PYTHON, "plot.maker.py"],
+        "cwd": "exercise.4",
+        "inputs": ["exercise.4/plot.maker.py", "exercise.4/*.png"] + SHARED,
+        "outputs": ["exercise.4/all_plots_boxes.tex", "exercise.4/plots_manifest.json", "exercise.4/optimized/*"],
+        "deps": ["exercise_4"],
+    },
+    {
+        "name": "captions",
+        "cmd": [PYTHON, os.path.join("..", "latex", "caption.adder.py"), "all_plots_boxes.tex"],
+        "cwd": "exercise.4",
+        "inputs": ["latex/caption.adder.py", "exercise.4/all_plots_boxes.tex"],
+        "outputs": ["exercise.4/all_plots_boxes.tex"],
+        "deps": ["appendix"],
+    },
+    {
+        "name": "book",
+        # Ανά κεφάλαιο: μεταγλωττίζονται (παράλληλα) μόνο όσα άλλαξαν (βλ. build_report.py)
+        "cmd": [PYTHON, "build_report.py"],
+        "cwd": ".",
+        "inputs": ["build_report.py", "macrocore/report.py", "latex/big_book/*.tex", "latex/big_book/chapters/*.tex",
+                   "exercise.*/*.png", "exercise.*/*.pdf", "exercise.6/relative_volatility_*.tex", "exercise.4/all_plots_boxes.tex"],
+        "outputs": ["latex/big_book/main.pdf"],
+        "deps": ["exercises_1_3", "captions", "exercise_5", "exercise_6"],
+    },
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Σταδιακή αναπαραγωγή της αναφοράς του MT.1")
+    parser.add_argument("targets", nargs="*", help="κόμβοι-στόχοι (προεπιλογή: όλοι)")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="μέγιστος αριθμός παράλληλων κόμβων")
+    parser.add_argument("--force", action="store_true", help="εκτέλεση ακόμη και των ενημερωμένων κόμβων")
+    parser.add_argument("--dry-run", action="store_true", help="μόνο εμφάνιση του τι θα εκτελεστεί")
+    parser.add_argument("--list", action="store_true", help="λίστα των κόμβων και των εξαρτήσεών τους")
+    args = parser.parse_args()
+
+    if args.list:
+        for node in NODES:
+            deps = ", ".join(node["deps"]) or "-"
+            print(f"{node['name']:<15} εξαρτάται από: {deps}")
+        return
+
+    status = run_pipeline(NODES, ROOT, targets=args.targets or None, jobs=args.jobs,
+                          force=args.force, dry_run=args.dry_run)
+    if any(s in ("απέτυχε", "παραλείφθηκε") for s in status.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
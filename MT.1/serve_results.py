@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+"""
+Συντάκτης: thodoreskourtales
+
+Σκοπός:
+  Τοπική υπηρεσία HTTP πάνω στη βάση αποτελεσμάτων (results.sqlite), ώστε οι ρυθμοί
+  μεταβολής, οι κυκλικές συνιστώσες και οι μεταβλητότητες των 4.py/5.py/6.py να
+  διαβάζονται χωρίς εκτέλεση των scripts (βλ. macrocore/service.py για τα endpoints).
+
+Χρήση:
+  python serve_results.py [--db results.sqlite] [--host 127.0.0.1] [--port 8050]
+
+  curl 'http://127.0.0.1:8050/series?measure=ΑΕΠ&concept=cycle&geo=EL&start=2008-Q1&end=2012-Q4'
+  curl -o cycle.png 'http://127.0.0.1:8050/plot/cycle.png?measure=ΑΕΠ'
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from macrocore.service import load_state, serve
+from macrocore.store import default_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Τοπική υπηρεσία HTTP για τις προϋπολογισμένες σειρές")
+    parser.add_argument("--db", default=default_path, help="βάση SQLite των αποτελεσμάτων")
+    parser.add_argument("--host", default="127.0.0.1", help="διεύθυνση (μόνο τοπικά από προεπιλογή)")
+    parser.add_argument("--port", type=int, default=8050)
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db):
+        sys.exit(f"Δεν βρέθηκε η βάση '{args.db}'· εκτελέστε πρώτα τα 4.py/5.py/6.py (ή το run_pipeline.py).")
+    state = load_state(args.db)
+    try:
+        asyncio.run(serve(state, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
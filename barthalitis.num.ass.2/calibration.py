@@ -0,0 +1,208 @@
+#!/usr/bin/env python
+"""
+Calibration of the multiplier model in solver.py to observed real C, I and Y.
+
+The model is simulated over the sample from the first observed output,
+
+    C_t = C_bar + c * (Y_{t-1} - T)
+    I_t = I_bar + alpha * Y_{t-1} - b * i_t
+    Y_t = C_t + I_t + G_t
+
+with G_t = Y_t - C_t - I_t taken from the data (government and net exports), and the
+loss is the mean squared error of the simulated C, I and Y. The series are divided by
+mean output first, so one grid fits every country. The loss is evaluated for a whole
+block of parameter points at once (one vector operation per period), the grid is
+walked in blocks (optionally in a process pool), and the best grid points are refined
+with scipy.optimize.minimize inside the grid bounds.
+
+With a constant interest rate b and I_bar only enter through I_bar - b * i, so b is
+left at its get_params value unless it is given a grid and i varies over the sample.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from solver import get_params, steady_state
+
+PARAMETERS = ('c', 'alpha', 'b', 'C_bar', 'I_bar')
+
+# Grid ranges in units of mean output
+GRID = {
+    'c': (0.05, 0.95, 31),
+    'alpha': (0.0, 0.5, 26),
+    'C_bar': (-0.5, 1.0, 31),
+    'I_bar': (-0.5, 0.5, 31),
+}
+
+# Taxes as a share of output in the baseline of solver.py
+TAX_SHARE = get_params()['T'] / steady_state(get_params())[0]
+
+# Exercise 6 output (written by MT.1/exercise.6/6.py)
+HP_DECOMPOSITION = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                '..', 'MT.1', 'exercise.6', 'hp_decomposition.csv')
+HP_COLUMNS = {'ΑΕΠ': 'Y', 'Ιδιωτική Κατανάλωση': 'C', 'Επενδύσεις': 'I'}
+
+
+def load_hp_decomposition(path=HP_DECOMPOSITION):
+    """{region: DataFrame with real Y, C, I} from the Exercise 6 HP decomposition."""
+    import pandas as pd
+    frame = pd.read_csv(path, header=[0, 1, 2], index_col=0)
+    real = frame.xs('Real', axis=1, level=2)
+    return {region: real.xs(region, axis=1, level=1).rename(columns=HP_COLUMNS)[['Y', 'C', 'I']].dropna()
+            for region in real.columns.get_level_values(1).unique()}
+
+
+def prepare(Y, C, I, T=None, i=None):
+    """Data arrays in units of mean output; T and i default to the solver.py baseline."""
+    Y, C, I = (np.asarray(x, dtype=float) for x in (Y, C, I))
+    scale = Y.mean()
+    data = {'Y': Y / scale, 'C': C / scale, 'I': I / scale}
+    data['G'] = data['Y'] - data['C'] - data['I']
+    data['T'] = np.full_like(data['Y'], TAX_SHARE) if T is None else np.broadcast_to(np.asarray(T, dtype=float) / scale, Y.shape)
+    data['i'] = np.full_like(data['Y'], get_params()['i']) if i is None else np.broadcast_to(np.asarray(i, dtype=float), Y.shape)
+    data['scale'] = scale
+    return data
+
+
+def simulate(data, c, alpha, b, C_bar, I_bar):
+    """Simulated C, I, Y for arrays of parameters (leading axes) over the sample (last axis)."""
+    c, alpha, b, C_bar, I_bar = np.broadcast_arrays(*(np.asarray(x, dtype=float) for x in (c, alpha, b, C_bar, I_bar)))
+    n = len(data['Y'])
+    C = np.empty(c.shape + (n,))
+    I = np.empty(c.shape + (n,))
+    Y = np.empty(c.shape + (n,))
+    C[..., 0], I[..., 0], Y[..., 0] = data['C'][0], data['I'][0], data['Y'][0]
+    for t in range(1, n):
+        C[..., t] = C_bar + c * (Y[..., t - 1] - data['T'][t])
+        I[..., t] = I_bar + alpha * Y[..., t - 1] - b * data['i'][t]
+        Y[..., t] = C[..., t] + I[..., t] + data['G'][t]
+    return C, I, Y
+
+
+def loss(data, c, alpha, b, C_bar, I_bar):
+    """Mean squared error of simulated C, I and Y; inf where c + alpha >= 1."""
+    c, alpha, b, C_bar, I_bar = np.broadcast_arrays(*(np.asarray(x, dtype=float) for x in (c, alpha, b, C_bar, I_bar)))
+    total = np.zeros(c.shape)
+    Y_prev = np.full(c.shape, data['Y'][0])
+    for t in range(1, len(data['Y'])):
+        C = C_bar + c * (Y_prev - data['T'][t])
+        I = I_bar + alpha * Y_prev - b * data['i'][t]
+        Y_prev = C + I + data['G'][t]
+        total += (C - data['C'][t]) ** 2 + (I - data['I'][t]) ** 2 + (Y_prev - data['Y'][t]) ** 2
+    total /= 3 * (len(data['Y']) - 1)
+    return np.where(c + alpha < 1, total, np.inf)
+
+
+def grid_axes(grid=GRID, fixed=None):
+    """{parameter: grid values}; parameters without a grid get one value from `fixed`."""
+    fixed = {**get_params(), **(fixed or {})}
+    return {p: np.linspace(*grid[p]) if p in grid else np.array([fixed[p]], dtype=float) for p in PARAMETERS}
+
+
+def block_loss(data, axes, start, stop, keep=5):
+    """The `keep` best (loss, flat index) pairs of grid points start..stop-1."""
+    shape = tuple(len(axes[p]) for p in PARAMETERS)
+    index = np.arange(start, stop)
+    values = loss(data, *(axes[p][k] for p, k in zip(PARAMETERS, np.unravel_index(index, shape))))
+    best = np.argsort(values)[:keep]
+    return values[best], index[best]
+
+
+def grid_search(data, axes, block_size=2 ** 16, keep=5, jobs=1):
+    """The `keep` best grid points as a list of ({parameter: value}, loss), best first."""
+    shape = tuple(len(axes[p]) for p in PARAMETERS)
+    size = int(np.prod(shape))
+    bounds = [(start, min(start + block_size, size)) for start in range(0, size, block_size)]
+    if jobs == 1 or len(bounds) == 1:
+        results = [block_loss(data, axes, start, stop, keep) for start, stop in bounds]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = [pool.submit(block_loss, data, axes, start, stop, keep) for start, stop in bounds]
+            results = [f.result() for f in futures]
+    values = np.concatenate([r[0] for r in results])
+    index = np.concatenate([r[1] for r in results])
+    best = np.argsort(values)[:keep]
+    points = np.unravel_index(index[best], shape)
+    return [({p: float(axes[p][k[n]]) for p, k in zip(PARAMETERS, points)}, float(values[best[n]]))
+            for n in range(len(best))]
+
+
+def refine(data, start, axes):
+    """Local minimisation from a grid point, within the grid bounds of the free parameters."""
+    from scipy.optimize import minimize
+    free = [p for p in PARAMETERS if len(axes[p]) > 1]
+    bounds = [(axes[p][0], axes[p][-1]) for p in free]
+
+    def objective(x):
+        point = {**start, **dict(zip(free, x))}
+        return float(loss(data, *(point[p] for p in PARAMETERS)))
+
+    result = minimize(objective, [start[p] for p in free], method='L-BFGS-B', bounds=bounds)
+    if not result.success or result.fun > objective([start[p] for p in free]):
+        return start, objective([start[p] for p in free])
+    return {**start, **dict(zip(free, map(float, result.x)))}, float(result.fun)
+
+
+def calibrate(Y, C, I, T=None, i=None, grid=GRID, fixed=None, block_size=2 ** 16, starts=3, jobs=1):
+    """
+    Fit (c, alpha, b, C_bar, I_bar) to observed real output, consumption and investment.
+
+    Returns a dict with 'params' (get_params format, in the units of the data, T and i at
+    their sample means; `fixed` and the grid are in units of mean output), 'loss', 'grid_loss', 'rmse' of C, I and Y relative to mean output,
+    'scale' (mean output), 'fitted' (the parameters with a grid; the others keep their
+    `fixed`/get_params value) and 'at_bound' (fitted parameters on a bound of their grid,
+    where the fit is not an interior optimum).
+    """
+    data = prepare(Y, C, I, T, i)
+    axes = grid_axes(grid, fixed)
+    candidates = grid_search(data, axes, block_size, max(starts, 1), jobs)
+    refined = [refine(data, point, axes) for point, _ in candidates[:starts]] or candidates[:1]
+    point, value = min(refined, key=lambda r: r[1])
+
+    fitted = [p for p in PARAMETERS if len(axes[p]) > 1]
+    at_bound = [p for p in fitted if np.isclose(point[p], axes[p][0]) or np.isclose(point[p], axes[p][-1])]
+
+    C_sim, I_sim, Y_sim = simulate(data, *(point[p] for p in PARAMETERS))
+    scale = data['scale']
+    params = get_params(c=point['c'], G=data['G'].mean() * scale, T=data['T'].mean() * scale, i=data['i'].mean())
+    params.update(alpha=point['alpha'], b=point['b'] * scale, C_bar=point['C_bar'] * scale, I_bar=point['I_bar'] * scale)
+    return {
+        'params': params,
+        'loss': value,
+        'grid_loss': candidates[0][1],
+        'rmse': {name: float(np.sqrt(np.mean((sim[1:] - data[name][1:]) ** 2)))
+                 for name, sim in (('C', C_sim), ('I', I_sim), ('Y', Y_sim))},
+        'scale': scale,
+        'fitted': fitted,
+        'at_bound': at_bound,
+    }
+
+
+def calibrate_all(series, jobs=None, **kwargs):
+    """{name: calibrate(...)} for {name: DataFrame with Y, C, I columns}, e.g. load_hp_decomposition()."""
+    return {name: calibrate(frame['Y'], frame['C'], frame['I'], jobs=jobs, **kwargs)
+            for name, frame in series.items()}
+
+
+def main():
+    if not os.path.exists(HP_DECOMPOSITION):
+        print(f"{HP_DECOMPOSITION} not found; run MT.1/exercise.6/6.py first.")
+        return
+    for region, result in calibrate_all(load_hp_decomposition()).items():
+        p = result['params']
+        shown = {'c': p['c'], 'alpha': p['alpha'], 'b': p['b'],
+                 'C_bar': p['C_bar'] / result['scale'], 'I_bar': p['I_bar'] / result['scale']}
+        names = {'C_bar': 'C_bar/Y', 'I_bar': 'I_bar/Y'}
+        print(f"{region}: " + " ".join(f"{names.get(k, k)}={v:.4f}" for k, v in shown.items() if k in result['fitted'])
+              + f"  loss={result['loss']:.3e} (grid {result['grid_loss']:.3e})"
+              f"  rmse C={result['rmse']['C']:.4f} I={result['rmse']['I']:.4f} Y={result['rmse']['Y']:.4f}")
+        fixed = [k for k in PARAMETERS if k not in result['fitted']]
+        if fixed:
+            print(f"  fixed (not calibrated): {', '.join(fixed)}")
+        if result['at_bound']:
+            print(f"  warning: {', '.join(result['at_bound'])} on a bound of the grid; widen GRID or check the fit")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,176 @@
+#!/usr/bin/env python
+"""
+Impulse responses and multipliers of the dynamic multiplier model in solver.py.
+
+A policy change moves autonomous demand D by dD = loading * dx, with loading 1 for G,
+-c for T and -b for i. Starting from a steady state, the deviations follow
+
+    dY_t = dD_t + beta * dY_{t-1}
+    dC_t = c * dY_{t-1} - c * dT_t
+    dI_t = alpha * dY_{t-1} - b * di_t
+    dL_t = gamma * dY_t
+
+and for a shock active on the window start <= t < end the output response is a geometric
+sum in beta, so every path and multiplier is computed in closed form. All parameters,
+shock sizes, durations and delays broadcast against each other, so thousands of
+combinations are one array operation; paths get a trailing time axis.
+
+Shocks:
+    temporary:    dx for `duration` periods from t = 0
+    permanent:    dx from t = 0 on
+    anticipated:  announced at t = 0, dx from t = `delay` on (for `duration` periods, or
+                  permanently with duration=np.inf); the model is backward looking, so
+                  nothing moves before the implementation period.
+"""
+import numpy as np
+
+from solver import get_params
+
+INSTRUMENTS = ('G', 'T', 'i')
+KINDS = ('temporary', 'permanent', 'anticipated')
+
+
+def demand_loading(params, instrument):
+    if instrument == 'G':
+        return np.ones_like(np.asarray(params['c'], dtype=float))
+    if instrument == 'T':
+        return -np.asarray(params['c'], dtype=float)
+    if instrument == 'i':
+        return -np.asarray(params['b'], dtype=float) * np.ones_like(np.asarray(params['c'], dtype=float))
+    raise ValueError(f"Unknown instrument '{instrument}' (one of {INSTRUMENTS})")
+
+
+def shock_window(kind, duration=1, delay=0):
+    """(start, end) of the periods in which the policy change is in force."""
+    duration = np.asarray(duration, dtype=float)
+    delay = np.asarray(delay, dtype=float)
+    if kind == 'temporary':
+        return np.zeros_like(duration), duration
+    if kind == 'permanent':
+        return np.zeros_like(duration), np.full_like(duration, np.inf)
+    if kind == 'anticipated':
+        return delay, delay + duration
+    raise ValueError(f"Unknown shock kind '{kind}' (one of {KINDS})")
+
+
+def geometric_sum(beta, n):
+    """1 + beta + ... + beta**(n-1), elementwise, with the beta = 1 limit."""
+    beta = np.asarray(beta, dtype=float)
+    n = np.asarray(n, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        out = (1 - beta ** n) / (1 - beta)
+    return np.where(np.isclose(beta, 1.0), n, out)
+
+
+def _expand(*arrays):
+    """Broadcast the arrays and add a trailing time axis."""
+    return [a[..., None] for a in np.broadcast_arrays(*[np.asarray(a, dtype=float) for a in arrays])]
+
+
+def output_response(beta, start, end, periods):
+    """dY_t / dD for t = 0..periods (trailing axis) for a unit demand shock on [start, end)."""
+    t = np.arange(periods + 1, dtype=float)
+    beta, start, end = _expand(beta, start, end)
+    last = np.minimum(t, end - 1)
+    n = last - start + 1
+    return np.where(n > 0, beta ** (t - last) * geometric_sum(beta, np.maximum(n, 0)), 0.0)
+
+
+def policy_path(start, end, periods):
+    """1 while the policy change is in force, else 0 (trailing time axis)."""
+    t = np.arange(periods + 1, dtype=float)
+    start, end = _expand(start, end)
+    return ((t >= start) & (t < end)).astype(float)
+
+
+def impulse_responses(params, instrument, kind='temporary', size=1.0, duration=1, delay=0,
+                      periods=20, gamma=0.7):
+    """
+    Deviations of Y, C, I and L from the initial steady state after a change of `size` in
+    `instrument`. Returns {variable: array (..., periods + 1)} plus the policy path 'x'.
+    """
+    c = np.asarray(params['c'], dtype=float)
+    alpha = np.asarray(params['alpha'], dtype=float)
+    b = np.asarray(params['b'], dtype=float)
+    beta = c + alpha
+    start, end = shock_window(kind, duration, delay)
+    loading = demand_loading(params, instrument)
+
+    unit = output_response(beta, start, end, periods)
+    x = policy_path(start, end, periods)
+    shape = np.broadcast_shapes(unit.shape, np.shape(size) + (1,), loading.shape + (1,), x.shape)
+    size, loading, c, alpha, b, gamma = _expand(size, loading, c, alpha, b, gamma)
+    dx = np.broadcast_to(size * x, shape)
+    dY = np.broadcast_to(size * loading * unit, shape)
+    dY_lag = np.concatenate([np.zeros(shape[:-1] + (1,)), dY[..., :-1]], axis=-1)
+    dC = c * dY_lag - (c * dx if instrument == 'T' else 0.0)
+    dI = alpha * dY_lag - (b * dx if instrument == 'i' else 0.0)
+    dL = gamma * dY
+    return {'Y': dY, 'C': np.broadcast_to(dC, shape), 'I': np.broadcast_to(dI, shape),
+            'L': np.broadcast_to(dL, shape), 'x': dx}
+
+
+def multipliers(params, instrument, kind='temporary', duration=1, delay=0, horizon=20, gamma=0.7):
+    """
+    Impact, peak and cumulative multipliers of Y, C, I and L per unit of `instrument`.
+
+    impact:      response in the first period the policy is in force
+    peak:        largest absolute response over 0..horizon (signed), with its period
+    cumulative:  sum of the response over 0..horizon divided by the sum of the policy change
+    long_run:    closed-form cumulative multiplier as horizon -> inf (loading / (1 - beta)
+                 for output; the same for every shock kind when |beta| < 1)
+    """
+    responses = impulse_responses(params, instrument, kind, 1.0, duration, delay, horizon, gamma)
+    start, _ = shock_window(kind, duration, delay)
+    t = np.arange(horizon + 1)
+    x_total = responses['x'].sum(axis=-1)
+    beta = np.asarray(params['c'], dtype=float) + np.asarray(params['alpha'], dtype=float)
+    long_run_y = demand_loading(params, instrument) / (1 - beta)
+    c = np.asarray(params['c'], dtype=float)
+    alpha = np.asarray(params['alpha'], dtype=float)
+    long_run = {
+        'Y': long_run_y,
+        'C': c * long_run_y - (c if instrument == 'T' else 0.0),
+        'I': alpha * long_run_y - (np.asarray(params['b'], dtype=float) if instrument == 'i' else 0.0),
+        'L': gamma * long_run_y,
+    }
+
+    out = {}
+    for var in ('Y', 'C', 'I', 'L'):
+        path = responses[var]
+        start_idx = np.broadcast_to(np.minimum(np.asarray(start, dtype=int), horizon)[..., None], path.shape[:-1] + (1,))
+        peak_idx = np.abs(path).argmax(axis=-1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            cumulative = path.sum(axis=-1) / x_total
+        out[var] = {
+            'impact': np.take_along_axis(path, start_idx, axis=-1)[..., 0],
+            'peak': np.take_along_axis(path, peak_idx[..., None], axis=-1)[..., 0],
+            'peak_period': t[peak_idx],
+            'cumulative': cumulative,
+            'long_run': np.broadcast_to(long_run[var], path.shape[:-1]),
+        }
+    return out
+
+
+def main():
+    params = get_params(c=0.5)
+    print("Multipliers of output (c=0.5, horizon 20)")
+    for instrument in INSTRUMENTS:
+        for kind, duration, delay in (('temporary', 1, 0), ('temporary', 4, 0),
+                                      ('permanent', 1, 0), ('anticipated', np.inf, 4)):
+            m = multipliers(params, instrument, kind, duration, delay, horizon=20)['Y']
+            label = f"{instrument} {kind} (duration={duration}, delay={delay})"
+            print(f"  {label:<42} impact={float(m['impact']):8.4f}  peak={float(m['peak']):8.4f}"
+                  f" (t={int(m['peak_period'])})  cumulative={float(m['cumulative']):8.4f}"
+                  f"  long run={float(m['long_run']):8.4f}")
+
+    # A grid of 10^4 (c, duration) points in one call
+    c_grid = np.linspace(0.3, 0.8, 100)[:, None]
+    durations = np.arange(1, 101)[None, :]
+    grid = multipliers(get_params(c=c_grid), 'G', 'temporary', durations, horizon=40)['Y']
+    print("Cumulative G multipliers on a 100 x 100 (c, duration) grid:",
+          f"min={grid['cumulative'].min():.4f}, max={grid['cumulative'].max():.4f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python
+"""
+Policy inversion for the multiplier model in solver.py: the G, T or i that reaches a
+target output.
+
+Output is linear in each instrument, D = D_0 + loading * (x - x_0) (see
+impulse.demand_loading), so both questions have closed forms:
+
+    steady state:   Y_ss(x) = target            =>  D(x) = (1 - beta) * target
+    within k:       Y_k(x) = target, with the policy changed permanently at t = 0 and
+                    Y_k = Y_ss + beta^(k+1) * (Y_init - Y_ss) as in solver.dynamic_path
+                                                =>  Y_ss(x) = (target - beta^(k+1) Y_init) / (1 - beta^(k+1))
+
+Everything broadcasts, so millions of (target, parameter) pairs are one array operation.
+Bounds on the instrument (e.g. a zero lower bound on i) clip the solution and flag the
+target as not reachable. For variants that are not linear in the instrument,
+solve_monotone is a vectorized Newton iteration safeguarded by bisection; the income
+tax rate (T = tau * Y_{t-1}) is included as an example.
+"""
+import numpy as np
+
+from solver import get_params, steady_state, dynamic_path
+from impulse import demand_loading
+
+# Admissible values of each instrument
+BOUNDS = {'G': (0.0, np.inf), 'T': (-np.inf, np.inf), 'i': (0.0, np.inf)}
+
+
+def required_output(params, target, Y_init=None, periods=None):
+    """The steady-state output that puts Y at `target` (after `periods` periods from Y_init)."""
+    target = np.asarray(target, dtype=float)
+    if periods is None:
+        return target
+    beta = np.asarray(params['c'], dtype=float) + np.asarray(params['alpha'], dtype=float)
+    decay = beta ** (np.asarray(periods, dtype=float) + 1)
+    return (target - decay * np.asarray(Y_init, dtype=float)) / (1 - decay)
+
+
+def invert_policy(params, instrument, target, Y_init=None, periods=None, bounds=None):
+    """
+    Value of `instrument` for which output equals `target` in the steady state, or in
+    period `periods` (0 = impact) of the path from Y_{-1} = Y_init. Returns (x, reachable):
+    x is clipped to `bounds` (default BOUNDS[instrument]) and reachable is False where
+    the clip was needed.
+    """
+    if (Y_init is None) != (periods is None):
+        raise ValueError("Y_init and periods go together")
+    _, _, _, D, beta = steady_state(params)
+    loading = demand_loading(params, instrument)
+    x0 = np.asarray(params[instrument], dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        x = x0 + ((1 - beta) * required_output(params, target, Y_init, periods) - D) / loading
+    lo, hi = BOUNDS[instrument] if bounds is None else bounds
+    clipped = np.clip(x, lo, hi)
+    return clipped, np.isfinite(x) & (clipped == x)
+
+
+def solve_monotone(f, target, lo, hi, tol=1e-12, max_iter=100):
+    """
+    Vectorized root of f(x) = target on [lo, hi] for f monotone in x (elementwise).
+    Newton steps with a central-difference slope, replaced by bisection whenever they
+    leave the current bracket. Returns (x, converged); x is nan where [lo, hi] does not
+    bracket the target.
+    """
+    target, lo, hi = (a.astype(float) for a in np.broadcast_arrays(target, lo, hi))
+    f_lo = f(lo) - target
+    f_hi = f(hi) - target
+    bracketed = np.sign(f_lo) * np.sign(f_hi) <= 0
+    x = np.where(bracketed, 0.5 * (lo + hi), np.nan)
+    converged = ~bracketed
+    for _ in range(max_iter):
+        fx = f(x) - target
+        converged |= np.abs(fx) <= tol * (1 + np.abs(target))
+        if converged.all():
+            break
+        left = np.sign(fx) == np.sign(f_lo)
+        lo, f_lo = np.where(left, x, lo), np.where(left, fx, f_lo)
+        hi = np.where(left, hi, x)
+        h = 1e-7 * (1 + np.abs(x))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            step = x - fx * 2 * h / (f(x + h) - f(x - h))
+        inside = np.isfinite(step) & (step > np.minimum(lo, hi)) & (step < np.maximum(lo, hi))
+        x = np.where(converged, x, np.where(inside, step, 0.5 * (lo + hi)))
+    return x, converged & bracketed
+
+
+def income_tax_output(params, tau, Y_init=None, periods=None):
+    """Output with taxes T_t = tau * Y_{t-1} instead of params['T']: steady state or Y_periods."""
+    c = np.asarray(params['c'], dtype=float)
+    alpha = np.asarray(params['alpha'], dtype=float)
+    A = params['C_bar'] + params['I_bar'] + params['G'] - params['b'] * params['i']
+    beta = c * (1 - np.asarray(tau, dtype=float)) + alpha
+    Y_ss = A / (1 - beta)
+    if periods is None:
+        return Y_ss
+    return Y_ss + beta ** (np.asarray(periods, dtype=float) + 1) * (np.asarray(Y_init, dtype=float) - Y_ss)
+
+
+def invert_income_tax(params, target, Y_init=None, periods=None, bounds=(0.0, 1.0)):
+    """The tax rate tau in `bounds` for which income_tax_output equals `target`; returns (tau, converged)."""
+    return solve_monotone(lambda tau: income_tax_output(params, tau, Y_init, periods), target, *bounds)
+
+
+def main():
+    params = get_params(c=0.5)
+    Y_ss = steady_state(params)[0]
+    print(f"Baseline (c=0.5): Y_ss = {Y_ss:.4f}")
+    for instrument in ('G', 'T', 'i'):
+        x, ok = invert_policy(params, instrument, 1.05 * Y_ss)
+        print(f"  {instrument} for Y_ss + 5%: {float(x):.4f} (baseline {params[instrument]}, reachable: {bool(ok)})")
+
+    # Close a 5% output gap within 4 periods, starting below potential
+    x, _ = invert_policy(params, 'G', Y_ss, Y_init=0.95 * Y_ss, periods=4)
+    Y, _, _ = dynamic_path(0.95 * Y_ss, get_params(c=0.5, G=float(x)), 4)
+    print(f"  G closing a 5% gap within 4 periods: {float(x):.4f} (Y_4 = {Y[4]:.4f})")
+
+    # A million (target, c) pairs in one call
+    rng = np.random.default_rng(0)
+    c = rng.uniform(0.3, 0.8, 10 ** 6)
+    targets = rng.uniform(3, 6, 10 ** 6)
+    x, ok = invert_policy(get_params(c=c), 'i', targets)
+    print(f"  i for 10^6 (target, c) pairs: {ok.mean():.1%} reachable above the zero lower bound")
+
+    tau, ok = invert_income_tax(params, Y_ss)
+    print(f"  Income tax rate with the same Y_ss: {float(tau):.4f} (converged: {bool(ok)})")
+
+
+if __name__ == '__main__':
+    main()
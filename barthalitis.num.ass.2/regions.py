@@ -0,0 +1,179 @@
+#!/usr/bin/env python
+"""
+Multi-region version of the multiplier model in solver.py.
+
+N economies are linked by trade. Region r imports m_r * Y_{r,t-1}, and a share S[r, s]
+of the imports of region s comes from region r (exports of r); the rest of the imports
+come from outside the N regions. With the equations of solver.py in every region,
+
+    Y_t = D + B Y_{t-1},   B = diag(c + alpha - m) + S diag(m)
+    D   = C_bar + I_bar + G - c * T - b * i
+
+and the steady state solves (I - B) Y = D. factorize() LU-factors I - B once (sparse LU
+when the trade shares are a scipy.sparse matrix), and steady_state / dynamic_path reuse
+the factorization for any number of policy vectors: G, T and i may carry leading batch
+axes (..., N), and all right-hand sides are solved in one call. Paths are computed with
+one matrix product per period for the whole batch, or in closed form from the
+eigendecomposition of B, Y_t = Y_ss + B^(t+1) (Y_init - Y_ss).
+
+One region with m = 0 (from_scalar) is the closed economy of solver.py.
+"""
+import numpy as np
+import scipy.linalg
+import scipy.sparse
+import scipy.sparse.linalg
+
+from solver import get_params, steady_state as scalar_steady_state
+
+REGION_PARAMETERS = ('C_bar', 'I_bar', 'c', 'alpha', 'b', 'G', 'T', 'i', 'm')
+
+
+def trade_shares(flows):
+    """S[r, s] = share of the imports of s coming from r, from bilateral flows[r, s]."""
+    flows = np.array(flows, dtype=float)
+    np.fill_diagonal(flows, 0.0)
+    totals = flows.sum(axis=0)
+    return np.divide(flows, totals, out=np.zeros_like(flows), where=totals > 0)
+
+
+def linked_params(shares, m=0.2, **values):
+    """Parameters of len(shares) regions: the get_params values unless given (scalars or per region)."""
+    n = shares.shape[0] if scipy.sparse.issparse(shares) else len(shares)
+    base = {**get_params(), 'm': m, **values}
+    params = {k: np.broadcast_to(np.asarray(base[k], dtype=float), (n,)).copy() for k in REGION_PARAMETERS}
+    params['shares'] = shares if scipy.sparse.issparse(shares) else np.asarray(shares, dtype=float)
+    return params
+
+
+def from_scalar(params):
+    """The closed economy of solver.py as a single region."""
+    return linked_params(np.zeros((1, 1)), m=0.0, **params)
+
+
+def propagation_matrix(params):
+    """B = diag(c + alpha - m) + S diag(m) (sparse if the trade shares are sparse)."""
+    m = params['m']
+    own = params['c'] + params['alpha'] - m
+    if scipy.sparse.issparse(params['shares']):
+        return (scipy.sparse.diags(own) + params['shares'] @ scipy.sparse.diags(m)).tocsc()
+    return np.diag(own) + params['shares'] * m
+
+
+def factorize(params):
+    """LU factorization of I - B, to be passed to steady_state / dynamic_path."""
+    B = propagation_matrix(params)
+    n = B.shape[0]
+    if scipy.sparse.issparse(B):
+        lu = scipy.sparse.linalg.splu((scipy.sparse.identity(n, format='csc') - B).tocsc())
+    else:
+        lu = scipy.linalg.lu_factor(np.eye(n) - B)
+    return {'B': B, 'lu': lu}
+
+
+def autonomous_demand(params, G=None, T=None, i=None):
+    """D for the given policy (defaults: params), with any leading batch axes (..., N)."""
+    G = params['G'] if G is None else np.asarray(G, dtype=float)
+    T = params['T'] if T is None else np.asarray(T, dtype=float)
+    i = params['i'] if i is None else np.asarray(i, dtype=float)
+    return params['C_bar'] + params['I_bar'] + G - params['c'] * T - params['b'] * i
+
+
+def _solve(factor, D):
+    """(I - B)^-1 D for D of shape (..., N), all right-hand sides at once."""
+    rhs = D.reshape(-1, D.shape[-1]).T
+    if isinstance(factor['lu'], tuple):
+        Y = scipy.linalg.lu_solve(factor['lu'], rhs)
+    else:
+        Y = factor['lu'].solve(rhs)
+    return Y.T.reshape(D.shape)
+
+
+def _apply(B, Y):
+    """B y for every vector y along the last axis of Y."""
+    if scipy.sparse.issparse(B):
+        return (B @ Y.reshape(-1, Y.shape[-1]).T).T.reshape(Y.shape)
+    return Y @ B.T
+
+
+def steady_state(params, G=None, T=None, i=None, factor=None):
+    """
+    Y_ss, C_ss, I_ss, D, B as in solver.steady_state, per region (last axis) and per
+    policy vector (leading axes of G, T, i).
+    """
+    factor = factor or factorize(params)
+    G = params['G'] if G is None else np.asarray(G, dtype=float)
+    T = params['T'] if T is None else np.asarray(T, dtype=float)
+    i = params['i'] if i is None else np.asarray(i, dtype=float)
+    D = np.broadcast_to(autonomous_demand(params, G, T, i), np.broadcast_shapes(G.shape, T.shape, i.shape, params['c'].shape))
+    Y_ss = _solve(factor, D)
+    C_ss = params['C_bar'] + params['c'] * (Y_ss - T)
+    I_ss = params['I_bar'] + params['alpha'] * Y_ss - params['b'] * i
+    return Y_ss, C_ss, I_ss, D, factor['B']
+
+
+def dynamic_path(Y_init, params, periods=20, G=None, T=None, i=None, factor=None, method='matvec'):
+    """
+    Y, C, I of shape (..., periods + 1, N) from Y_{-1} = Y_init (..., N) under the given
+    policy, as in solver.dynamic_path. method='matvec' iterates Y_t = D + B Y_{t-1} for
+    the whole batch; method='eig' uses the (cached) eigendecomposition of B.
+    """
+    factor = factor or factorize(params)
+    G = params['G'] if G is None else np.asarray(G, dtype=float)
+    T = params['T'] if T is None else np.asarray(T, dtype=float)
+    i = params['i'] if i is None else np.asarray(i, dtype=float)
+    D = autonomous_demand(params, G, T, i)
+    shape = np.broadcast_shapes(np.shape(Y_init), D.shape, params['c'].shape)
+    Y_init = np.broadcast_to(np.asarray(Y_init, dtype=float), shape)
+    D = np.broadcast_to(D, shape)
+    T = np.broadcast_to(T, shape)
+    i = np.broadcast_to(i, shape)
+    B = factor['B']
+
+    if method == 'matvec':
+        Y = np.empty(shape[:-1] + (periods + 1, shape[-1]))
+        Y[..., 0, :] = D + _apply(B, Y_init)
+        for t in range(1, periods + 1):
+            Y[..., t, :] = D + _apply(B, Y[..., t - 1, :])
+    elif method == 'eig':
+        if 'eig' not in factor:
+            factor['eig'] = np.linalg.eig(B.toarray() if scipy.sparse.issparse(B) else B)
+        w, V = factor['eig']
+        Y_ss = _solve(factor, D)
+        z = np.linalg.solve(V, (Y_init - Y_ss).reshape(-1, shape[-1]).T).T.reshape(shape)
+        powers = w ** np.arange(1, periods + 2)[:, None]
+        Y = Y_ss[..., None, :] + ((z[..., None, :] * powers) @ V.T).real
+    else:
+        raise ValueError(f"Unknown method '{method}' (matvec or eig)")
+
+    Y_lag = np.concatenate([Y_init[..., None, :], Y[..., :-1, :]], axis=-2)
+    C = params['C_bar'] + params['c'] * (Y_lag - T[..., None, :])
+    I = params['I_bar'] + params['alpha'] * Y_lag - params['b'] * i[..., None, :]
+    return Y, C, I
+
+
+def main():
+    # The closed economy of solver.py as one region
+    base = get_params(c=0.5)
+    Y_ss, C_ss, I_ss, _, _ = steady_state(from_scalar(base))
+    print("One region (c=0.5):", f"Y_ss = {Y_ss[0]:.4f}, C_ss = {C_ss[0]:.4f}, I_ss = {I_ss[0]:.4f}",
+          f"(solver.py: Y_ss = {scalar_steady_state(base)[0]:.4f})")
+
+    # 27 linked regions, 5000 government spending vectors solved with one factorization
+    rng = np.random.default_rng(0)
+    n = 27
+    params = linked_params(trade_shares(rng.pareto(1.5, (n, n))), m=rng.uniform(0.1, 0.4, n),
+                           c=rng.uniform(0.4, 0.7, n))
+    factor = factorize(params)
+    G = params['G'] * (1 + 0.1 * rng.standard_normal((5000, n)))
+    Y_ss, _, _, _, _ = steady_state(params, G=G, factor=factor)
+    print(f"{n} regions, {len(G)} policy vectors: Y_ss in [{Y_ss.min():.4f}, {Y_ss.max():.4f}]")
+
+    # Spillovers: +1 in the spending of region 0
+    dG = np.zeros(n)
+    dG[0] = 1.0
+    dY = steady_state(params, G=params['G'] + dG, factor=factor)[0] - steady_state(params, factor=factor)[0]
+    print(f"+1 G in region 0: dY_0 = {dY[0]:.4f}, total dY = {dY.sum():.4f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python
+"""
+Stochastic version of dynamic_path in solver.py: AR(1) demand shocks and the second
+moments they produce.
+
+C_bar, I_bar and G each get an AR(1) shock u_t = rho * u_{t-1} + sigma * e_t. Around the
+steady state the model is then
+
+    y_t = beta * y_{t-1} + u^C_t + u^I_t + u^G_t
+    c_t = c * y_{t-1} + u^C_t
+    i_t = alpha * y_{t-1} + u^I_t
+
+so shocks and responses are linear filters, applied with scipy.signal.lfilter along the
+time axis of an (R replications x T periods) array. Replications are processed in
+blocks to bound memory, so 10^5 replications are a handful of array operations.
+
+Moments follow Exercise 6 (MT.1/exercise.6/6.py): standard deviation of the HP cycle
+(lambda = 1600) of the simulated levels, and the volatility of each variable relative to
+output, in the layout of relative_volatility_table_dual. data_moments computes the same
+statistics from observed series for moment matching.
+"""
+import os
+import sys
+
+import numpy as np
+from scipy.signal import lfilter
+
+from solver import get_params, steady_state
+
+# Shared macrocore package (MT.1 folder), for the HP filter of Exercise 6
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'MT.1'))
+from macrocore.compact import hp_filter
+
+SHOCKS = ('C_bar', 'I_bar', 'G')
+VARIABLES = ('Y', 'C', 'I')
+# Variable names of the Exercise 6 tables
+LABELS = {'Y': 'ΑΕΠ', 'C': 'Ιδιωτική Κατανάλωση', 'I': 'Επενδύσεις'}
+
+
+def shock_params(rho=0.8, sigma=0.01, **overrides):
+    """{shock: (rho, sigma)}; sigma in units of steady-state output. Overrides per shock, e.g. G=(0.9, 0.0)."""
+    shocks = {name: (rho, sigma) for name in SHOCKS}
+    shocks.update(overrides)
+    return shocks
+
+
+def simulate(params, shocks, replications=1000, periods=120, burn_in=100, seed=None):
+    """
+    Simulated levels {Y, C, I} of shape (replications, periods) and the shocks
+    {C_bar, I_bar, G}, starting from the steady state `burn_in` periods earlier.
+    """
+    rng = np.random.default_rng(seed)
+    Y_ss, C_ss, I_ss, _, beta = steady_state(params)
+    n = burn_in + periods
+    u = {name: lfilter([sigma * Y_ss], [1.0, -rho], rng.standard_normal((replications, n)), axis=1)
+         for name, (rho, sigma) in shocks.items()}
+    y = lfilter([1.0], [1.0, -beta], sum(u.values()), axis=1)
+    y_lag = np.concatenate([np.zeros((replications, 1)), y[:, :-1]], axis=1)
+    c = params['c'] * y_lag + u.get('C_bar', 0.0)
+    i = params['alpha'] * y_lag + u.get('I_bar', 0.0)
+    levels = {'Y': Y_ss + y, 'C': C_ss + c, 'I': I_ss + i}
+    return ({k: v[:, burn_in:] for k, v in levels.items()},
+            {k: v[:, burn_in:] for k, v in u.items()})
+
+
+def cycle_moments(levels, lamb=1600):
+    """Standard deviation of the HP cycle of each variable, per replication (last axis = time)."""
+    return {k: hp_filter(np.atleast_2d(v).T, lamb=lamb)[0].std(axis=0) for k, v in levels.items()}
+
+
+def simulate_moments(params, shocks, replications=10 ** 5, periods=120, burn_in=100, block=10 ** 4,
+                     seed=None, lamb=1600):
+    """
+    Volatilities of the HP cycles over `replications` simulations, in blocks of `block`.
+    Returns {'volatility': {var: mean std}, 'relative': {var: mean std / std of Y},
+    'relative_se': {var: standard error of the mean}}.
+    """
+    rng = np.random.default_rng(seed)
+    vols = {k: [] for k in VARIABLES}
+    for start in range(0, replications, block):
+        levels, _ = simulate(params, shocks, min(block, replications - start), periods, burn_in, rng)
+        for k, v in cycle_moments(levels, lamb).items():
+            vols[k].append(v)
+    vols = {k: np.concatenate(v) for k, v in vols.items()}
+    relative = {k: v / vols['Y'] for k, v in vols.items()}
+    return {
+        'volatility': {k: float(v.mean()) for k, v in vols.items()},
+        'relative': {k: float(v.mean()) for k, v in relative.items()},
+        'relative_se': {k: float(v.std() / np.sqrt(len(v))) for k, v in relative.items()},
+    }
+
+
+def data_moments(Y, C, I, lamb=1600):
+    """The same statistics for observed series (one realisation), as in Exercise 6."""
+    vols = {k: float(v[0]) for k, v in cycle_moments({'Y': np.asarray(Y, dtype=float)[None],
+                                                      'C': np.asarray(C, dtype=float)[None],
+                                                      'I': np.asarray(I, dtype=float)[None]}, lamb).items()}
+    return {'volatility': vols, 'relative': {k: v / vols['Y'] for k, v in vols.items()}}
+
+
+def relative_volatility_table(moments):
+    """DataFrame in the layout of relative_volatility_table_dual in 6.py."""
+    import pandas as pd
+    return pd.DataFrame({
+        "Μεταβλητή": [LABELS[k] for k in VARIABLES],
+        "Μεταβλητότητα": [moments['volatility'][k] for k in VARIABLES],
+        "Σχετική Μεταβλητότητα": [moments['relative'][k] for k in VARIABLES],
+    })
+
+
+def moment_distance(model, data, variables=('C', 'I')):
+    """Sum of squared differences of the relative volatilities of model and data."""
+    return sum((model['relative'][k] - data['relative'][k]) ** 2 for k in variables)
+
+
+def main():
+    params = get_params(c=0.5)
+    shocks = shock_params(rho=0.8, sigma=0.01)
+    moments = simulate_moments(params, shocks, replications=10 ** 5, seed=0)
+    print("Model (c=0.5, AR(1) shocks rho=0.8, sigma=1% of Y_ss), 10^5 replications x 120 quarters:")
+    print(relative_volatility_table(moments))
+
+    from calibration import HP_DECOMPOSITION, load_hp_decomposition
+    if os.path.exists(HP_DECOMPOSITION):
+        for region, frame in load_hp_decomposition().items():
+            data = data_moments(frame['Y'], frame['C'], frame['I'])
+            print(f"{region}: relative volatility C={data['relative']['C']:.4f} I={data['relative']['I']:.4f}"
+                  f" (distance to the model: {moment_distance(moments, data):.4f})")
+
+
+if __name__ == '__main__':
+    main()